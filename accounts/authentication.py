@@ -0,0 +1,32 @@
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from accounts.models import LightweightUser
+from accounts.services.user_claims import UserClaimsService
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication building the user from the token's claims.
+
+    The returned user is a `LightweightUser`, so the row is only loaded when a
+    view touches fields outside of the claims. Tokens without the claims, or
+    issued before the user was changed, fall back to loading the user.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+
+        if (
+            user_id is None
+            or not UserClaimsService.has_claims(validated_token)
+            or UserClaimsService.is_changed_since(user_id, validated_token["iat"])
+        ):
+            return super().get_user(validated_token)
+
+        return LightweightUser.from_card(
+            {
+                "id": user_id,
+                **{claim: validated_token[claim] for claim in UserClaimsService.CLAIMS},
+            }
+        )
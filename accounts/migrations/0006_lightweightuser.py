@@ -0,0 +1,26 @@
+# Generated by Django 5.2.3 on 2026-10-19 12:19
+
+import accounts.managers
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0005_alter_user_habits_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LightweightUser",
+            fields=[],
+            options={
+                "proxy": True,
+                "indexes": [],
+                "constraints": [],
+            },
+            bases=("accounts.user",),
+            managers=[
+                ("objects", accounts.managers.UserManager()),
+            ],
+        ),
+    ]
@@ -1,7 +1,9 @@
 import uuid
+from datetime import timedelta
 
 from django.contrib.auth.base_user import AbstractBaseUser
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from accounts.managers import UserManager
@@ -51,6 +53,37 @@ class User(AbstractBaseUser):
         return self.is_superuser
 
 
+class LightweightUser(User):
+    """
+    User built from a cached card without querying the database.
+
+    Fields outside of the card are deferred, and touching any of them loads
+    all missing fields with a single query.
+    """
+
+    CARD_FIELDS = ("id", "full_name", "role")
+
+    class Meta:
+        proxy = True
+
+    @classmethod
+    def from_card(cls, card: dict) -> "LightweightUser":
+        return cls.from_db(
+            None, list(cls.CARD_FIELDS), [card[field] for field in cls.CARD_FIELDS]
+        )
+
+    @classmethod
+    def get_card(cls, user: User) -> dict:
+        return {field: getattr(user, field) for field in cls.CARD_FIELDS}
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        deferred_fields = self.get_deferred_fields()
+        if fields is not None and set(fields) <= deferred_fields:
+            fields = list(deferred_fields)
+
+        super().refresh_from_db(using, fields, from_queryset)
+
+
 class VerifyToken(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
     email = models.EmailField(_("email address"))
@@ -64,6 +97,11 @@ class VerifyToken(models.Model):
 
         super().save(*args, **kwargs)
 
+    @classmethod
+    def get_valid_since(cls):
+        """Return the moment before which created tokens are expired"""
+        return timezone.now() - timedelta(hours=settings.VERIFY_TOKEN_LIFETIME_HOURS)
+
     @property
     def restore_link(self):
         base_domain = settings.BASE_UI_DOMAIN
@@ -3,10 +3,17 @@ from django.contrib.auth.password_validation import validate_password
 from django.utils.translation import gettext_lazy as _
 
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
 
 from drf_spectacular.utils import extend_schema_field, OpenApiTypes
 
 from accounts.models import VerifyToken
+from accounts.services.user_claims import UserClaimsService
 from habits.models import UserHabit
 
 User = get_user_model()
@@ -35,6 +42,9 @@ class CurrentUserSerializer(serializers.ModelSerializer):
 
     @extend_schema_field(OpenApiTypes.BOOL)
     def get_selected_habits(self, obj):
+        if hasattr(obj, "has_selected_habits"):
+            return obj.has_selected_habits
+
         return UserHabit.objects.filter(user=obj).exists()
 
 
@@ -71,7 +81,9 @@ class UpdateForgottenPasswordSerializer(serializers.Serializer):
         return value
 
     def validate(self, data):
-        verify_token = VerifyToken.objects.filter(token=data["token"]).first()
+        verify_token = VerifyToken.objects.filter(
+            token=data["token"], created_at__gte=VerifyToken.get_valid_since()
+        ).first()
         if not verify_token:
             raise serializers.ValidationError(_("The link is not found"))
 
@@ -105,6 +117,35 @@ class UserSuggestionSerializer(serializers.ModelSerializer):
         fields = ["id", "full_name"]
 
 
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        return UserClaimsService.add_claims(super().get_token(user), user)
+
+
+class ClaimsRefreshToken(RefreshToken):
+    @property
+    def access_token(self):
+        # Access tokens copy the refresh token's claims, including its "iat"
+        # and a card that may be outdated by now, so both are re-stamped.
+        access = super().access_token
+        user = User.objects.get(
+            **{api_settings.USER_ID_FIELD: self[api_settings.USER_ID_CLAIM]}
+        )
+        access.set_iat()
+
+        return UserClaimsService.add_claims(access, user)
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = ClaimsRefreshToken
+
+
+class WebSocketTicketSerializer(serializers.Serializer):
+    ticket = serializers.CharField(read_only=True)
+    expires_in = serializers.IntegerField(read_only=True)
+
+
 class UserWebSocketSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
@@ -0,0 +1,12 @@
+from accounts.models import VerifyToken
+from nevroth.retention import RetentionPolicy
+
+
+class AccountRetentionService:
+    @classmethod
+    def get_policies(cls) -> list[RetentionPolicy]:
+        return [RetentionPolicy("expired_verify_tokens", cls.get_expired_verify_tokens)]
+
+    @classmethod
+    def get_expired_verify_tokens(cls):
+        return VerifyToken.objects.filter(created_at__lt=VerifyToken.get_valid_since())
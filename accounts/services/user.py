@@ -1,5 +1,6 @@
 from django.contrib.auth import get_user_model
 from django.db.models.aggregates import Count
+from django.db.models.expressions import Exists, OuterRef
 from django.db.models.query_utils import Q
 
 from habits.models import UserHabit
@@ -32,3 +33,10 @@ class UserService:
     @classmethod
     def has_selected_habits(cls, user_id: int) -> bool:
         return UserHabit.objects.filter(user_id=user_id).exists()
+
+    @classmethod
+    def get_profile(cls, user_id: int) -> User:
+        """Load the user with the `has_selected_habits` flag in a single query"""
+        return User.objects.annotate(
+            has_selected_habits=Exists(UserHabit.objects.filter(user_id=OuterRef("pk")))
+        ).get(id=user_id)
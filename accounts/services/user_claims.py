@@ -0,0 +1,49 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.conf import settings
+from rest_framework_simplejwt.settings import api_settings
+
+User = get_user_model()
+
+
+class UserClaimsService:
+    """
+    Service to carry the user's card in access tokens.
+
+    Tokens issued before the user was changed or deleted must not be trusted,
+    so every change leaves a marker in the cache for as long as such tokens
+    can be alive.
+    """
+
+    CLAIMS = ("full_name", "role")
+
+    @classmethod
+    def _marker_key(cls, user_id: int) -> str:
+        return f"{settings.USER_CHANGED_KEY_PREFIX}:{user_id}"
+
+    @classmethod
+    def add_claims(cls, token, user: User):
+        for claim in cls.CLAIMS:
+            token[claim] = getattr(user, claim)
+
+        return token
+
+    @classmethod
+    def has_claims(cls, token) -> bool:
+        return all(claim in token for claim in cls.CLAIMS)
+
+    @classmethod
+    def mark_user_changed(cls, user_id: int):
+        cache.set(
+            cls._marker_key(user_id),
+            time.time(),
+            timeout=int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()),
+        )
+
+    @classmethod
+    def is_changed_since(cls, user_id: int, issued_at: int) -> bool:
+        changed_at = cache.get(cls._marker_key(user_id))
+        # Token "iat" is truncated to seconds, so compare at the same precision.
+        return changed_at is not None and int(changed_at) >= issued_at
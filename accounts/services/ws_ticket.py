@@ -0,0 +1,42 @@
+import json
+import secrets
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django_redis import get_redis_connection
+
+from accounts.models import LightweightUser
+
+User = get_user_model()
+
+
+class WebSocketTicketService:
+    """
+    Service to issue single-use tickets for authenticating websocket connects.
+
+    A ticket is stored in Redis together with the user's card, so redeeming it
+    costs one Redis command and no database queries.
+    """
+
+    @classmethod
+    def _key(cls, ticket: str) -> str:
+        return f"{settings.WS_TICKET_KEY_PREFIX}:{ticket}"
+
+    @classmethod
+    def issue_ticket(cls, user: User) -> str:
+        ticket = secrets.token_urlsafe(32)
+        get_redis_connection("default").set(
+            cls._key(ticket),
+            json.dumps(LightweightUser.get_card(user)),
+            ex=settings.WS_TICKET_TTL_SECONDS,
+        )
+
+        return ticket
+
+    @classmethod
+    def redeem_ticket(cls, ticket: str) -> LightweightUser | None:
+        card = get_redis_connection("default").getdel(cls._key(ticket))
+        if card is None:
+            return None
+
+        return LightweightUser.from_card(json.loads(card))
@@ -0,0 +1,25 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch.dispatcher import receiver
+
+from accounts.models import LightweightUser
+from accounts.services.user_claims import UserClaimsService
+
+User = get_user_model()
+
+
+# Saving a proxy instance sends signals with the proxy as the sender.
+@receiver([post_save], sender=User)
+@receiver([post_save], sender=LightweightUser)
+def mark_changed_user(sender, instance, update_fields=None, **kwargs):
+    # Logging in only updates last_login, which isn't carried by tokens.
+    if update_fields and set(update_fields) <= {"last_login"}:
+        return
+
+    UserClaimsService.mark_user_changed(instance.id)
+
+
+@receiver([post_delete], sender=User)
+@receiver([post_delete], sender=LightweightUser)
+def mark_deleted_user(sender, instance, **kwargs):
+    UserClaimsService.mark_user_changed(instance.id)
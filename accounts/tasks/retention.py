@@ -0,0 +1,12 @@
+from celery import shared_task
+
+from accounts.services.retention import AccountRetentionService
+from nevroth.retention import RetentionService
+
+
+@shared_task
+def purge_expired_account_records_task():
+    return {
+        policy.name: RetentionService.purge(policy)
+        for policy in AccountRetentionService.get_policies()
+    }
@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+from rest_framework.test import APITestCase
+
+from accounts.models import VerifyToken
+from accounts.tasks.retention import purge_expired_account_records_task
+from accounts.tests.factories.user import MemberFactory
+
+
+class PurgeExpiredAccountRecordsTaskTests(APITestCase):
+    def test_expired_verify_tokens_are_purged(self):
+        """Test that only verify tokens past their lifetime are deleted."""
+        users = MemberFactory.create_batch(3)
+        tokens = [
+            VerifyToken.objects.create(user=user, email=user.email) for user in users
+        ]
+        VerifyToken.objects.filter(id__in=[tokens[0].id, tokens[1].id]).update(
+            created_at=VerifyToken.get_valid_since() - timedelta(minutes=1)
+        )
+
+        result = purge_expired_account_records_task()
+
+        self.assertEqual(result, {"expired_verify_tokens": 2})
+        self.assertQuerySetEqual(
+            VerifyToken.objects.values_list("id", flat=True), [tokens[2].id]
+        )
@@ -0,0 +1,115 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory, APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.authentication import ClaimsJWTAuthentication
+from accounts.models import LightweightUser
+from accounts.serializers import ClaimsTokenObtainPairSerializer
+from accounts.services.user_claims import UserClaimsService
+from accounts.tests.factories.user import MemberFactory
+
+User = get_user_model()
+
+
+class ClaimsJWTAuthenticationTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = MemberFactory()
+
+    def setUp(self):
+        # Creating the user marks it as changed, which would outdate new tokens.
+        cache.delete(UserClaimsService._marker_key(self.user.id))
+        self.token = ClaimsTokenObtainPairSerializer.get_token(self.user).access_token
+
+    def _authenticate(self, token):
+        request = APIRequestFactory().get(
+            "/", HTTP_AUTHORIZATION=f"Bearer {str(token)}"
+        )
+        return ClaimsJWTAuthentication().authenticate(request)[0]
+
+    def test_token_contains_claims(self):
+        """Test that obtained tokens carry the user's card."""
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"email": self.user.email, "password": "password"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        token = AccessToken(response.data["access"])
+        self.assertEqual(token["full_name"], self.user.full_name)
+        self.assertEqual(token["role"], self.user.role)
+
+    def test_user_built_from_claims(self):
+        """Test that the user is built from claims without database queries."""
+        with self.assertNumQueries(0):
+            user = self._authenticate(self.token)
+
+        self.assertIsInstance(user, LightweightUser)
+        self.assertEqual(user.id, self.user.id)
+        self.assertEqual(user.role, self.user.role)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(user.email, self.user.email)
+
+    def test_changed_user_is_loaded(self):
+        """Test that tokens issued before a user change load the user."""
+        self.user.full_name = "Changed Name"
+        self.user.save()
+
+        with self.assertNumQueries(1):
+            user = self._authenticate(self.token)
+
+        self.assertNotIsInstance(user, LightweightUser)
+        self.assertEqual(user.full_name, "Changed Name")
+
+    def test_refreshed_token_carries_current_claims(self):
+        """Test that refreshing after a user change issues the user's current card."""
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"email": self.user.email, "password": "password"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.user.role = User.Role.ADMIN
+        self.user.save()
+        # The marker expires long before the refresh token does.
+        cache.delete(UserClaimsService._marker_key(self.user.id))
+
+        response = self.client.post(
+            reverse("token_refresh"), {"refresh": response.data["refresh"]}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        token = AccessToken(response.data["access"])
+        self.assertEqual(token["role"], User.Role.ADMIN)
+
+        user = self._authenticate(token)
+        self.assertIsInstance(user, LightweightUser)
+        self.assertEqual(user.role, User.Role.ADMIN)
+
+    def test_deleted_user_is_rejected(self):
+        """Test that tokens of a deleted user are rejected."""
+        self.user.delete()
+
+        with self.assertRaises(AuthenticationFailed):
+            self._authenticate(self.token)
+
+    def test_token_without_claims_loads_user(self):
+        """Test that tokens issued without claims keep working."""
+        user = self._authenticate(AccessToken.for_user(self.user))
+
+        self.assertNotIsInstance(user, LightweightUser)
+        self.assertEqual(user.id, self.user.id)
+
+    def test_current_profile_with_claims_token(self):
+        """Test that views reading other fields work with the lightweight user."""
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {str(self.token)}")
+
+        response = self.client.get(reverse("user-profile"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["email"], self.user.email)
@@ -1,4 +1,5 @@
 import uuid
+from datetime import timedelta
 
 from django.urls import reverse
 from django.core import mail
@@ -76,3 +77,15 @@ class ForgotPasswordFlowTests(APITestCase):
         # Refresh user from the DB and verify that the password has been updated.
         self.user.refresh_from_db()
         self.assertTrue(self.user.check_password(new_password))
+
+    def test_update_forgot_password_with_expired_token(self):
+        """Ensure that an expired token can't be used to update the password."""
+        token = VerifyToken.objects.create(user=self.user, email=self.user.email)
+        VerifyToken.objects.filter(id=token.id).update(
+            created_at=VerifyToken.get_valid_since() - timedelta(minutes=1)
+        )
+
+        data = {"token": str(token.token), "password": "new_secure_password"}
+        response = self.client.post(self.update_url, data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("The link is not found", str(response.data))
@@ -0,0 +1,70 @@
+import jsonschema
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import LightweightUser
+from accounts.services.ws_ticket import WebSocketTicketService
+from accounts.tests.factories.user import MemberFactory
+
+ws_ticket_schema = {
+    "type": "object",
+    "properties": {
+        "ticket": {"type": "string", "minLength": 1},
+        "expires_in": {"type": "integer", "minimum": 1},
+    },
+    "required": ["ticket", "expires_in"],
+    "additionalProperties": False,
+}
+
+
+class WebSocketTicketTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.url = reverse("ws_ticket")
+        cls.user = MemberFactory()
+
+    def test_authentication_required(self):
+        """Test that authentication is required to get a ticket."""
+        response = self.client.post(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_issue_ticket(self):
+        """Test that an issued ticket can be redeemed for the user."""
+        self.client.force_authenticate(self.user)
+
+        response = self.client.post(self.url)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self._assert_response_schema(response.data)
+
+        with self.assertNumQueries(0):
+            user = WebSocketTicketService.redeem_ticket(response.data["ticket"])
+
+        self.assertIsInstance(user, LightweightUser)
+        self.assertEqual(user.id, self.user.id)
+        self.assertEqual(user.full_name, self.user.full_name)
+        self.assertEqual(user.role, self.user.role)
+
+    def test_ticket_is_single_use(self):
+        """Test that a ticket can't be redeemed twice."""
+        ticket = WebSocketTicketService.issue_ticket(self.user)
+
+        self.assertIsNotNone(WebSocketTicketService.redeem_ticket(ticket))
+        self.assertIsNone(WebSocketTicketService.redeem_ticket(ticket))
+
+    def test_lightweight_user_loads_missing_fields_at_once(self):
+        """Test that touching a field outside of the card loads all fields once."""
+        user = LightweightUser.from_card(LightweightUser.get_card(self.user))
+
+        with self.assertNumQueries(1):
+            self.assertEqual(user.email, self.user.email)
+            self.assertEqual(user.created_at, self.user.created_at)
+            self.assertFalse(user.is_staff)
+
+    def _assert_response_schema(self, data):
+        """Validate that the response matches the expected schema."""
+        try:
+            jsonschema.validate(instance=data, schema=ws_ticket_schema)
+        except jsonschema.exceptions.ValidationError as e:
+            self.fail(f"Response does not match schema: {e}")
@@ -11,6 +11,7 @@ from accounts.views import (
     CurrentUserProfileView,
     UsersSearchView,
     SuggestedFriendsListView,
+    WebSocketTicketView,
 )
 
 urlpatterns = [
@@ -20,6 +21,7 @@ urlpatterns = [
         "token/refresh/", TokenRefreshView.as_view(), name="token_refresh"
     ),  # Refresh token
     path("register/", RegistrationView.as_view(), name="register"),
+    path("auth/ws-ticket/", WebSocketTicketView.as_view(), name="ws_ticket"),
     path(
         "auth/password/reset-request/",
         RequestForgotPasswordView.as_view(),
@@ -16,9 +16,12 @@ from accounts.serializers import (
     CurrentUserSerializer,
     UserSearchResultSerializer,
     UserSuggestionSerializer,
+    WebSocketTicketSerializer,
 )
 from accounts.services.user import UserService
+from accounts.services.ws_ticket import WebSocketTicketService
 from accounts.tasks.followup import follow_up_no_habits_selected_task
+from nevroth.db.replica import ReadReplicaMixin
 
 User = get_user_model()
 
@@ -30,7 +33,7 @@ class CurrentUserProfileView(RetrieveUpdateAPIView):
         return User.objects.filter(id=self.request.user.id)
 
     def get_object(self):
-        return self.request.user
+        return UserService.get_profile(self.request.user.id)
 
 
 class RegistrationView(APIView):
@@ -50,6 +53,18 @@ class RegistrationView(APIView):
         return Response(status=status.HTTP_201_CREATED)
 
 
+class WebSocketTicketView(GenericAPIView):
+    serializer_class = WebSocketTicketSerializer
+
+    def post(self, request, *args, **kwargs):
+        ticket = WebSocketTicketService.issue_ticket(request.user)
+        serializer = self.get_serializer(
+            {"ticket": ticket, "expires_in": settings.WS_TICKET_TTL_SECONDS}
+        )
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
 class RequestForgotPasswordView(GenericAPIView):
     authentication_classes = []
     permission_classes = [AllowAny]
@@ -78,7 +93,7 @@ class UpdateForgottenPasswordView(GenericAPIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class UsersSearchView(ListAPIView):
+class UsersSearchView(ReadReplicaMixin, ListAPIView):
     serializer_class = UserSearchResultSerializer
     filter_backends = [DjangoFilterBackend]
     filterset_class = UserFilter
@@ -90,7 +105,7 @@ class UsersSearchView(ListAPIView):
         return User.objects.with_relation_status(self.request.user)
 
 
-class SuggestedFriendsListView(ListAPIView):
+class SuggestedFriendsListView(ReadReplicaMixin, ListAPIView):
     serializer_class = UserSuggestionSerializer
 
     def get_queryset(self):
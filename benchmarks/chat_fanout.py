@@ -0,0 +1,332 @@
+import asyncio
+import gc
+import json
+import time
+import tracemalloc
+import uuid
+from dataclasses import asdict, dataclass
+
+import redis
+from asgiref.sync import async_to_sync
+from channels.layers import DEFAULT_CHANNEL_LAYER, InMemoryChannelLayer, channel_layers
+from channels.testing import HttpCommunicator, WebsocketCommunicator
+from channels_redis.core import RedisChannelLayer
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.test import override_settings
+from django.urls import reverse
+from django_redis import get_redis_connection
+from rest_framework_simplejwt.tokens import AccessToken
+
+from benchmarks.utils import summarize_latencies
+from chats.enums import ChatWebSocketClientEventType, ChatWebSocketServerEventType
+from chats.models import Chat, ChatMember
+
+User = get_user_model()
+
+CHANNEL_LAYER_CAPACITY = 10000
+
+
+@dataclass
+class ChatFanoutOptions:
+    chats: int = 100
+    members_per_chat: int = 10
+    messages_per_chat: int = 5
+    typing_per_message: int = 2
+    concurrency: int = 50
+    chat_list: bool = True
+    channel_layer: str = "auto"
+    timeout: float = 60
+
+
+@dataclass
+class BenchmarkSocket:
+    communicator: WebsocketCommunicator
+    user_id: int
+    chat_id: int
+
+
+class ChatFanoutBenchmark:
+    """
+    Measure chat fanout from the message POST to delivery on the sockets.
+
+    The ASGI application runs in-process: every chat member opens a chat socket
+    (and a chat list socket), senders emit typing events on their chat socket
+    and then create a message over HTTP. Every delivered `new_message` event is
+    matched to the moment its POST started.
+    """
+
+    def __init__(self, options: ChatFanoutOptions):
+        self.options = options
+        self.run_id = uuid.uuid4().hex[:8]
+
+        self.sent_at = {}
+        self.delivery_latencies = []
+        self.post_latencies = []
+        self.failed_posts = 0
+        self.typing_events = 0
+        self.closed_sockets = 0
+        self.expected_deliveries = 0
+        self.all_delivered = None
+
+    def run(self) -> dict:
+        chats = self._create_chats()
+        channel_layer_name = self._resolve_channel_layer()
+
+        # Presence needs the Redis cache, which only the Redis setup guarantees,
+        # and its keys are kept apart from the real ones.
+        presence_prefix = f"benchmark-presence-{self.run_id}"
+        with override_settings(
+            PRESENCE_ENABLED=channel_layer_name == "redis",
+            PRESENCE_KEY_PREFIX=presence_prefix,
+        ):
+            try:
+                report = async_to_sync(self._run)(chats, channel_layer_name)
+            finally:
+                if channel_layer_name == "redis":
+                    self._delete_keys(f"{presence_prefix}:*")
+
+        return {"options": asdict(self.options), **report}
+
+    def _delete_keys(self, pattern: str):
+        connection = get_redis_connection("default")
+        keys = list(connection.scan_iter(pattern))
+        if keys:
+            connection.delete(*keys)
+
+    def _create_chats(self) -> list[tuple[int, list[tuple[int, str]]]]:
+        """Create chats and their members, returning (user_id, token) per chat"""
+        options = self.options
+        password = make_password(None)
+
+        users = User.objects.bulk_create(
+            User(
+                email=f"bench-{self.run_id}-{index}@example.com",
+                full_name=f"Benchmark User {index}",
+                role=User.Role.MEMBER,
+                password=password,
+            )
+            for index in range(options.chats * options.members_per_chat)
+        )
+        chats = Chat.objects.bulk_create(
+            Chat(chat_type=Chat.ChatType.GROUP) for _ in range(options.chats)
+        )
+
+        members = [
+            users[
+                chat_index * options.members_per_chat : (chat_index + 1)
+                * options.members_per_chat
+            ]
+            for chat_index in range(options.chats)
+        ]
+        ChatMember.objects.bulk_create(
+            ChatMember(chat=chat, user=user)
+            for chat, chat_members in zip(chats, members)
+            for user in chat_members
+        )
+
+        return [
+            (
+                chat.id,
+                [(user.id, str(AccessToken.for_user(user))) for user in chat_members],
+            )
+            for chat, chat_members in zip(chats, members)
+        ]
+
+    def _resolve_channel_layer(self) -> str:
+        if self.options.channel_layer != "auto":
+            return self.options.channel_layer
+
+        try:
+            redis.Redis(
+                host=settings.REDIS_HOST, port=settings.REDIS_PORT, socket_timeout=1
+            ).ping()
+        except redis.RedisError:
+            return "memory"
+
+        return "redis"
+
+    def _make_channel_layer(self, name: str):
+        if name == "redis":
+            return RedisChannelLayer(
+                hosts=[(settings.REDIS_HOST, int(settings.REDIS_PORT))],
+                capacity=CHANNEL_LAYER_CAPACITY,
+            )
+
+        return InMemoryChannelLayer(capacity=CHANNEL_LAYER_CAPACITY)
+
+    async def _run(self, chats, channel_layer_name: str) -> dict:
+        from nevroth.asgi import application
+
+        previous_layer = channel_layers.set(
+            DEFAULT_CHANNEL_LAYER, self._make_channel_layer(channel_layer_name)
+        )
+        try:
+            gc.collect()
+            tracemalloc.start()
+            memory_before = tracemalloc.get_traced_memory()[0]
+
+            sockets = await self._connect(application, chats)
+
+            memory_used = tracemalloc.get_traced_memory()[0] - memory_before
+            tracemalloc.stop()
+
+            self.all_delivered = asyncio.Event()
+            receivers = [
+                asyncio.create_task(self._receive(socket)) for socket in sockets
+            ]
+
+            started_at = time.perf_counter()
+            await self._send_messages(application, chats, sockets)
+            try:
+                await asyncio.wait_for(
+                    self.all_delivered.wait(), timeout=self.options.timeout
+                )
+            except asyncio.TimeoutError:
+                pass
+            elapsed = time.perf_counter() - started_at
+
+            for receiver in receivers:
+                receiver.cancel()
+            await self._gather_limited(
+                socket.communicator.disconnect() for socket in sockets
+            )
+        finally:
+            channel_layers.set(DEFAULT_CHANNEL_LAYER, previous_layer)
+
+        messages_sent = len(self.sent_at)
+
+        return {
+            "channel_layer": channel_layer_name,
+            "connections": len(sockets),
+            "elapsed_seconds": round(elapsed, 3),
+            "messages": {
+                "sent": messages_sent,
+                "failed": self.failed_posts,
+                "post": summarize_latencies(self.post_latencies),
+            },
+            "deliveries": {
+                "expected": self.expected_deliveries,
+                "received": len(self.delivery_latencies),
+                "latency": summarize_latencies(self.delivery_latencies),
+            },
+            "typing_events_received": self.typing_events,
+            "closed_sockets": self.closed_sockets,
+            "throughput": {
+                "messages_per_second": round(messages_sent / elapsed, 2),
+                "deliveries_per_second": round(
+                    len(self.delivery_latencies) / elapsed, 2
+                ),
+            },
+            "memory": {
+                "total_bytes": memory_used,
+                "per_connection_bytes": (
+                    round(memory_used / len(sockets)) if sockets else None
+                ),
+            },
+        }
+
+    async def _connect(self, application, chats) -> list[BenchmarkSocket]:
+        paths = []
+        for chat_id, members in chats:
+            for user_id, token in members:
+                paths.append((f"ws/chats/{chat_id}/?token={token}", user_id, chat_id))
+                if self.options.chat_list:
+                    paths.append((f"ws/chat-list/?token={token}", user_id, None))
+
+        async def connect(path, user_id, chat_id):
+            communicator = WebsocketCommunicator(application, path)
+            connected, _ = await communicator.connect(timeout=self.options.timeout)
+            if not connected:
+                raise RuntimeError(f"Benchmark socket {path} was rejected")
+
+            return BenchmarkSocket(communicator, user_id, chat_id)
+
+        return await self._gather_limited(connect(*path) for path in paths)
+
+    async def _receive(self, socket: BenchmarkSocket):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            # Reading the queue directly, unlike receive_json_from(), doesn't
+            # cancel the application when the socket stays idle.
+            message = await socket.communicator.output_queue.get()
+            received_at = loop.time()
+
+            if message["type"] == "websocket.close":
+                self.closed_sockets += 1
+                return
+
+            event = json.loads(message["text"])
+            if event["type"] == ChatWebSocketServerEventType.NEW_MESSAGE:
+                content = event["message"]["content"]
+                self.delivery_latencies.append(received_at - self.sent_at[content])
+                if len(self.delivery_latencies) >= self.expected_deliveries:
+                    self.all_delivered.set()
+            elif event["type"] in (
+                ChatWebSocketClientEventType.TYPING,
+                ChatWebSocketClientEventType.STOP_TYPING,
+            ):
+                self.typing_events += 1
+
+    async def _send_messages(self, application, chats, sockets):
+        options = self.options
+        chat_sockets = {
+            (socket.chat_id, socket.user_id): socket.communicator
+            for socket in sockets
+            if socket.chat_id is not None
+        }
+
+        # Every member's chat socket gets the message, chat lists skip the sender.
+        deliveries_per_message = options.members_per_chat
+        if options.chat_list:
+            deliveries_per_message += options.members_per_chat - 1
+        self.expected_deliveries = (
+            options.chats * options.messages_per_chat * deliveries_per_message
+        )
+
+        url = reverse("chat-message-list")
+        loop = asyncio.get_running_loop()
+
+        async def send(chat_id, user_id, token, content):
+            communicator = chat_sockets[(chat_id, user_id)]
+            for _ in range(options.typing_per_message):
+                await communicator.send_json_to(
+                    {"type": ChatWebSocketClientEventType.TYPING}
+                )
+            await communicator.send_json_to(
+                {"type": ChatWebSocketClientEventType.STOP_TYPING}
+            )
+
+            request = HttpCommunicator(
+                application,
+                "POST",
+                url,
+                body=json.dumps({"chat": chat_id, "content": content}).encode(),
+                headers=[
+                    (b"host", b"localhost"),
+                    (b"content-type", b"application/json"),
+                    (b"authorization", f"Bearer {token}".encode()),
+                ],
+            )
+            self.sent_at[content] = loop.time()
+            response = await request.get_response(timeout=options.timeout)
+            self.post_latencies.append(loop.time() - self.sent_at[content])
+            if response["status"] != 201:
+                self.failed_posts += 1
+
+        await self._gather_limited(
+            send(chat_id, *members[index % len(members)], f"bench {chat_id}:{index}")
+            for index in range(options.messages_per_chat)
+            for chat_id, members in chats
+        )
+
+    async def _gather_limited(self, coroutines):
+        semaphore = asyncio.Semaphore(self.options.concurrency)
+
+        async def limited(coroutine):
+            async with semaphore:
+                return await coroutine
+
+        return await asyncio.gather(*(limited(coroutine) for coroutine in coroutines))
@@ -0,0 +1,380 @@
+import csv
+import io
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import timedelta
+from itertools import islice
+from typing import Iterable
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.utils import timezone
+from faker import Faker
+
+from chats.models import Chat, ChatMember, ChatMessage
+from chats.services.chat_message_partition import ChatMessagePartitionService
+from friends.models import FriendsRelation
+from habits.constants import REQUIRED_HABITS_COUNT
+from habits.models import Habit, HabitProgress, UserHabit
+from notifications.models import (
+    BroadcastNotification,
+    Notification,
+    NotificationMessage,
+)
+
+User = get_user_model()
+
+DATASET_EMAIL_PREFIX = "dataset-"
+COPY_BATCH_SIZE = 50000
+
+# Generated texts are drawn from pools, which is much faster than faking each.
+NAMES_POOL_SIZE = 5000
+SENTENCES_POOL_SIZE = 2000
+
+USER_FIELDS = [
+    "email",
+    "full_name",
+    "password",
+    "role",
+    "is_superuser",
+    "is_staff",
+    "created_at",
+    "updated_at",
+]
+
+
+@dataclass
+class DatasetOptions:
+    users: int = 20000
+    habits: int = 30
+    progress_days: int = 60
+    progress_skip_rate: float = 0.1
+    friends_per_user: int = 10
+    private_chats: int = 10000
+    group_chats: int = 500
+    members_per_group_chat: int = 20
+    messages_per_chat: int = 40
+    history_days: int = 28
+    notifications_per_user: int = 10
+    broadcasts: int = 100
+    seed: int = 0
+
+
+class DatasetGenerator:
+    """
+    Generate a production-scale dataset with Postgres COPY.
+
+    Rows are streamed in CSV batches, bypassing models, signals and factories.
+    Every table is analyzed afterwards, so benchmarks run with fresh planner
+    statistics.
+    """
+
+    def __init__(self, options: DatasetOptions):
+        self.options = options
+        self.run_id = uuid.uuid4().hex[:8]
+        self.random = random.Random(options.seed)
+        self.now = timezone.now()
+        self.counts = {}
+        self.password = make_password(None)
+
+        faker = Faker()
+        faker.seed_instance(options.seed)
+        self.names = [faker.name() for _ in range(NAMES_POOL_SIZE)]
+        self.sentences = [
+            faker.sentence(nb_words=10) for _ in range(SENTENCES_POOL_SIZE)
+        ]
+
+    def generate(self) -> dict:
+        started_at = time.perf_counter()
+
+        with transaction.atomic():
+            users_ids = self._create_users()
+            habits_ids = self._create_habits()
+            users_habits = self._create_users_habits(users_ids, habits_ids)
+            self._create_habits_progress(users_habits)
+            self._create_friends_relations(users_ids)
+            self._create_chats(users_ids)
+            self._create_notifications(users_ids, habits_ids)
+
+        self._analyze()
+
+        return {
+            "run_id": self.run_id,
+            "elapsed_seconds": round(time.perf_counter() - started_at, 3),
+            "rows": self.counts,
+        }
+
+    def _create_users(self) -> list[int]:
+        return self._copy_returning_ids(
+            User,
+            USER_FIELDS,
+            (
+                self._user_row(f"{index}", self.random.choice(self.names))
+                for index in range(self.options.users)
+            ),
+        )
+
+    def _user_row(self, key: str, full_name: str, role=User.Role.MEMBER) -> list:
+        created_at = self._random_moment(days=365)
+
+        return [
+            f"{DATASET_EMAIL_PREFIX}{self.run_id}-{key}@example.com",
+            full_name,
+            self.password,
+            role,
+            False,
+            False,
+            created_at,
+            created_at,
+        ]
+
+    def _create_habits(self) -> list[int]:
+        return self._copy_returning_ids(
+            Habit,
+            ["name", "description"],
+            (
+                [f"Dataset habit {index}", self.random.choice(self.sentences)]
+                for index in range(self.options.habits)
+            ),
+        )
+
+    def _create_users_habits(
+        self, users_ids: list[int], habits_ids: list[int]
+    ) -> list[tuple[int, int]]:
+        users_habits = [
+            (user_id, habit_id)
+            for user_id in users_ids
+            for habit_id in self.random.sample(habits_ids, REQUIRED_HABITS_COUNT)
+        ]
+        self._copy(UserHabit, ["user", "habit"], users_habits)
+
+        return users_habits
+
+    def _create_habits_progress(self, users_habits: list[tuple[int, int]]):
+        today = self.now.date()
+        days = [
+            today - timedelta(days=day) for day in range(self.options.progress_days)
+        ]
+
+        self._copy(
+            HabitProgress,
+            ["user", "habit", "date", "status", "updated_at"],
+            (
+                [
+                    user_id,
+                    habit_id,
+                    date,
+                    (
+                        HabitProgress.Status.SUCCESS
+                        if self.random.random() < 0.8
+                        else HabitProgress.Status.FAIL
+                    ),
+                    self.now,
+                ]
+                for user_id, habit_id in users_habits
+                for date in days
+                if self.random.random() >= self.options.progress_skip_rate
+            ),
+        )
+
+    def _create_friends_relations(self, users_ids: list[int]):
+        statuses = [
+            FriendsRelation.Status.ACCEPTED,
+            FriendsRelation.Status.PENDING,
+            FriendsRelation.Status.REJECTED,
+        ]
+        pairs = set()
+        relations = []
+
+        for from_user_id in users_ids:
+            for to_user_id in self.random.sample(
+                users_ids, min(self.options.friends_per_user, len(users_ids))
+            ):
+                pair = frozenset((from_user_id, to_user_id))
+                if len(pair) < 2 or pair in pairs:
+                    continue
+
+                pairs.add(pair)
+                relations.append(
+                    [
+                        from_user_id,
+                        to_user_id,
+                        self.random.choices(statuses, weights=[6, 3, 1])[0],
+                        self._random_moment(days=365),
+                    ]
+                )
+
+        self._copy(
+            FriendsRelation, ["from_user", "to_user", "status", "created_at"], relations
+        )
+
+    def _create_chats(self, users_ids: list[int]):
+        options = self.options
+        chats_members = [
+            self.random.sample(users_ids, 2) for _ in range(options.private_chats)
+        ] + [
+            self.random.sample(
+                users_ids, min(options.members_per_group_chat, len(users_ids))
+            )
+            for _ in range(options.group_chats)
+        ]
+        chats_types = [Chat.ChatType.PRIVATE] * options.private_chats + [
+            Chat.ChatType.GROUP
+        ] * options.group_chats
+
+        chats_created_at = [
+            self._random_moment(days=options.history_days) for _ in chats_members
+        ]
+        chats_ids = self._copy_returning_ids(
+            Chat,
+            ["chat_type", "created_at", "updated_at"],
+            (
+                [chat_type, created_at, created_at]
+                for chat_type, created_at in zip(chats_types, chats_created_at)
+            ),
+        )
+        self._copy(
+            ChatMember,
+            ["chat", "user", "created_at"],
+            (
+                [chat_id, user_id, created_at]
+                for chat_id, members, created_at in zip(
+                    chats_ids, chats_members, chats_created_at
+                )
+                for user_id in members
+            ),
+        )
+
+        # Weekly partitions are created ahead only, so add the ones of the history.
+        week = ChatMessagePartitionService.get_partition_for(
+            self.now - timedelta(days=options.history_days)
+        )
+        while week.start <= self.now:
+            ChatMessagePartitionService.create_partition(week)
+            week = ChatMessagePartitionService.get_partition_for(week.end)
+
+        self._copy(
+            ChatMessage,
+            ["chat", "sender", "content", "created_at", "updated_at"],
+            (
+                [
+                    chat_id,
+                    self.random.choice(members),
+                    self.random.choice(self.sentences),
+                    sent_at,
+                    sent_at,
+                ]
+                for chat_id, members, created_at in zip(
+                    chats_ids, chats_members, chats_created_at
+                )
+                for sent_at in sorted(
+                    created_at + (self.now - created_at) * self.random.random()
+                    for _ in range(options.messages_per_chat)
+                )
+            ),
+        )
+
+    def _create_notifications(self, users_ids: list[int], habits_ids: list[int]):
+        options = self.options
+        (sender_id,) = self._copy_returning_ids(
+            User,
+            USER_FIELDS,
+            [self._user_row("admin", "Dataset Admin", User.Role.ADMIN)],
+        )
+
+        # Personal notifications share messages, as when sent to users by habits.
+        messages_count = max(options.notifications_per_user, 1) * 10
+        messages_ids = self._copy_returning_ids(
+            NotificationMessage,
+            ["sender", "text", "created_at"],
+            (
+                [sender_id, self.random.choice(self.sentences), self.now]
+                for _ in range(messages_count + options.broadcasts)
+            ),
+        )
+        personal_messages_ids = messages_ids[:messages_count]
+
+        self._copy(
+            Notification,
+            ["recipient", "message", "is_read", "is_dismissed", "sent_at"],
+            (
+                [
+                    user_id,
+                    self.random.choice(personal_messages_ids),
+                    self.random.random() < 0.7,
+                    False,
+                    self._random_moment(days=options.history_days),
+                ]
+                for user_id in users_ids
+                for _ in range(options.notifications_per_user)
+            ),
+        )
+        self._copy(
+            BroadcastNotification,
+            ["message", "habits_ids", "audience_snapshot_at", "published_at"]
+            + ["created_at"],
+            (
+                self._broadcast_row(message_id, habits_ids)
+                for message_id in messages_ids[messages_count:]
+            ),
+        )
+
+    def _broadcast_row(self, message_id: int, habits_ids: list[int]) -> list:
+        habits_ids = self.random.sample(habits_ids, min(3, len(habits_ids)))
+        published_at = self._random_moment(days=self.options.history_days)
+
+        return [
+            message_id,
+            "{%s}" % ",".join(map(str, habits_ids)),
+            published_at,
+            published_at,
+            published_at,
+        ]
+
+    def _random_moment(self, days: int):
+        return self.now - timedelta(seconds=self.random.uniform(0, days * 86400))
+
+    def _copy(self, model, fields: list[str], rows: Iterable[list]) -> int:
+        table = connection.ops.quote_name(model._meta.db_table)
+        columns = ", ".join(
+            connection.ops.quote_name(model._meta.get_field(field).column)
+            for field in fields
+        )
+        sql = f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)"
+
+        copied = 0
+        rows = iter(rows)
+        with connection.cursor() as cursor:
+            while batch := list(islice(rows, COPY_BATCH_SIZE)):
+                buffer = io.StringIO()
+                csv.writer(buffer).writerows(batch)
+                with cursor.copy(sql) as copy:
+                    copy.write(buffer.getvalue())
+                copied += len(batch)
+
+        self.counts[model._meta.db_table] = (
+            self.counts.get(model._meta.db_table, 0) + copied
+        )
+        return copied
+
+    def _copy_returning_ids(self, model, fields: list[str], rows: Iterable[list]):
+        """Copy rows and return their IDs in the order of the rows"""
+        last_id = (
+            model.objects.order_by("-id").values_list("id", flat=True).first() or 0
+        )
+        self._copy(model, fields, rows)
+
+        # IDs come from the sequence in the order the rows are copied.
+        return list(
+            model.objects.filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+
+    def _analyze(self):
+        with connection.cursor() as cursor:
+            for table in self.counts:
+                cursor.execute(f"ANALYZE {connection.ops.quote_name(table)}")
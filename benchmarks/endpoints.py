@@ -0,0 +1,168 @@
+import time
+from dataclasses import asdict, dataclass
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import Exists, OuterRef
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.services.user_claims import UserClaimsService
+from benchmarks.dataset import DATASET_EMAIL_PREFIX
+from benchmarks.utils import summarize_latencies
+from chats.models import ChatMember
+from habits.models import UserHabit
+
+User = get_user_model()
+
+
+@dataclass
+class EndpointsBenchmarkOptions:
+    users: int = 20
+    requests: int = 100
+    warmup: int = 10
+
+
+@dataclass
+class BenchmarkUser:
+    id: int
+    token: str
+    habit_id: int
+    chat_id: int
+    search_query: str
+
+
+def get_endpoints_requests(user: BenchmarkUser) -> dict[str, tuple[str, dict]]:
+    """Map every benchmarked endpoint to its URL and query parameters for the user"""
+    return {
+        "habit_streaks": (
+            reverse("habit-progress-streak", kwargs={"habit_id": user.habit_id}),
+            {},
+        ),
+        "user_search": (reverse("users"), {"query": user.search_query}),
+        "suggested_friends": (reverse("suggested-friends-list"), {}),
+        "chat_list": (reverse("chat-list-create"), {}),
+        "chat_messages": (
+            reverse("chat-messages-list", kwargs={"id": user.chat_id}),
+            {},
+        ),
+        "notifications": (reverse("notification-list"), {}),
+    }
+
+
+def sample_benchmark_users(count: int) -> list[BenchmarkUser]:
+    """Sample dataset members having habits and chats, with their access tokens"""
+    users = (
+        User.objects.filter(
+            email__startswith=DATASET_EMAIL_PREFIX, role=User.Role.MEMBER
+        )
+        .filter(
+            Exists(UserHabit.objects.filter(user=OuterRef("pk"))),
+            Exists(ChatMember.objects.filter(user=OuterRef("pk"))),
+        )
+        .order_by("?")[:count]
+    )
+
+    return [
+        BenchmarkUser(
+            id=user.id,
+            token=str(UserClaimsService.add_claims(AccessToken.for_user(user), user)),
+            habit_id=UserHabit.objects.filter(user=user).values_list(
+                "habit_id", flat=True
+            )[0],
+            chat_id=ChatMember.objects.filter(user=user).values_list(
+                "chat_id", flat=True
+            )[0],
+            search_query=user.full_name.split()[-1][:3],
+        )
+        for user in users
+    ]
+
+
+class EndpointsBenchmark:
+    """
+    Time the hot API endpoints against the generated dataset.
+
+    Requests go through the whole middleware stack with real access tokens,
+    rotating over users sampled from the dataset. Each endpoint reports its
+    latencies and the number of queries per request.
+    """
+
+    def __init__(self, options: EndpointsBenchmarkOptions):
+        self.options = options
+        self.client = Client()
+
+    def run(self) -> dict:
+        users = sample_benchmark_users(self.options.users)
+        if not users:
+            raise RuntimeError(
+                "No dataset users found, run generate_benchmark_dataset first"
+            )
+
+        endpoints = {}
+        for name in get_endpoints_requests(users[0]):
+            endpoints[name] = self._benchmark_endpoint(name, users)
+
+        return {
+            "options": asdict(self.options),
+            "users": len(users),
+            "endpoints": endpoints,
+        }
+
+    def _benchmark_endpoint(self, name: str, users: list[BenchmarkUser]) -> dict:
+        latencies = []
+        queries = []
+        errors = 0
+
+        for index in range(self.options.warmup + self.options.requests):
+            user = users[index % len(users)]
+            url, params = get_endpoints_requests(user)[name]
+
+            with CaptureQueriesContext(connection) as context:
+                started_at = time.perf_counter()
+                response = self.client.get(
+                    url, params, HTTP_AUTHORIZATION=f"Bearer {user.token}"
+                )
+                elapsed = time.perf_counter() - started_at
+
+            if index < self.options.warmup:
+                continue
+
+            latencies.append(elapsed)
+            queries.append(len(context.captured_queries))
+            if response.status_code != 200:
+                errors += 1
+
+        return {
+            "errors": errors,
+            "latency": summarize_latencies(latencies),
+            "queries": {"min": min(queries), "max": max(queries)},
+        }
+
+
+def compare_reports(baseline: dict, current: dict) -> dict:
+    """Relative change of the p50 and p99 latencies of every endpoint"""
+    comparison = {}
+
+    for name, endpoint in current["endpoints"].items():
+        baseline_endpoint = baseline.get("endpoints", {}).get(name)
+        if not baseline_endpoint:
+            continue
+
+        comparison[name] = {
+            key: _relative_change(
+                baseline_endpoint["latency"][key], endpoint["latency"][key]
+            )
+            for key in ("p50_ms", "p99_ms")
+        }
+
+    return comparison
+
+
+def _relative_change(baseline: float | None, current: float | None) -> float | None:
+    if not baseline or current is None:
+        return None
+
+    return round((current - baseline) / baseline, 4)
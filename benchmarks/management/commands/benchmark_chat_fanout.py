@@ -0,0 +1,79 @@
+import json
+from dataclasses import fields
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from benchmarks.chat_fanout import ChatFanoutBenchmark, ChatFanoutOptions
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure chat message fanout latency, throughput and memory per socket "
+        "against a throwaway test database, and print the report as JSON."
+    )
+
+    def add_arguments(self, parser):
+        defaults = ChatFanoutOptions()
+
+        parser.add_argument("--chats", type=int, default=defaults.chats)
+        parser.add_argument(
+            "--members-per-chat", type=int, default=defaults.members_per_chat
+        )
+        parser.add_argument(
+            "--messages-per-chat", type=int, default=defaults.messages_per_chat
+        )
+        parser.add_argument(
+            "--typing-per-message",
+            type=int,
+            default=defaults.typing_per_message,
+            help="Typing events sent by the sender before every message.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=defaults.concurrency,
+            help="Maximum number of sockets connecting or messages sent at once.",
+        )
+        parser.add_argument(
+            "--no-chat-list",
+            dest="chat_list",
+            action="store_false",
+            help="Don't open chat list sockets for the members.",
+        )
+        parser.add_argument(
+            "--channel-layer",
+            choices=["auto", "memory", "redis"],
+            default=defaults.channel_layer,
+            help="Channel layer to use; 'auto' picks Redis when it is reachable.",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=defaults.timeout,
+            help="Seconds to wait for all deliveries.",
+        )
+        parser.add_argument("--output", help="Write the JSON report to this file.")
+
+    def handle(self, *args, **options):
+        benchmark_options = ChatFanoutOptions(
+            **{field.name: options[field.name] for field in fields(ChatFanoutOptions)}
+        )
+
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            report = ChatFanoutBenchmark(benchmark_options).run()
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                file.write(output)
+            self.stdout.write(
+                self.style.SUCCESS(f"Report saved to {options['output']}")
+            )
+        else:
+            self.stdout.write(output)
@@ -0,0 +1,63 @@
+import json
+from dataclasses import fields
+
+from django.core.management.base import BaseCommand
+
+from benchmarks.endpoints import (
+    EndpointsBenchmark,
+    EndpointsBenchmarkOptions,
+    compare_reports,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the hot API endpoints against the dataset made by "
+        "generate_benchmark_dataset, and print the report as JSON."
+    )
+
+    def add_arguments(self, parser):
+        defaults = EndpointsBenchmarkOptions()
+
+        parser.add_argument(
+            "--users",
+            type=int,
+            default=defaults.users,
+            help="Number of dataset users to rotate requests over.",
+        )
+        parser.add_argument("--requests", type=int, default=defaults.requests)
+        parser.add_argument(
+            "--warmup",
+            type=int,
+            default=defaults.warmup,
+            help="Requests per endpoint made before measuring.",
+        )
+        parser.add_argument(
+            "--compare",
+            help="Add latency changes relative to this previously saved report.",
+        )
+        parser.add_argument("--output", help="Write the JSON report to this file.")
+
+    def handle(self, *args, **options):
+        benchmark_options = EndpointsBenchmarkOptions(
+            **{
+                field.name: options[field.name]
+                for field in fields(EndpointsBenchmarkOptions)
+            }
+        )
+
+        report = EndpointsBenchmark(benchmark_options).run()
+
+        if options["compare"]:
+            with open(options["compare"]) as file:
+                report["comparison"] = compare_reports(json.load(file), report)
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                file.write(output)
+            self.stdout.write(
+                self.style.SUCCESS(f"Report saved to {options['output']}")
+            )
+        else:
+            self.stdout.write(output)
@@ -0,0 +1,73 @@
+import json
+from dataclasses import fields
+
+from django.core.management.base import BaseCommand
+
+from benchmarks.serving import ServingBenchmark, ServingBenchmarkOptions
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare HTTP throughput of a single daphne process with gunicorn ASGI "
+        "workers on the dataset made by generate_benchmark_dataset, and print "
+        "the report as JSON."
+    )
+
+    def add_arguments(self, parser):
+        defaults = ServingBenchmarkOptions()
+
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=defaults.workers,
+            help="Number of gunicorn workers of the multi-process mode.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=defaults.concurrency,
+            help="Number of clients sending requests at once.",
+        )
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=defaults.duration,
+            help="Seconds of measured load per mode.",
+        )
+        parser.add_argument(
+            "--warmup",
+            type=float,
+            default=defaults.warmup,
+            help="Seconds of load per mode before measuring.",
+        )
+        parser.add_argument(
+            "--users",
+            type=int,
+            default=defaults.users,
+            help="Number of dataset users to rotate requests over.",
+        )
+        parser.add_argument("--port", type=int, default=defaults.port)
+        parser.add_argument(
+            "--startup-timeout", type=float, default=defaults.startup_timeout
+        )
+        parser.add_argument("--output", help="Write the JSON report to this file.")
+
+    def handle(self, *args, **options):
+        benchmark_options = ServingBenchmarkOptions(
+            **{
+                field.name: options[field.name]
+                for field in fields(ServingBenchmarkOptions)
+            }
+        )
+
+        report = ServingBenchmark(benchmark_options).run()
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                file.write(output)
+            self.stdout.write(
+                self.style.SUCCESS(f"Report saved to {options['output']}")
+            )
+        else:
+            self.stdout.write(output)
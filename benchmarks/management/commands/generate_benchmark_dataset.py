@@ -0,0 +1,32 @@
+import json
+from dataclasses import fields
+
+from django.core.management.base import BaseCommand
+
+from benchmarks.dataset import DatasetGenerator, DatasetOptions
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a large synthetic dataset in the configured database with "
+        "Postgres COPY, to run benchmark_endpoints against it."
+    )
+
+    def add_arguments(self, parser):
+        defaults = DatasetOptions()
+
+        for field in fields(DatasetOptions):
+            parser.add_argument(
+                f"--{field.name.replace('_', '-')}",
+                type=field.type,
+                default=getattr(defaults, field.name),
+            )
+
+    def handle(self, *args, **options):
+        dataset_options = DatasetOptions(
+            **{field.name: options[field.name] for field in fields(DatasetOptions)}
+        )
+
+        report = DatasetGenerator(dataset_options).generate()
+
+        self.stdout.write(json.dumps(report, indent=2))
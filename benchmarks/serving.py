@@ -0,0 +1,181 @@
+import http.client
+import os
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from urllib.parse import urlencode
+
+from django.conf import settings
+
+from benchmarks.endpoints import get_endpoints_requests, sample_benchmark_users
+from benchmarks.utils import summarize_latencies
+
+SERVING_MODES = ("single", "multi")
+
+
+@dataclass
+class ServingBenchmarkOptions:
+    workers: int = 4
+    concurrency: int = 64
+    duration: float = 10
+    warmup: float = 2
+    users: int = 20
+    port: int = 8100
+    startup_timeout: float = 30
+
+
+def get_server_command(mode: str, options: ServingBenchmarkOptions) -> list[str]:
+    """Command starting the server of the mode on the benchmark port"""
+    if mode == "single":
+        return [
+            "daphne",
+            "-b",
+            "127.0.0.1",
+            "-p",
+            str(options.port),
+            "nevroth.asgi:application",
+        ]
+
+    return [
+        "gunicorn",
+        "-c",
+        os.path.join(settings.BASE_DIR, "gunicorn.conf.py"),
+        "--bind",
+        f"127.0.0.1:{options.port}",
+        "--workers",
+        str(options.workers),
+    ]
+
+
+class ServingBenchmark:
+    """
+    Compare HTTP throughput of the single-process and multi-process modes.
+
+    Each mode serves the app from a subprocess: a single daphne process, then
+    gunicorn with `workers` ASGI workers. `concurrency` client threads send
+    the hot endpoints' requests over keep-alive connections for `duration`
+    seconds, rotating over users of the generated dataset. Run it on a host
+    with spare cores, as the client threads compete with the server for CPU.
+    """
+
+    def __init__(self, options: ServingBenchmarkOptions):
+        self.options = options
+
+    def run(self) -> dict:
+        users = sample_benchmark_users(self.options.users)
+        if not users:
+            raise RuntimeError(
+                "No dataset users found, run generate_benchmark_dataset first"
+            )
+
+        requests = [
+            (
+                f"{url}?{urlencode(params)}" if params else url,
+                {"Authorization": f"Bearer {user.token}"},
+            )
+            for user in users
+            for url, params in get_endpoints_requests(user).values()
+        ]
+
+        modes = {}
+        for mode in SERVING_MODES:
+            with self._serve(mode):
+                self._load(requests, self.options.warmup)
+                modes[mode] = self._load(requests, self.options.duration)
+
+        return {
+            "options": asdict(self.options),
+            "modes": modes,
+            "speedup": round(
+                modes["multi"]["requests_per_second"]
+                / max(modes["single"]["requests_per_second"], 1e-9),
+                2,
+            ),
+        }
+
+    @contextmanager
+    def _serve(self, mode: str):
+        process = subprocess.Popen(
+            get_server_command(mode, self.options),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            self._wait_until_ready(process)
+            yield
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=settings.ASGI_GRACEFUL_TIMEOUT_SECONDS)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+    def _wait_until_ready(self, process):
+        deadline = time.monotonic() + self.options.startup_timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"Server exited with code {process.returncode}")
+
+            connection = http.client.HTTPConnection(
+                "127.0.0.1", self.options.port, timeout=1
+            )
+            try:
+                connection.request("GET", "/metrics/")
+                connection.getresponse().read()
+                return
+            except OSError:
+                time.sleep(0.2)
+            finally:
+                connection.close()
+
+        raise RuntimeError("Server didn't start in time")
+
+    def _load(self, requests: list[tuple[str, dict]], duration: float) -> dict:
+        latencies = []
+        errors = []
+        deadline = time.perf_counter() + duration
+
+        def client(offset: int):
+            connection = http.client.HTTPConnection(
+                "127.0.0.1", self.options.port, timeout=30
+            )
+            index = offset
+            while time.perf_counter() < deadline:
+                path, headers = requests[index % len(requests)]
+                index += self.options.concurrency
+
+                started_at = time.perf_counter()
+                try:
+                    connection.request("GET", path, headers=headers)
+                    response = connection.getresponse()
+                    response.read()
+                except (OSError, http.client.HTTPException):
+                    errors.append(path)
+                    connection.close()
+                    continue
+
+                latencies.append(time.perf_counter() - started_at)
+                if response.status != 200:
+                    errors.append(path)
+
+            connection.close()
+
+        started_at = time.perf_counter()
+        threads = [
+            threading.Thread(target=client, args=(offset,))
+            for offset in range(self.options.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started_at
+
+        return {
+            "requests_per_second": round(len(latencies) / elapsed, 2),
+            "errors": len(errors),
+            "latency": summarize_latencies(latencies),
+        }
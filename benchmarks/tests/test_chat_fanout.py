@@ -0,0 +1,41 @@
+from django.test import SimpleTestCase, TransactionTestCase
+
+from benchmarks.chat_fanout import ChatFanoutBenchmark, ChatFanoutOptions
+from benchmarks.utils import percentile
+
+
+class PercentileTests(SimpleTestCase):
+    def test_percentile_nearest_rank(self):
+        """Test that percentiles use the nearest-rank method."""
+        values = [5, 1, 4, 2, 3]
+
+        self.assertEqual(percentile(values, 50), 3)
+        self.assertEqual(percentile(values, 99), 5)
+        self.assertEqual(percentile(values, 0), 1)
+        self.assertIsNone(percentile([], 50))
+
+
+class ChatFanoutBenchmarkTests(TransactionTestCase):
+    def test_every_message_is_delivered(self):
+        """Test that a small benchmark run delivers and reports every message."""
+        options = ChatFanoutOptions(
+            chats=2,
+            members_per_chat=3,
+            messages_per_chat=2,
+            typing_per_message=1,
+            concurrency=4,
+            channel_layer="memory",
+            timeout=10,
+        )
+
+        report = ChatFanoutBenchmark(options).run()
+
+        # 4 messages, each delivered to 3 chat sockets and 2 chat lists.
+        self.assertEqual(report["connections"], 12)
+        self.assertEqual(report["messages"]["sent"], 4)
+        self.assertEqual(report["messages"]["failed"], 0)
+        self.assertEqual(report["deliveries"]["expected"], 20)
+        self.assertEqual(report["deliveries"]["received"], 20)
+        self.assertIsNotNone(report["deliveries"]["latency"]["p99_ms"])
+        self.assertGreater(report["memory"]["per_connection_bytes"], 0)
+        self.assertEqual(report["closed_sockets"], 0)
@@ -0,0 +1,98 @@
+from django.test import SimpleTestCase, TestCase
+
+from benchmarks.dataset import DatasetGenerator, DatasetOptions
+from benchmarks.endpoints import (
+    EndpointsBenchmark,
+    EndpointsBenchmarkOptions,
+    compare_reports,
+)
+from chats.models import ChatMember, ChatMessage
+from habits.models import HabitProgress, UserHabit
+from habits.constants import REQUIRED_HABITS_COUNT
+from notifications.models import BroadcastNotification, Notification
+
+
+class DatasetGeneratorTests(TestCase):
+    def test_dataset_is_generated(self):
+        """Test that the generator copies every table of a small dataset."""
+        options = DatasetOptions(
+            users=10,
+            habits=5,
+            progress_days=3,
+            progress_skip_rate=0,
+            friends_per_user=2,
+            private_chats=4,
+            group_chats=1,
+            members_per_group_chat=3,
+            messages_per_chat=2,
+            notifications_per_user=2,
+            broadcasts=2,
+        )
+
+        report = DatasetGenerator(options).generate()
+
+        self.assertEqual(UserHabit.objects.count(), 10 * REQUIRED_HABITS_COUNT)
+        self.assertEqual(HabitProgress.objects.count(), 10 * REQUIRED_HABITS_COUNT * 3)
+        self.assertEqual(ChatMember.objects.count(), 4 * 2 + 3)
+        self.assertEqual(ChatMessage.objects.count(), 5 * 2)
+        self.assertEqual(Notification.objects.count(), 10 * 2)
+        self.assertEqual(BroadcastNotification.objects.count(), 2)
+        self.assertEqual(report["rows"]["chats_chatmessage"], 10)
+
+
+class EndpointsBenchmarkTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        DatasetGenerator(
+            DatasetOptions(
+                users=10,
+                habits=5,
+                progress_days=3,
+                private_chats=10,
+                group_chats=0,
+                messages_per_chat=2,
+                notifications_per_user=2,
+                broadcasts=2,
+            )
+        ).generate()
+
+    def test_every_endpoint_is_benchmarked(self):
+        """Test that a small benchmark run times every endpoint without errors."""
+        options = EndpointsBenchmarkOptions(users=3, requests=4, warmup=1)
+
+        report = EndpointsBenchmark(options).run()
+
+        self.assertEqual(
+            set(report["endpoints"]),
+            {
+                "habit_streaks",
+                "user_search",
+                "suggested_friends",
+                "chat_list",
+                "chat_messages",
+                "notifications",
+            },
+        )
+        for endpoint in report["endpoints"].values():
+            self.assertEqual(endpoint["errors"], 0)
+            self.assertEqual(endpoint["latency"]["count"], 4)
+            self.assertGreater(endpoint["queries"]["min"], 0)
+
+
+class CompareReportsTests(SimpleTestCase):
+    def test_compare_reports(self):
+        """Test that comparing reports gives relative latency changes."""
+        baseline = {
+            "endpoints": {"chat_list": {"latency": {"p50_ms": 10, "p99_ms": 20}}}
+        }
+        current = {
+            "endpoints": {
+                "chat_list": {"latency": {"p50_ms": 15, "p99_ms": 10}},
+                "notifications": {"latency": {"p50_ms": 5, "p99_ms": 8}},
+            }
+        }
+
+        self.assertEqual(
+            compare_reports(baseline, current),
+            {"chat_list": {"p50_ms": 0.5, "p99_ms": -0.5}},
+        )
@@ -0,0 +1,45 @@
+import os
+from unittest import mock
+
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+
+from benchmarks.serving import ServingBenchmarkOptions, get_server_command
+
+
+class ServingBenchmarkTests(SimpleTestCase):
+    def test_server_commands_bind_benchmark_port(self):
+        """Test that both serving modes are started on the benchmark port."""
+        options = ServingBenchmarkOptions(workers=3, port=9100)
+
+        single = get_server_command("single", options)
+        multi = get_server_command("multi", options)
+
+        self.assertEqual(single[0], "daphne")
+        self.assertIn("9100", single)
+        self.assertEqual(multi[0], "gunicorn")
+        self.assertIn("127.0.0.1:9100", multi)
+        self.assertEqual(multi[multi.index("--workers") + 1], "3")
+
+
+class GunicornConfigTests(SimpleTestCase):
+    def load_config(self):
+        config = {}
+        # The config sets environment variables of the server's processes.
+        with (
+            mock.patch.dict(os.environ),
+            open(os.path.join(settings.BASE_DIR, "gunicorn.conf.py")) as file,
+        ):
+            exec(file.read(), config)
+
+        return config
+
+    @override_settings(ASGI_WORKERS=6, ASGI_THREADS=8, ASGI_SERVE="websocket")
+    def test_config_is_read_from_settings(self):
+        """Test that gunicorn workers, threads and the app come from settings."""
+        config = self.load_config()
+
+        self.assertEqual(config["workers"], 6)
+        self.assertEqual(config["threads"], 8)
+        self.assertEqual(config["wsgi_app"], "nevroth.asgi:websocket_application")
+        self.assertEqual(config["worker_class"], "nevroth.workers.ASGIWorker")
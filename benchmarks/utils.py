@@ -0,0 +1,25 @@
+import math
+
+
+def percentile(values: list[float], percent: float) -> float | None:
+    """Nearest-rank percentile of the values"""
+    if not values:
+        return None
+
+    ordered = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def summarize_latencies(latencies: list[float]) -> dict:
+    """Summarize latencies given in seconds as milliseconds"""
+    return {
+        "count": len(latencies),
+        "p50_ms": _to_ms(percentile(latencies, 50)),
+        "p99_ms": _to_ms(percentile(latencies, 99)),
+        "max_ms": _to_ms(max(latencies, default=None)),
+    }
+
+
+def _to_ms(value: float | None) -> float | None:
+    return None if value is None else round(value * 1000, 3)
@@ -0,0 +1,3 @@
+# Text search configuration for chat messages; "simple" doesn't stem words,
+# so it works the same way for every language used in chats.
+CHAT_MESSAGE_SEARCH_CONFIG = "simple"
@@ -1,5 +1,4 @@
 from channels.db import database_sync_to_async
-from channels.generic.websocket import AsyncJsonWebsocketConsumer
 
 from accounts.serializers import UserWebSocketSerializer
 from chats.enums import (
@@ -9,9 +8,11 @@ from chats.enums import (
 )
 from chats.services.chat import ChatService
 from chats.consumers.groups import get_chat_group_name, get_user_chat_list_group_name
+from chats.consumers.outbound import OutboundQueueConsumer
+from chats.consumers.presence import PresenceConsumerMixin
 
 
-class ChatListConsumer(AsyncJsonWebsocketConsumer):
+class ChatListConsumer(PresenceConsumerMixin, OutboundQueueConsumer):
     async def connect(self):
         self.user = self.scope["user"]
 
@@ -23,20 +24,47 @@ class ChatListConsumer(AsyncJsonWebsocketConsumer):
         await self.channel_layer.group_add(self.group_name, self.channel_name)
 
         await self.accept()
+        await self.presence_connect()
 
     async def disconnect(self, close_code):
+        await self.presence_disconnect()
         await self.channel_layer.group_discard(self.group_name, self.channel_name)
 
+    async def receive_json(self, content):
+        event_type = content.get("type")
+
+        match event_type:
+            case ChatWebSocketClientEventType.HEARTBEAT:
+                await self.presence_heartbeat()
+
     async def new_message(self, event):
-        await self.send_json(
+        with self.trace_event(event):
+            await self.enqueue_json(
+                {
+                    "type": ChatWebSocketServerEventType.NEW_MESSAGE,
+                    "message": event["message"],
+                }
+            )
+
+    async def presence_changed(self, event):
+        await self.enqueue_json(
             {
-                "type": ChatWebSocketServerEventType.NEW_MESSAGE,
-                "message": event["message"],
+                "type": ChatWebSocketServerEventType.PRESENCE_CHANGED,
+                "users": event["users"],
             }
         )
 
+    async def new_notification(self, event):
+        with self.trace_event(event):
+            await self.enqueue_json(
+                {
+                    "type": ChatWebSocketServerEventType.NEW_NOTIFICATION,
+                    "notification": event["notification"],
+                }
+            )
+
 
-class ChatConsumer(AsyncJsonWebsocketConsumer):
+class ChatConsumer(PresenceConsumerMixin, OutboundQueueConsumer):
     async def connect(self):
         self.user = self.scope["user"]
 
@@ -55,8 +83,10 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
         await self.channel_layer.group_add(self.chat_group_name, self.channel_name)
 
         await self.accept()
+        await self.presence_connect()
 
     async def disconnect(self, close_code):
+        await self.presence_disconnect()
         await self.channel_layer.group_discard(self.chat_group_name, self.channel_name)
 
     async def receive_json(self, content):
@@ -79,33 +109,43 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
                         "user": UserWebSocketSerializer(self.user).data,
                     },
                 )
+            case ChatWebSocketClientEventType.HEARTBEAT:
+                await self.presence_heartbeat()
 
     @database_sync_to_async
     def _is_user_in_chat(self, user, chat_id):
         return ChatService.is_user_in_chat(user, chat_id)
 
+    @staticmethod
+    def _get_typing_coalesce_key(user_id):
+        # Only the latest typing state of a user is worth delivering.
+        return f"typing:{user_id}"
+
     async def new_message(self, event):
-        await self.send_json(
-            {
-                "type": ChatWebSocketServerEventType.NEW_MESSAGE,
-                "message": event["message"],
-            }
-        )
+        with self.trace_event(event):
+            await self.enqueue_json(
+                {
+                    "type": ChatWebSocketServerEventType.NEW_MESSAGE,
+                    "message": event["message"],
+                }
+            )
 
     async def user_typing(self, event):
         if event["user"]["id"] != self.user.id:
-            await self.send_json(
+            await self.enqueue_json(
                 {
                     "type": ChatWebSocketClientEventType.TYPING,
                     "user": event["user"],
-                }
+                },
+                coalesce_key=self._get_typing_coalesce_key(event["user"]["id"]),
             )
 
     async def user_stop_typing(self, event):
         if event["user"]["id"] != self.user.id:
-            await self.send_json(
+            await self.enqueue_json(
                 {
                     "type": ChatWebSocketClientEventType.STOP_TYPING,
                     "user": event["user"],
-                }
+                },
+                coalesce_key=self._get_typing_coalesce_key(event["user"]["id"]),
             )
@@ -0,0 +1,138 @@
+import asyncio
+import logging
+from collections import deque
+
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from django.conf import settings
+
+from chats.enums import ChatWebSocketCloseCode
+from chats.metrics import (
+    CHAT_WS_CONNECTIONS,
+    CHAT_WS_OUTBOUND_COALESCED,
+    CHAT_WS_OUTBOUND_QUEUE_DEPTH,
+    CHAT_WS_SLOW_CONSUMER_DISCONNECTS,
+)
+from nevroth.tracing import create_span, extract, start_span
+
+logger = logging.getLogger(__name__)
+
+
+class OutboundQueueConsumer(AsyncJsonWebsocketConsumer):
+    """
+    JSON websocket consumer that sends events through a bounded queue.
+
+    Channel-layer handlers only enqueue events, and a writer task delivers them
+    to the client, so a slow client never stalls the consumer's inbox. Events
+    with a coalesce key replace a pending event with the same key instead of
+    queueing up. A client whose queue stays over the limit for longer than the
+    grace period, or grows over twice the limit, is disconnected. So is a client
+    an event fails to be sent to.
+
+    Events traced by their sender get a span from being queued until they're
+    sent to the client.
+    """
+
+    _writer = None
+    _outbound_closed = False
+    _connection_counted = False
+
+    async def accept(self, subprotocol=None, headers=None):
+        await super().accept(subprotocol, headers)
+
+        CHAT_WS_CONNECTIONS.labels(type(self).__name__).inc()
+        self._connection_counted = True
+
+        self._outbound = deque()
+        self._pending = {}
+        self._outbound_ready = asyncio.Event()
+        self._over_limit_since = None
+        self._writer = asyncio.create_task(self._write_outbound())
+
+    async def enqueue_json(self, content, coalesce_key=None):
+        if self._writer is None or self._outbound_closed:
+            return
+
+        if coalesce_key is not None and coalesce_key in self._pending:
+            self._pending[coalesce_key][1] = content
+            CHAT_WS_OUTBOUND_COALESCED.inc()
+            return
+
+        entry = [coalesce_key, content, create_span("ws.send")]
+        if coalesce_key is not None:
+            self._pending[coalesce_key] = entry
+
+        self._outbound.append(entry)
+        self._outbound_ready.set()
+        CHAT_WS_OUTBOUND_QUEUE_DEPTH.inc()
+
+        await self._check_outbound_limit()
+
+    def trace_event(self, event):
+        """Continue the trace carried by a channel layer event, if any"""
+        return start_span(
+            f"ws.{event['type']}", parent=extract(event), consumer=type(self).__name__
+        )
+
+    async def websocket_disconnect(self, message):
+        self._stop_writer()
+        if self._connection_counted:
+            CHAT_WS_CONNECTIONS.labels(type(self).__name__).dec()
+            self._connection_counted = False
+
+        await super().websocket_disconnect(message)
+
+    async def _check_outbound_limit(self):
+        limit = settings.CHAT_WS_OUTBOUND_QUEUE_SIZE
+        depth = len(self._outbound)
+
+        if depth <= limit:
+            self._over_limit_since = None
+            return
+
+        now = asyncio.get_running_loop().time()
+        if self._over_limit_since is None:
+            self._over_limit_since = now
+
+        overdue = now - self._over_limit_since
+        if depth > 2 * limit or overdue > settings.CHAT_WS_SLOW_CONSUMER_GRACE_SECONDS:
+            CHAT_WS_SLOW_CONSUMER_DISCONNECTS.inc()
+            self._stop_writer()
+            await self.close(code=ChatWebSocketCloseCode.SLOW_CONSUMER)
+
+    async def _write_outbound(self):
+        while True:
+            await self._outbound_ready.wait()
+
+            while self._outbound:
+                coalesce_key, content, span = self._outbound.popleft()
+                self._pending.pop(coalesce_key, None)
+                CHAT_WS_OUTBOUND_QUEUE_DEPTH.dec()
+
+                try:
+                    await self.send_json(content)
+                except Exception:
+                    logger.exception(
+                        "Failed to send a websocket event, closing the connection"
+                    )
+                    self._close_outbound()
+                    await self.close(code=ChatWebSocketCloseCode.INTERNAL_ERROR)
+                    return
+                finally:
+                    if span is not None:
+                        span.end()
+
+            self._over_limit_since = None
+            self._outbound_ready.clear()
+
+    def _stop_writer(self):
+        if self._writer is None or self._outbound_closed:
+            return
+
+        self._writer.cancel()
+        self._close_outbound()
+
+    def _close_outbound(self):
+        self._outbound_closed = True
+        CHAT_WS_OUTBOUND_QUEUE_DEPTH.dec(len(self._outbound))
+        self._outbound.clear()
+        self._pending.clear()
@@ -0,0 +1,28 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from chats.services.presence import PresenceService
+
+
+class PresenceConsumerMixin:
+    """Track the consumer's socket in the user's presence"""
+
+    presence_tracked = False
+
+    async def presence_connect(self):
+        if not settings.PRESENCE_ENABLED:
+            return
+
+        self.presence_tracked = True
+        await self._touch_presence()
+
+    async def presence_heartbeat(self):
+        if self.presence_tracked:
+            await self._touch_presence()
+
+    async def presence_disconnect(self):
+        if self.presence_tracked:
+            await sync_to_async(PresenceService.leave)(self.user.id, self.channel_name)
+
+    async def _touch_presence(self):
+        await sync_to_async(PresenceService.touch)(self.user.id, self.channel_name)
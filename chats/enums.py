@@ -4,6 +4,8 @@ from enum import IntEnum, StrEnum
 class ChatWebSocketCloseCode(IntEnum):
     NOT_A_PARTICIPANT = 4001
     UNAUTHORIZED = 4002
+    SLOW_CONSUMER = 4003
+    INTERNAL_ERROR = 1011
 
 
 class ChatWebSocketClientEventType(StrEnum):
@@ -11,6 +13,7 @@ class ChatWebSocketClientEventType(StrEnum):
 
     TYPING = "typing"
     STOP_TYPING = "stop_typing"
+    HEARTBEAT = "heartbeat"
 
 
 class ChatWebSocketServerEventType(StrEnum):
@@ -19,3 +22,5 @@ class ChatWebSocketServerEventType(StrEnum):
     NEW_MESSAGE = "new_message"
     USER_TYPING = "user_typing"
     USER_STOP_TYPING = "user_stop_typing"
+    PRESENCE_CHANGED = "presence_changed"
+    NEW_NOTIFICATION = "new_notification"
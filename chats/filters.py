@@ -0,0 +1,38 @@
+import django_filters
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.utils.translation import gettext_lazy as _
+
+from chats.constants import CHAT_MESSAGE_SEARCH_CONFIG
+from chats.models import ChatMessage
+
+
+class ChatMessageSearchFilter(django_filters.FilterSet):
+    query = django_filters.CharFilter(
+        method="filter_query",
+        required=True,
+        help_text=_("Search messages content (web search syntax)"),
+        label=_("Search Query"),
+    )
+    chat = django_filters.NumberFilter(
+        field_name="chat_id",
+        help_text=_("Limit search to one chat"),
+        label=_("Chat"),
+    )
+
+    class Meta:
+        model = ChatMessage
+        fields = ["query", "chat"]
+
+    def filter_query(self, queryset, name, value):
+        # The vector expression must match the GIN index defined on ChatMessage.
+        search_vector = SearchVector("content", config=CHAT_MESSAGE_SEARCH_CONFIG)
+        search_query = SearchQuery(
+            value, config=CHAT_MESSAGE_SEARCH_CONFIG, search_type="websearch"
+        )
+
+        return (
+            queryset.annotate(search=search_vector)
+            .filter(search=search_query)
+            .annotate(rank=SearchRank(search_vector, search_query))
+            .order_by("-rank", "-created_at", "-id")
+        )
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from chats.services.chat_message_partition import ChatMessagePartitionService
+
+
+class Command(BaseCommand):
+    help = "Create weekly chat message partitions for the current and upcoming weeks."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--weeks-ahead",
+            type=int,
+            default=settings.CHAT_MESSAGE_PARTITIONS_AHEAD_WEEKS,
+            help="Number of weeks after the current one to create partitions for.",
+        )
+
+    def handle(self, *args, **options):
+        created = ChatMessagePartitionService.create_future_partitions(
+            options["weeks_ahead"]
+        )
+
+        for partition in created:
+            self.stdout.write(
+                f"Created partition {partition.name} "
+                f"[{partition.start:%Y-%m-%d}, {partition.end:%Y-%m-%d})"
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Created {len(created)} chat message partition(s).")
+        )
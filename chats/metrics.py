@@ -0,0 +1,79 @@
+import time
+from contextlib import contextmanager
+
+from asgiref.sync import SyncToAsync
+from prometheus_client import Counter, Gauge, Histogram
+
+CHAT_WS_OUTBOUND_QUEUE_DEPTH = Gauge(
+    "chat_ws_outbound_queue_depth",
+    "Events waiting in outbound queues of chat websocket connections",
+    multiprocess_mode="livesum",
+)
+CHAT_WS_OUTBOUND_COALESCED = Counter(
+    "chat_ws_outbound_coalesced_total",
+    "Outbound chat websocket events replaced by a newer event of the same kind",
+)
+CHAT_WS_SLOW_CONSUMER_DISCONNECTS = Counter(
+    "chat_ws_slow_consumer_disconnects_total",
+    "Chat websocket connections closed because their outbound queue overflowed",
+)
+CHAT_WS_CONNECTIONS = Gauge(
+    "chat_ws_connections",
+    "Open chat websocket connections by consumer",
+    ["consumer"],
+    multiprocess_mode="livesum",
+)
+CHAT_WS_AUTH_DURATION = Histogram(
+    "chat_ws_auth_duration_seconds",
+    "Time spent authenticating websocket connections by credentials",
+    ["method"],
+)
+CHAT_WS_CONNECT_DURATION = Histogram(
+    "chat_ws_connect_duration_seconds",
+    "Time from a websocket connection's arrival until it's accepted or rejected",
+    ["outcome"],
+)
+CHAT_DB_THREAD_QUEUE_DEPTH = Histogram(
+    "chat_db_thread_queue_depth",
+    "Calls waiting for the database thread, as seen by authenticating websockets",
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200),
+)
+CHAT_GROUP_SEND_DURATION = Histogram(
+    "chat_group_send_duration_seconds",
+    "Duration of channel layer group sends by group kind",
+    ["group"],
+)
+CHAT_GROUP_SEND_ERRORS = Counter(
+    "chat_group_send_errors_total",
+    "Failed channel layer group sends by group kind",
+    ["group"],
+)
+
+
+def get_db_thread_queue_depth() -> int | None:
+    """
+    Return the number of calls waiting for the shared database_sync_to_async thread.
+
+    Websocket consumers run outside of a ThreadSensitiveContext, so their calls
+    share asgiref's single-thread executor; HTTP requests have threads of their
+    own and aren't counted. The executor's queue is private, so None is
+    returned when asgiref doesn't expose it.
+    """
+    executor = getattr(SyncToAsync, "single_thread_executor", None)
+    work_queue = getattr(executor, "_work_queue", None)
+    if work_queue is None:
+        return None
+
+    return work_queue.qsize()
+
+
+@contextmanager
+def observe_group_send(group: str):
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        CHAT_GROUP_SEND_ERRORS.labels(group).inc()
+        raise
+    finally:
+        CHAT_GROUP_SEND_DURATION.labels(group).observe(time.perf_counter() - start)
@@ -0,0 +1,104 @@
+# Converts chats_chatmessage into a table range-partitioned by week on created_at.
+# The Django model is unchanged, so only database operations are applied here.
+
+from django.db import migrations
+
+PARTITIONS_AHEAD_WEEKS = 4
+
+FORWARD_SQL = [
+    "ALTER TABLE chats_chatmessage RENAME TO chats_chatmessage_unpartitioned",
+    "ALTER TABLE chats_chatmessage_unpartitioned "
+    "RENAME CONSTRAINT chats_chatmessage_pkey TO chats_chatmessage_unpartitioned_pkey",
+    """
+    CREATE TABLE chats_chatmessage (
+        id bigint NOT NULL,
+        content varchar(256) NOT NULL,
+        created_at timestamp with time zone NOT NULL,
+        updated_at timestamp with time zone NOT NULL,
+        chat_id bigint NOT NULL,
+        sender_id bigint NOT NULL,
+        CONSTRAINT chats_chatmessage_pkey PRIMARY KEY (id, created_at),
+        CONSTRAINT chats_chatmessage_chat_id_fk FOREIGN KEY (chat_id)
+            REFERENCES chats_chat (id) DEFERRABLE INITIALLY DEFERRED,
+        CONSTRAINT chats_chatmessage_sender_id_fk FOREIGN KEY (sender_id)
+            REFERENCES accounts_user (id) DEFERRABLE INITIALLY DEFERRED
+    ) PARTITION BY RANGE (created_at)
+    """,
+    "CREATE TABLE chats_chatmessage_default PARTITION OF chats_chatmessage DEFAULT",
+    f"""
+    DO $$
+    DECLARE
+        week_start timestamptz := date_trunc(
+            'week',
+            COALESCE((SELECT MIN(created_at) FROM chats_chatmessage_unpartitioned), now()),
+            'UTC'
+        );
+        last_week_start timestamptz := date_trunc('week', now(), 'UTC')
+            + interval '{PARTITIONS_AHEAD_WEEKS} weeks';
+    BEGIN
+        WHILE week_start <= last_week_start LOOP
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF chats_chatmessage FOR VALUES FROM (%L) TO (%L)',
+                'chats_chatmessage_p' || to_char(week_start AT TIME ZONE 'UTC', 'YYYYMMDD'),
+                week_start,
+                week_start + interval '1 week'
+            );
+            week_start := week_start + interval '1 week';
+        END LOOP;
+    END $$
+    """,
+    """
+    INSERT INTO chats_chatmessage (id, content, created_at, updated_at, chat_id, sender_id)
+    SELECT id, content, created_at, updated_at, chat_id, sender_id
+    FROM chats_chatmessage_unpartitioned
+    """,
+    "DROP TABLE chats_chatmessage_unpartitioned",
+    "CREATE SEQUENCE chats_chatmessage_id_seq OWNED BY chats_chatmessage.id",
+    "ALTER TABLE chats_chatmessage "
+    "ALTER COLUMN id SET DEFAULT nextval('chats_chatmessage_id_seq')",
+    "SELECT setval('chats_chatmessage_id_seq', COALESCE(MAX(id), 1), MAX(id) IS NOT NULL) "
+    "FROM chats_chatmessage",
+    "CREATE INDEX chats_chatmessage_chat_created_idx "
+    "ON chats_chatmessage (chat_id, created_at)",
+    "CREATE INDEX chats_chatmessage_sender_id_idx ON chats_chatmessage (sender_id)",
+]
+
+REVERSE_SQL = [
+    "ALTER TABLE chats_chatmessage RENAME TO chats_chatmessage_partitioned",
+    "ALTER TABLE chats_chatmessage_partitioned "
+    "RENAME CONSTRAINT chats_chatmessage_pkey TO chats_chatmessage_partitioned_pkey",
+    "ALTER TABLE chats_chatmessage_partitioned ALTER COLUMN id DROP DEFAULT",
+    "DROP SEQUENCE chats_chatmessage_id_seq",
+    """
+    CREATE TABLE chats_chatmessage (
+        id bigint GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+        content varchar(256) NOT NULL,
+        created_at timestamp with time zone NOT NULL,
+        updated_at timestamp with time zone NOT NULL,
+        chat_id bigint NOT NULL REFERENCES chats_chat (id) DEFERRABLE INITIALLY DEFERRED,
+        sender_id bigint NOT NULL
+            REFERENCES accounts_user (id) DEFERRABLE INITIALLY DEFERRED
+    )
+    """,
+    """
+    INSERT INTO chats_chatmessage (id, content, created_at, updated_at, chat_id, sender_id)
+    SELECT id, content, created_at, updated_at, chat_id, sender_id
+    FROM chats_chatmessage_partitioned
+    """,
+    "DROP TABLE chats_chatmessage_partitioned",
+    "SELECT setval(pg_get_serial_sequence('chats_chatmessage', 'id'), "
+    "COALESCE(MAX(id), 1), MAX(id) IS NOT NULL) FROM chats_chatmessage",
+    "CREATE INDEX chats_chatmessage_chat_id_idx ON chats_chatmessage (chat_id)",
+    "CREATE INDEX chats_chatmessage_sender_id_idx ON chats_chatmessage (sender_id)",
+]
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("chats", "0002_chatmessage"),
+        ("accounts", "0005_alter_user_habits_and_more"),
+    ]
+
+    operations = [
+        migrations.RunSQL(sql=FORWARD_SQL, reverse_sql=REVERSE_SQL),
+    ]
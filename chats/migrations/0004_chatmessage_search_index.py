@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-19 12:12
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("chats", "0003_partition_chatmessage"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="chatmessage",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.search.SearchVector("content", config="simple"),
+                name="chats_message_search_idx",
+            ),
+        ),
+    ]
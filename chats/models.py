@@ -1,7 +1,11 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from django.conf import settings
 
+from chats.constants import CHAT_MESSAGE_SEARCH_CONFIG
+
 
 class Chat(models.Model):
     class ChatType(models.TextChoices):
@@ -49,5 +53,13 @@ class ChatMessage(models.Model):
     created_at = models.DateTimeField(_("created at"), auto_now_add=True)
     updated_at = models.DateTimeField(_("updated at"), auto_now=True)
 
+    class Meta:
+        indexes = [
+            GinIndex(
+                SearchVector("content", config=CHAT_MESSAGE_SEARCH_CONFIG),
+                name="chats_message_search_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"[Chat {self.chat_id}] {self.content[:30]}... by {self.sender.full_name} ({self.created_at:%Y-%m-%d %H:%M})"
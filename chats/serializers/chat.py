@@ -42,6 +42,15 @@ class ChatMessageSerializer(serializers.ModelSerializer):
         fields = ["id", "content", "sender"]
 
 
+class ChatMessageSearchResultSerializer(serializers.ModelSerializer):
+    sender = ChatMessageSenderSerializer()
+    rank = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = ChatMessage
+        fields = ["id", "chat", "content", "sender", "created_at", "rank"]
+
+
 class ChatMessageCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = ChatMessage
@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+
+
+class PresenceSerializer(serializers.Serializer):
+    user = serializers.IntegerField()
+    online = serializers.BooleanField()
+    last_seen = serializers.DateTimeField(allow_null=True)
+
+
+class PresenceQuerySerializer(serializers.Serializer):
+    users = serializers.CharField(help_text=_("Comma-separated users IDs"))
+
+    def validate_users(self, value):
+        try:
+            users_ids = list(
+                dict.fromkeys(int(user_id) for user_id in value.split(","))
+            )
+        except ValueError:
+            raise serializers.ValidationError(_("Users must be comma-separated IDs"))
+
+        if len(users_ids) > settings.PRESENCE_LOOKUP_MAX_USERS:
+            raise serializers.ValidationError(
+                _("At most %(count)d users can be requested at once")
+                % {"count": settings.PRESENCE_LOOKUP_MAX_USERS}
+            )
+
+        return users_ids
@@ -1,3 +1,5 @@
+from collections import defaultdict
+
 from django.db import transaction
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
@@ -47,8 +49,30 @@ class ChatService:
 
     @classmethod
     def is_user_in_chat(cls, user: User, chat_id: int) -> bool:
-        return ChatMember.objects.filter(chat_id=chat_id, user=user).exists()
+        return ChatMember.objects.filter(chat_id=chat_id, user_id=user.id).exists()
 
     @classmethod
     def get_chat_members_ids(cls, chat: Chat) -> list[int]:
         return ChatMember.objects.filter(chat=chat).values_list("user", flat=True)
+
+    @classmethod
+    def get_chat_partners_ids(cls, users_ids: list[int]) -> dict[int, set[int]]:
+        """Map every member sharing a chat with the given users to those users"""
+        memberships = ChatMember.objects.filter(
+            chat_id__in=ChatMember.objects.filter(user_id__in=users_ids).values(
+                "chat_id"
+            )
+        ).values_list("chat_id", "user_id")
+
+        chats_members = defaultdict(set)
+        for chat_id, user_id in memberships:
+            chats_members[chat_id].add(user_id)
+
+        partners = defaultdict(set)
+        users_ids = set(users_ids)
+        for members in chats_members.values():
+            for user_id in members & users_ids:
+                for partner_id in members - {user_id}:
+                    partners[partner_id].add(user_id)
+
+        return partners
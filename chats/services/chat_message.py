@@ -2,13 +2,15 @@ from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
 
 from chats.enums import ChatWebSocketServerEventType
-from chats.models import Chat, ChatMessage
+from chats.metrics import observe_group_send
+from chats.models import Chat, ChatMember, ChatMessage
 from chats.serializers.websocket import (
     ChatMessageForWebsocketSerializer,
     NewMessageForWebsocketSerializer,
 )
 from chats.services.chat import ChatService
 from chats.consumers.groups import get_chat_group_name, get_user_chat_list_group_name
+from nevroth.tracing import inject, start_span
 
 from django.contrib.auth import get_user_model
 
@@ -20,17 +22,30 @@ class ChatMessageService:
     def create_message(cls, sender: User, chat: Chat, content: str) -> ChatMessage:
         return ChatMessage.objects.create(sender=sender, chat=chat, content=content)
 
+    @classmethod
+    def get_user_messages(cls, user: User):
+        # Semi-join on memberships keeps the access check to a single join.
+        return ChatMessage.objects.filter(
+            chat_id__in=ChatMember.objects.filter(user=user).values("chat_id")
+        )
+
     @classmethod
     def notify_about_new_message(cls, chat_message: ChatMessage):
         channel_layer = get_channel_layer()
 
-        async_to_sync(channel_layer.group_send)(
-            get_chat_group_name(chat_message.chat.id),
-            {
-                "type": ChatWebSocketServerEventType.NEW_MESSAGE,
-                "message": ChatMessageForWebsocketSerializer(chat_message).data,
-            },
-        )
+        with (
+            start_span("channels.group_send", group="chat"),
+            observe_group_send("chat"),
+        ):
+            async_to_sync(channel_layer.group_send)(
+                get_chat_group_name(chat_message.chat.id),
+                inject(
+                    {
+                        "type": ChatWebSocketServerEventType.NEW_MESSAGE,
+                        "message": ChatMessageForWebsocketSerializer(chat_message).data,
+                    }
+                ),
+            )
 
         members_ids = ChatService.get_chat_members_ids(chat_message.chat)
         new_message = NewMessageForWebsocketSerializer(chat_message).data
@@ -38,10 +53,16 @@ class ChatMessageService:
             if member_id == chat_message.sender.id:
                 continue
 
-            async_to_sync(channel_layer.group_send)(
-                get_user_chat_list_group_name(member_id),
-                {
-                    "type": ChatWebSocketServerEventType.NEW_MESSAGE,
-                    "message": new_message,
-                },
-            )
+            with (
+                start_span("channels.group_send", group="chat_list"),
+                observe_group_send("chat_list"),
+            ):
+                async_to_sync(channel_layer.group_send)(
+                    get_user_chat_list_group_name(member_id),
+                    inject(
+                        {
+                            "type": ChatWebSocketServerEventType.NEW_MESSAGE,
+                            "message": new_message,
+                        }
+                    ),
+                )
@@ -0,0 +1,219 @@
+import gzip
+import io
+import json
+from datetime import datetime
+from typing import Iterator
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection
+
+from chats.services.chat_message_partition import (
+    ChatMessagePartition,
+    ChatMessagePartitionService,
+)
+
+ARCHIVED_COLUMNS = ["id", "chat_id", "sender_id", "content", "created_at", "updated_at"]
+
+
+class ChatArchiveChunk:
+    """Gzip-compressed NDJSON chunk of one chat's messages within one week"""
+
+    def __init__(
+        self, chat_id: int, partition: ChatMessagePartition, source: str, part: int
+    ):
+        self.chat_id = chat_id
+        self.partition = partition
+        self.source = source
+        self.part = part
+        self.count = 0
+        self.first_id = None
+        self.last_id = None
+        self.first_created_at = None
+        self.last_created_at = None
+
+        self._buffer = io.BytesIO()
+        self._gzip = gzip.GzipFile(fileobj=self._buffer, mode="wb")
+
+    @property
+    def key(self) -> str:
+        name = f"{self.partition.start:%Y%m%d}-{self.source}"
+        if self.source == "default":
+            # The default partition is archived a little further every night,
+            # so its chunks are named by their messages to never replace the
+            # chunks of earlier runs, whose rows are already purged.
+            name += f"-{self.first_id}-{self.last_id}"
+
+        return (
+            f"{ChatMessageArchiveService.get_chat_prefix(self.chat_id)}/"
+            f"{name}-{self.part:04d}.ndjson.gz"
+        )
+
+    def write(self, message: dict, created_at: datetime):
+        self._gzip.write(json.dumps(message).encode("utf-8") + b"\n")
+        self.count += 1
+        self.first_id = self.first_id or message["id"]
+        self.last_id = message["id"]
+        self.first_created_at = self.first_created_at or created_at
+        self.last_created_at = created_at
+
+    def close(self) -> bytes:
+        self._gzip.close()
+        return self._buffer.getvalue()
+
+    def to_manifest_entry(self) -> dict:
+        return {
+            "key": self.key,
+            "period_start": self.partition.start.isoformat(),
+            "period_end": self.partition.end.isoformat(),
+            "part": self.part,
+            "count": self.count,
+            "first_created_at": self.first_created_at.isoformat(),
+            "last_created_at": self.last_created_at.isoformat(),
+        }
+
+
+class ChatMessageArchiveService:
+    """
+    Service to archive expiring chat messages to object storage.
+
+    Messages are streamed with a server-side cursor ordered by chat, so at most
+    one chunk is held in memory. Every chat gets a small manifest listing its
+    chunks, which allows fetching one chat's history without listing the bucket.
+    """
+
+    @classmethod
+    def get_chat_prefix(cls, chat_id: int) -> str:
+        return f"{settings.CHAT_ARCHIVE_PREFIX}/chat_{chat_id}"
+
+    @classmethod
+    def get_manifest_key(cls, chat_id: int) -> str:
+        return f"{cls.get_chat_prefix(chat_id)}/manifest.json"
+
+    @classmethod
+    def get_manifest(cls, chat_id: int) -> dict:
+        key = cls.get_manifest_key(chat_id)
+        if not default_storage.exists(key):
+            return {"chat": chat_id, "chunks": []}
+
+        with default_storage.open(key, "rb") as file:
+            return json.loads(file.read())
+
+    @classmethod
+    def iter_archived_messages(cls, chat_id: int) -> Iterator[dict]:
+        """Yield archived messages of a chat in chronological order"""
+        for chunk in cls.get_manifest(chat_id)["chunks"]:
+            with default_storage.open(chunk["key"], "rb") as file:
+                for line in gzip.decompress(file.read()).splitlines():
+                    yield json.loads(line)
+
+    @classmethod
+    def archive_partition(cls, partition: ChatMessagePartition) -> int:
+        return cls._archive_table(partition.name, source="weekly")
+
+    @classmethod
+    def archive_default_partition(cls, threshold: datetime) -> int:
+        return cls._archive_table(
+            ChatMessagePartitionService.get_default_partition_name(),
+            source="default",
+            until=threshold,
+        )
+
+    @classmethod
+    def _archive_table(
+        cls, table: str, source: str, until: datetime | None = None
+    ) -> int:
+        columns = ", ".join(connection.ops.quote_name(c) for c in ARCHIVED_COLUMNS)
+        sql = f"SELECT {columns} FROM {connection.ops.quote_name(table)}"
+        params = []
+        if until is not None:
+            sql += " WHERE created_at <= %s"
+            params.append(until)
+        sql += " ORDER BY chat_id, created_at, id"
+
+        archived = 0
+        chunk = None
+        manifest_entries = []
+
+        with connection.chunked_cursor() as cursor:
+            cursor.execute(sql, params)
+
+            while rows := cursor.fetchmany(settings.CHAT_ARCHIVE_FETCH_SIZE):
+                for row in rows:
+                    message = dict(zip(ARCHIVED_COLUMNS, row))
+                    created_at = message["created_at"]
+                    partition = ChatMessagePartitionService.get_partition_for(
+                        created_at
+                    )
+
+                    if chunk and chunk.chat_id != message["chat_id"]:
+                        manifest_entries.append(cls._save_chunk(chunk))
+                        cls._update_manifest(chunk.chat_id, manifest_entries)
+                        chunk, manifest_entries = None, []
+                    elif chunk and (
+                        chunk.partition != partition
+                        or chunk.count >= settings.CHAT_ARCHIVE_CHUNK_MAX_MESSAGES
+                    ):
+                        manifest_entries.append(cls._save_chunk(chunk))
+                        part = chunk.part + 1 if chunk.partition == partition else 0
+                        chunk = ChatArchiveChunk(
+                            message["chat_id"], partition, source, part
+                        )
+
+                    if chunk is None:
+                        chunk = ChatArchiveChunk(
+                            message["chat_id"], partition, source, 0
+                        )
+
+                    chunk.write(cls._serialize(message), created_at)
+                    archived += 1
+
+        if chunk:
+            manifest_entries.append(cls._save_chunk(chunk))
+            cls._update_manifest(chunk.chat_id, manifest_entries)
+
+        return archived
+
+    @classmethod
+    def _serialize(cls, message: dict) -> dict:
+        return {
+            "id": message["id"],
+            "chat": message["chat_id"],
+            "sender": message["sender_id"],
+            "content": message["content"],
+            "created_at": message["created_at"].isoformat(),
+            "updated_at": message["updated_at"].isoformat(),
+        }
+
+    @classmethod
+    def _save_chunk(cls, chunk: ChatArchiveChunk) -> dict:
+        cls._save(chunk.key, chunk.close())
+        return chunk.to_manifest_entry()
+
+    @classmethod
+    def _update_manifest(cls, chat_id: int, entries: list[dict]):
+        manifest = cls.get_manifest(chat_id)
+
+        # New chunks are appended. Only re-archiving the same messages after an
+        # interrupted run gives chunks the same keys, which then replace them.
+        keys = {entry["key"] for entry in entries}
+        chunks = [chunk for chunk in manifest["chunks"] if chunk["key"] not in keys]
+        manifest["chunks"] = sorted(
+            chunks + entries,
+            key=lambda chunk: (
+                chunk["period_start"],
+                chunk["first_created_at"],
+                chunk["key"],
+            ),
+        )
+
+        cls._save(cls.get_manifest_key(chat_id), json.dumps(manifest).encode("utf-8"))
+
+    @classmethod
+    def _save(cls, key: str, content: bytes):
+        # Storage doesn't overwrite existing files, so replace them explicitly.
+        if default_storage.exists(key):
+            default_storage.delete(key)
+
+        default_storage.save(key, ContentFile(content))
@@ -0,0 +1,165 @@
+import re
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from chats.models import ChatMessage
+
+
+@dataclass(frozen=True)
+class ChatMessagePartition:
+    name: str
+    start: datetime
+    end: datetime
+
+
+class ChatMessagePartitionService:
+    """Service to manage weekly range partitions of the chat messages table"""
+
+    PARTITION_INTERVAL = timedelta(weeks=1)
+    PARTITION_NAME_PATTERN = re.compile(r"_p(?P<start>\d{8})$")
+
+    @classmethod
+    def get_table_name(cls) -> str:
+        return ChatMessage._meta.db_table
+
+    @classmethod
+    def get_default_partition_name(cls) -> str:
+        return f"{cls.get_table_name()}_default"
+
+    @classmethod
+    def get_partition_for(cls, moment: datetime) -> ChatMessagePartition:
+        """Return the weekly (Monday-aligned, UTC) partition containing the moment"""
+        day = moment.astimezone(dt_timezone.utc).date()
+        week_start = day - timedelta(days=day.weekday())
+        start = datetime.combine(week_start, time.min, tzinfo=dt_timezone.utc)
+
+        return ChatMessagePartition(
+            name=f"{cls.get_table_name()}_p{start:%Y%m%d}",
+            start=start,
+            end=start + cls.PARTITION_INTERVAL,
+        )
+
+    @classmethod
+    def get_partitions(cls) -> list[ChatMessagePartition]:
+        """Return attached weekly partitions ordered by their range start"""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT child.relname
+                FROM pg_inherits
+                         JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+                         JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                WHERE parent.relname = %s
+                """,
+                [cls.get_table_name()],
+            )
+            names = [row[0] for row in cursor.fetchall()]
+
+        partitions = []
+        for name in names:
+            match = cls.PARTITION_NAME_PATTERN.search(name)
+            if not match:
+                continue
+
+            start = datetime.strptime(match["start"], "%Y%m%d").replace(
+                tzinfo=dt_timezone.utc
+            )
+            partitions.append(cls.get_partition_for(start))
+
+        return sorted(partitions, key=lambda partition: partition.start)
+
+    @classmethod
+    def create_partition(cls, partition: ChatMessagePartition) -> bool:
+        """
+        Create a partition, moving rows for its range out of the default partition.
+
+        Returns False if the partition already exists.
+        """
+        table = connection.ops.quote_name(cls.get_table_name())
+        default = connection.ops.quote_name(cls.get_default_partition_name())
+        name = connection.ops.quote_name(partition.name)
+        columns = ", ".join(
+            connection.ops.quote_name(field.column)
+            for field in ChatMessage._meta.concrete_fields
+            if not field.generated
+        )
+        bounds = [partition.start, partition.end]
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [partition.name])
+            if cursor.fetchone()[0]:
+                return False
+
+            cursor.execute(
+                f"SELECT EXISTS (SELECT 1 FROM {default} "
+                f"WHERE created_at >= %s AND created_at < %s)",
+                bounds,
+            )
+            has_default_rows = cursor.fetchone()[0]
+
+            if has_default_rows:
+                cursor.execute(f"ALTER TABLE {table} DETACH PARTITION {default}")
+
+            cursor.execute(
+                f"CREATE TABLE {name} PARTITION OF {table} FOR VALUES FROM (%s) TO (%s)",
+                bounds,
+            )
+
+            if has_default_rows:
+                cursor.execute(
+                    f"WITH moved AS ("
+                    f"DELETE FROM {default} WHERE created_at >= %s AND created_at < %s "
+                    f"RETURNING {columns}"
+                    f") INSERT INTO {table} ({columns}) SELECT {columns} FROM moved",
+                    bounds,
+                )
+                cursor.execute(
+                    f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT"
+                )
+
+        return True
+
+    @classmethod
+    def create_future_partitions(cls, weeks_ahead: int) -> list[ChatMessagePartition]:
+        """Create partitions for the current week and `weeks_ahead` following ones"""
+        current = cls.get_partition_for(timezone.now())
+        created = []
+
+        for week in range(weeks_ahead + 1):
+            partition = cls.get_partition_for(
+                current.start + week * cls.PARTITION_INTERVAL
+            )
+            if cls.create_partition(partition):
+                created.append(partition)
+
+        return created
+
+    @classmethod
+    def get_expired_partitions(cls, threshold: datetime) -> list[ChatMessagePartition]:
+        """Return partitions whose whole range is older than the threshold"""
+        return [
+            partition
+            for partition in cls.get_partitions()
+            if partition.end <= threshold
+        ]
+
+    @classmethod
+    def drop_partition(cls, partition: ChatMessagePartition):
+        table = connection.ops.quote_name(cls.get_table_name())
+        name = connection.ops.quote_name(partition.name)
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"ALTER TABLE {table} DETACH PARTITION {name}")
+            cursor.execute(f"DROP TABLE {name}")
+
+    @classmethod
+    def purge_default_partition(cls, threshold: datetime) -> int:
+        """Delete expired rows that landed outside of the weekly partitions"""
+        default = connection.ops.quote_name(cls.get_default_partition_name())
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {default} WHERE created_at <= %s", [threshold])
+            return cursor.rowcount
@@ -0,0 +1,145 @@
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django_redis import get_redis_connection
+
+# KEYS: connections, online, changed; ARGV: channel, now, expires_at, user_id, ttl
+TOUCH_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[2])
+local was_online = redis.call('ZCARD', KEYS[1]) > 0
+redis.call('ZADD', KEYS[1], ARGV[3], ARGV[1])
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+redis.call('ZADD', KEYS[2], 'GT', ARGV[3], ARGV[4])
+if not was_online then
+    redis.call('SADD', KEYS[3], ARGV[4])
+end
+return was_online and 0 or 1
+"""
+
+# KEYS: connections, online, changed, last_seen; ARGV: channel, now, user_id, seen_at
+LEAVE_SCRIPT = """
+if ARGV[1] ~= '' then
+    redis.call('ZREM', KEYS[1], ARGV[1])
+end
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[2])
+if redis.call('ZCARD', KEYS[1]) > 0 then
+    return 0
+end
+if redis.call('ZREM', KEYS[2], ARGV[3]) == 1 then
+    redis.call('HSET', KEYS[4], ARGV[3], ARGV[4])
+    redis.call('SADD', KEYS[3], ARGV[3])
+    return 1
+end
+return 0
+"""
+
+
+class PresenceService:
+    """
+    Service to track online presence of users in Redis.
+
+    Every socket of a user is a member of the user's connections sorted set,
+    scored by the moment it expires unless a heartbeat refreshes it. A user is
+    online while at least one of the sockets is alive. Status transitions are
+    collected into a set and broadcast in batches by a periodic task.
+    """
+
+    @classmethod
+    def _key(cls, *parts) -> str:
+        return ":".join([settings.PRESENCE_KEY_PREFIX, *map(str, parts)])
+
+    @classmethod
+    def _connections_key(cls, user_id: int) -> str:
+        return cls._key("connections", user_id)
+
+    @classmethod
+    def _get_connection(cls):
+        return get_redis_connection("default")
+
+    @classmethod
+    def touch(cls, user_id: int, channel_name: str) -> bool:
+        """Register or refresh a user's socket; returns True if the user came online"""
+        now = time.time()
+        ttl = settings.PRESENCE_TTL_SECONDS
+        script = cls._get_connection().register_script(TOUCH_SCRIPT)
+
+        return bool(
+            script(
+                keys=[
+                    cls._connections_key(user_id),
+                    cls._key("online"),
+                    cls._key("changed"),
+                ],
+                args=[channel_name, now, now + ttl, user_id, ttl],
+            )
+        )
+
+    @classmethod
+    def leave(
+        cls, user_id: int, channel_name: str = "", seen_at: float | None = None
+    ) -> bool:
+        """Unregister a user's socket; returns True if the user went offline"""
+        now = time.time()
+        script = cls._get_connection().register_script(LEAVE_SCRIPT)
+
+        return bool(
+            script(
+                keys=[
+                    cls._connections_key(user_id),
+                    cls._key("online"),
+                    cls._key("changed"),
+                    cls._key("last_seen"),
+                ],
+                args=[channel_name, now, user_id, now if seen_at is None else seen_at],
+            )
+        )
+
+    @classmethod
+    def expire_stale_users(cls) -> list[int]:
+        """Mark users whose sockets stopped sending heartbeats as offline"""
+        stale = cls._get_connection().zrangebyscore(
+            cls._key("online"), "-inf", time.time(), withscores=True
+        )
+        ttl = settings.PRESENCE_TTL_SECONDS
+
+        return [
+            int(user_id)
+            for user_id, expires_at in stale
+            if cls.leave(int(user_id), seen_at=expires_at - ttl)
+        ]
+
+    @classmethod
+    def pop_changed_users(cls) -> list[int]:
+        key = cls._key("changed")
+        pipeline = cls._get_connection().pipeline()
+        pipeline.smembers(key)
+        pipeline.delete(key)
+        user_ids, _ = pipeline.execute()
+
+        return sorted(int(user_id) for user_id in user_ids)
+
+    @classmethod
+    def get_presence(cls, user_ids: list[int]) -> list[dict]:
+        if not user_ids:
+            return []
+
+        now = time.time()
+        pipeline = cls._get_connection().pipeline(transaction=False)
+        for user_id in user_ids:
+            pipeline.zcount(cls._connections_key(user_id), now, "+inf")
+        pipeline.hmget(cls._key("last_seen"), user_ids)
+        *connections, last_seen = pipeline.execute()
+
+        return [
+            {
+                "user": user_id,
+                "online": count > 0,
+                "last_seen": (
+                    datetime.fromtimestamp(float(seen_at), tz=dt_timezone.utc)
+                    if seen_at
+                    else None
+                ),
+            }
+            for user_id, count, seen_at in zip(user_ids, connections, last_seen)
+        ]
@@ -3,9 +3,11 @@ from django.dispatch.dispatcher import receiver
 
 from chats.models import ChatMessage
 from chats.services.chat_message import ChatMessageService
+from nevroth.tracing import start_span
 
 
 @receiver([post_save], sender=ChatMessage)
 def notify_new_message(sender, instance, created, **kwargs):
     if created:
-        ChatMessageService.notify_about_new_message(instance)
+        with start_span("signal.post_save", sender="ChatMessage"):
+            ChatMessageService.notify_about_new_message(instance)
@@ -4,7 +4,8 @@ from datetime import timedelta
 from django.utils import timezone
 from django.conf import settings
 
-from chats.models import ChatMessage
+from chats.services.chat_message_archive import ChatMessageArchiveService
+from chats.services.chat_message_partition import ChatMessagePartitionService
 
 
 @shared_task
@@ -13,4 +14,15 @@ def cleanup_old_messages_task():
         days=settings.OLD_MESSAGE_RETENTION_DAYS
     )
 
-    ChatMessage.objects.filter(created_at__lte=threshold_date).delete()
+    # Whole weeks past the retention window are dropped as partitions, so
+    # messages live between OLD_MESSAGE_RETENTION_DAYS and one week longer.
+    for partition in ChatMessagePartitionService.get_expired_partitions(threshold_date):
+        if settings.CHAT_ARCHIVE_ENABLED:
+            ChatMessageArchiveService.archive_partition(partition)
+
+        ChatMessagePartitionService.drop_partition(partition)
+
+    if settings.CHAT_ARCHIVE_ENABLED:
+        ChatMessageArchiveService.archive_default_partition(threshold_date)
+
+    ChatMessagePartitionService.purge_default_partition(threshold_date)
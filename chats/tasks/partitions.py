@@ -0,0 +1,12 @@
+from celery import shared_task
+
+from django.conf import settings
+
+from chats.services.chat_message_partition import ChatMessagePartitionService
+
+
+@shared_task
+def create_chat_message_partitions_task():
+    ChatMessagePartitionService.create_future_partitions(
+        settings.CHAT_MESSAGE_PARTITIONS_AHEAD_WEEKS
+    )
@@ -0,0 +1,49 @@
+import asyncio
+
+from asgiref.sync import async_to_sync
+from celery import shared_task
+from channels.layers import get_channel_layer
+
+from chats.consumers.groups import get_user_chat_list_group_name
+from chats.enums import ChatWebSocketServerEventType
+from chats.serializers.presence import PresenceSerializer
+from chats.services.chat import ChatService
+from chats.services.presence import PresenceService
+
+
+@shared_task
+def broadcast_presence_changes_task():
+    PresenceService.expire_stale_users()
+
+    changed_users_ids = PresenceService.pop_changed_users()
+    if not changed_users_ids:
+        return
+
+    # Statuses are read once per interval, so a user flapping between
+    # heartbeats produces at most one event with the latest status.
+    presence = {
+        item["user"]: item
+        for item in PresenceSerializer(
+            PresenceService.get_presence(changed_users_ids), many=True
+        ).data
+    }
+    partners = ChatService.get_chat_partners_ids(changed_users_ids)
+
+    async_to_sync(_send_presence_changes)(partners, presence)
+
+
+async def _send_presence_changes(partners: dict[int, set[int]], presence: dict):
+    channel_layer = get_channel_layer()
+
+    await asyncio.gather(
+        *(
+            channel_layer.group_send(
+                get_user_chat_list_group_name(partner_id),
+                {
+                    "type": ChatWebSocketServerEventType.PRESENCE_CHANGED,
+                    "users": [presence[user_id] for user_id in sorted(users_ids)],
+                },
+            )
+            for partner_id, users_ids in partners.items()
+        )
+    )
@@ -4,6 +4,7 @@ from django.utils import timezone
 from rest_framework.test import APITestCase
 
 from chats.models import ChatMessage
+from chats.services.chat_message_partition import ChatMessagePartitionService
 from chats.tasks.cleanup import cleanup_old_messages_task
 from chats.tests.factories.chat_message import ChatMessageFactory
 
@@ -36,3 +37,22 @@ class CleanupOldMessagesTaskTests(APITestCase):
         """Ensure that the task runs successfully via Celery's apply() method."""
         result = cleanup_old_messages_task.apply()
         self.assertTrue(result.successful())
+
+    def test_cleanup_old_messages_task_drops_expired_partitions(self):
+        """Test that partitions older than the retention window are dropped."""
+        partition = ChatMessagePartitionService.get_partition_for(
+            self.now - timedelta(days=60)
+        )
+        ChatMessagePartitionService.create_partition(partition)
+
+        expired_message = ChatMessageFactory()
+        ChatMessage.objects.filter(pk=expired_message.pk).update(
+            created_at=partition.start + timedelta(hours=1)
+        )
+
+        cleanup_old_messages_task()
+
+        partition_names = [p.name for p in ChatMessagePartitionService.get_partitions()]
+        self.assertNotIn(partition.name, partition_names)
+        self.assertFalse(ChatMessage.objects.filter(pk=expired_message.pk).exists())
+        self.assertTrue(ChatMessage.objects.filter(pk=self.new_message.pk).exists())
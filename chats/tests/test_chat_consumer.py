@@ -11,6 +11,7 @@ from rest_framework_simplejwt.tokens import AccessToken
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from accounts.services.ws_ticket import WebSocketTicketService
 from accounts.tests.factories.user import MemberFactory
 from chats.tests.factories.chat import ChatPrivateFactory, ChatMemberFactory
 from chats.tests.factories.chat_message import ChatMessageCreatePayloadFactory
@@ -136,6 +137,30 @@ class ChatConsumerTests(TransactionTestCase):
 
         await communicator.disconnect()
 
+    async def test_ticket_auth_websocket_connect_and_disconnect(self):
+        """Test that authentication through a single-use ticket works as expected."""
+        user = await database_sync_to_async(MemberFactory)()
+        ticket = await sync_to_async(WebSocketTicketService.issue_ticket)(user)
+
+        chat = await database_sync_to_async(ChatPrivateFactory)()
+        await database_sync_to_async(ChatMemberFactory)(chat=chat, user=user)
+
+        communicator = WebsocketCommunicator(
+            self.application,
+            f"ws/chats/{chat.id}/?ticket={ticket}",
+        )
+        connected, subprotocol = await communicator.connect()
+        self.assertTrue(connected)
+        await communicator.disconnect()
+
+        # The ticket is consumed by the first connect.
+        communicator = WebsocketCommunicator(
+            self.application,
+            f"ws/chats/{chat.id}/?ticket={ticket}",
+        )
+        connected, subprotocol = await communicator.connect()
+        self.assertFalse(connected)
+
     async def test_cannot_connect_with_invalid_token(self):
         """Test that cannot connect with invalid token."""
         user = await database_sync_to_async(MemberFactory)()
@@ -0,0 +1,117 @@
+import asyncio
+import json
+
+from django.test import SimpleTestCase, override_settings
+
+from chats.consumers.outbound import OutboundQueueConsumer
+from chats.enums import ChatWebSocketCloseCode
+
+
+class SlowClient:
+    """Fake ASGI send that holds websocket frames until released"""
+
+    def __init__(self):
+        self.sent = []
+        self.closed_with = None
+        self.released = asyncio.Event()
+
+    async def __call__(self, message):
+        if message["type"] == "websocket.send":
+            await self.released.wait()
+            self.sent.append(json.loads(message["text"]))
+        elif message["type"] == "websocket.close":
+            self.closed_with = message.get("code")
+
+
+class BrokenClient(SlowClient):
+    """Fake ASGI send failing to deliver websocket frames"""
+
+    async def __call__(self, message):
+        if message["type"] == "websocket.send":
+            raise OSError("Connection reset")
+        await super().__call__(message)
+
+
+class OutboundQueueConsumerTests(SimpleTestCase):
+    async def _connect(self):
+        consumer = OutboundQueueConsumer()
+        consumer.base_send = client = SlowClient()
+        await consumer.accept()
+        return consumer, client
+
+    async def test_typing_events_are_coalesced(self):
+        """Test that pending typing events of a user are replaced, messages kept."""
+        consumer, client = await self._connect()
+
+        await consumer.enqueue_json({"type": "new_message", "id": 1})
+        await asyncio.sleep(0)
+        await consumer.enqueue_json({"type": "typing"}, coalesce_key="typing:5")
+        await consumer.enqueue_json({"type": "stop_typing"}, coalesce_key="typing:5")
+        await consumer.enqueue_json({"type": "new_message", "id": 2})
+
+        client.released.set()
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        self.assertEqual(
+            client.sent,
+            [
+                {"type": "new_message", "id": 1},
+                {"type": "stop_typing"},
+                {"type": "new_message", "id": 2},
+            ],
+        )
+        consumer._stop_writer()
+
+    @override_settings(CHAT_WS_OUTBOUND_QUEUE_SIZE=2)
+    async def test_slow_consumer_is_disconnected(self):
+        """Test that a client whose queue overflows is closed."""
+        consumer, client = await self._connect()
+
+        for message_id in range(5):
+            await consumer.enqueue_json({"type": "new_message", "id": message_id})
+
+        self.assertEqual(client.closed_with, ChatWebSocketCloseCode.SLOW_CONSUMER)
+
+        # Events arriving after the close are dropped.
+        await consumer.enqueue_json({"type": "new_message", "id": 6})
+        self.assertEqual(len(consumer._outbound), 0)
+
+    @override_settings(
+        CHAT_WS_OUTBOUND_QUEUE_SIZE=2, CHAT_WS_SLOW_CONSUMER_GRACE_SECONDS=60
+    )
+    async def test_short_burst_within_grace_is_kept(self):
+        """Test that a queue briefly over the limit doesn't close the client."""
+        consumer, client = await self._connect()
+
+        for message_id in range(4):
+            await consumer.enqueue_json({"type": "new_message", "id": message_id})
+
+        self.assertIsNone(client.closed_with)
+
+        client.released.set()
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        self.assertEqual([event["id"] for event in client.sent], [0, 1, 2, 3])
+        consumer._stop_writer()
+
+    async def test_failed_send_closes_client(self):
+        """Test that a send error is logged and closes the client."""
+        consumer = OutboundQueueConsumer()
+        consumer.base_send = client = BrokenClient()
+        await consumer.accept()
+
+        with self.assertLogs("chats.consumers.outbound", "ERROR"):
+            await consumer.enqueue_json({"type": "new_message", "id": 1})
+            await consumer.enqueue_json({"type": "new_message", "id": 2})
+            for _ in range(10):
+                await asyncio.sleep(0)
+
+        self.assertEqual(client.closed_with, ChatWebSocketCloseCode.INTERNAL_ERROR)
+        self.assertTrue(consumer._writer.done())
+        self.assertEqual(len(consumer._outbound), 0)
+
+        # Events arriving after the close are dropped.
+        await consumer.enqueue_json({"type": "new_message", "id": 3})
+        self.assertEqual(len(consumer._outbound), 0)
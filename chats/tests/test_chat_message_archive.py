@@ -0,0 +1,123 @@
+import gzip
+import json
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from chats.models import ChatMessage
+from chats.services.chat_message_archive import ChatMessageArchiveService
+from chats.services.chat_message_partition import ChatMessagePartitionService
+from chats.tasks.cleanup import cleanup_old_messages_task
+from chats.tests.factories.chat import ChatPrivateFactory
+from chats.tests.factories.chat_message import ChatMessageFactory
+
+
+class ChatMessageArchiveTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.partition = ChatMessagePartitionService.get_partition_for(
+            timezone.now() - timedelta(days=60)
+        )
+        ChatMessagePartitionService.create_partition(cls.partition)
+
+        cls.chat1 = ChatPrivateFactory()
+        cls.chat2 = ChatPrivateFactory()
+
+        cls.chat1_messages = ChatMessageFactory.create_batch(3, chat=cls.chat1)
+        cls.chat2_messages = ChatMessageFactory.create_batch(2, chat=cls.chat2)
+
+        for index, message in enumerate(cls.chat1_messages + cls.chat2_messages):
+            ChatMessage.objects.filter(pk=message.pk).update(
+                created_at=cls.partition.start + timedelta(minutes=index)
+            )
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(
+            MEDIA_ROOT=self.media_root, CHAT_ARCHIVE_ENABLED=True
+        )
+        self.settings_override.enable()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def test_archive_partition_writes_chunks_per_chat(self):
+        """Test that every chat gets its own compressed chunk and manifest."""
+        archived = ChatMessageArchiveService.archive_partition(self.partition)
+        self.assertEqual(archived, 5)
+
+        for chat, messages in [
+            (self.chat1, self.chat1_messages),
+            (self.chat2, self.chat2_messages),
+        ]:
+            with self.subTest(chat=chat.id):
+                manifest = ChatMessageArchiveService.get_manifest(chat.id)
+                self.assertEqual(len(manifest["chunks"]), 1)
+
+                chunk = manifest["chunks"][0]
+                self.assertEqual(chunk["count"], len(messages))
+                self.assertTrue(chunk["key"].endswith(".ndjson.gz"))
+
+                with default_storage.open(chunk["key"], "rb") as file:
+                    lines = gzip.decompress(file.read()).splitlines()
+
+                archived_ids = [json.loads(line)["id"] for line in lines]
+                self.assertEqual(archived_ids, [m.id for m in messages])
+
+    def test_iter_archived_messages_reads_only_one_chat(self):
+        """Test that one chat's archive is read back through its manifest."""
+        ChatMessageArchiveService.archive_partition(self.partition)
+
+        archived = list(ChatMessageArchiveService.iter_archived_messages(self.chat2.id))
+
+        self.assertEqual(
+            [m["id"] for m in archived], [m.id for m in self.chat2_messages]
+        )
+        self.assertTrue(all(m["chat"] == self.chat2.id for m in archived))
+
+    def test_archive_partition_twice_replaces_chunks(self):
+        """Test that re-archiving after an interrupted run doesn't duplicate chunks."""
+        ChatMessageArchiveService.archive_partition(self.partition)
+        ChatMessageArchiveService.archive_partition(self.partition)
+
+        manifest = ChatMessageArchiveService.get_manifest(self.chat1.id)
+        self.assertEqual(len(manifest["chunks"]), 1)
+
+    def test_default_partition_archived_in_two_runs_keeps_both(self):
+        """Test that archiving one week of the default partition twice keeps both runs."""
+        # No weekly partition exists for this week, so its rows stay in default.
+        week = ChatMessagePartitionService.get_partition_for(
+            timezone.now() - timedelta(days=120)
+        )
+        chat = ChatPrivateFactory()
+        messages = ChatMessageFactory.create_batch(4, chat=chat)
+        for index, message in enumerate(messages):
+            ChatMessage.objects.filter(pk=message.pk).update(
+                created_at=week.start + timedelta(days=index + 1)
+            )
+
+        for threshold in [week.start + timedelta(days=2, hours=12), week.end]:
+            ChatMessageArchiveService.archive_default_partition(threshold)
+            ChatMessagePartitionService.purge_default_partition(threshold)
+
+        self.assertFalse(ChatMessage.objects.filter(chat=chat).exists())
+        self.assertEqual(
+            len(ChatMessageArchiveService.get_manifest(chat.id)["chunks"]), 2
+        )
+        archived = list(ChatMessageArchiveService.iter_archived_messages(chat.id))
+        self.assertEqual([m["id"] for m in archived], [m.id for m in messages])
+
+    def test_cleanup_archives_before_dropping_partition(self):
+        """Test that the retention job archives expired messages before removal."""
+        cleanup_old_messages_task()
+
+        self.assertFalse(ChatMessage.objects.filter(chat=self.chat1).exists())
+
+        archived = list(ChatMessageArchiveService.iter_archived_messages(self.chat1.id))
+        self.assertEqual(len(archived), len(self.chat1_messages))
@@ -0,0 +1,59 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from chats.models import ChatMessage
+from chats.services.chat_message_partition import ChatMessagePartitionService
+from chats.tests.factories.chat_message import ChatMessageFactory
+
+
+class ChatMessagePartitionTests(APITestCase):
+    def test_partition_is_aligned_to_week(self):
+        """Test that partitions start on Monday and span one week."""
+        partition = ChatMessagePartitionService.get_partition_for(timezone.now())
+
+        self.assertEqual(partition.start.weekday(), 0)
+        self.assertEqual(partition.end - partition.start, timedelta(weeks=1))
+        self.assertTrue(partition.name.endswith(f"_p{partition.start:%Y%m%d}"))
+
+    def test_create_partitions_command(self):
+        """Test that the command creates partitions for upcoming weeks."""
+        out = StringIO()
+        call_command("create_chat_message_partitions", weeks_ahead=6, stdout=out)
+
+        current = ChatMessagePartitionService.get_partition_for(timezone.now())
+        partition_names = {p.name for p in ChatMessagePartitionService.get_partitions()}
+
+        for week in range(7):
+            expected = ChatMessagePartitionService.get_partition_for(
+                current.start + timedelta(weeks=week)
+            )
+            self.assertIn(expected.name, partition_names)
+
+    def test_create_partitions_command_is_idempotent(self):
+        """Test that running the command twice doesn't create anything new."""
+        call_command("create_chat_message_partitions", stdout=StringIO())
+        created = ChatMessagePartitionService.create_future_partitions(weeks_ahead=2)
+
+        self.assertEqual(created, [])
+
+    def test_create_partition_moves_rows_from_default_partition(self):
+        """Test that creating a partition moves matching rows out of the default one."""
+        message = ChatMessageFactory()
+        created_at = timezone.now() - timedelta(days=90)
+        ChatMessage.objects.filter(pk=message.pk).update(created_at=created_at)
+
+        partition = ChatMessagePartitionService.get_partition_for(created_at)
+        self.assertTrue(ChatMessagePartitionService.create_partition(partition))
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT tableoid::regclass::text FROM {ChatMessage._meta.db_table} "
+                f"WHERE id = %s",
+                [message.pk],
+            )
+            self.assertEqual(cursor.fetchone()[0], partition.name)
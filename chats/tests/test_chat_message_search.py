@@ -0,0 +1,117 @@
+import jsonschema
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.tests.factories.user import MemberFactory
+from chats.tests.factories.chat import ChatPrivateFactory, ChatMemberFactory
+from chats.tests.factories.chat_message import ChatMessageFactory
+
+search_result_schema = {
+    "type": "object",
+    "properties": {
+        "id": {"type": "integer"},
+        "chat": {"type": "integer"},
+        "content": {"type": "string"},
+        "sender": {
+            "type": "object",
+            "properties": {
+                "id": {"type": "integer"},
+                "full_name": {"type": "string"},
+            },
+            "required": ["id", "full_name"],
+            "additionalProperties": False,
+        },
+        "created_at": {"type": "string", "format": "date-time"},
+        "rank": {"type": "number"},
+    },
+    "required": ["id", "chat", "content", "sender", "created_at", "rank"],
+    "additionalProperties": False,
+}
+
+search_response_schema = {
+    "type": "object",
+    "properties": {
+        "count": {"type": "integer"},
+        "next": {"type": ["string", "null"]},
+        "previous": {"type": ["string", "null"]},
+        "results": {"type": "array", "items": search_result_schema},
+    },
+    "required": ["count", "next", "previous", "results"],
+    "additionalProperties": False,
+}
+
+
+class ChatMessageSearchViewTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = MemberFactory()
+        cls.friend = MemberFactory()
+        cls.stranger = MemberFactory()
+
+        cls.chat = ChatPrivateFactory()
+        ChatMemberFactory(chat=cls.chat, user=cls.user)
+        ChatMemberFactory(chat=cls.chat, user=cls.friend)
+
+        cls.other_chat = ChatPrivateFactory()
+        ChatMemberFactory(chat=cls.other_chat, user=cls.user)
+
+        cls.stranger_chat = ChatPrivateFactory()
+        ChatMemberFactory(chat=cls.stranger_chat, user=cls.stranger)
+
+        cls.best_match = ChatMessageFactory(
+            chat=cls.chat, sender=cls.friend, content="running running every morning"
+        )
+        cls.match = ChatMessageFactory(
+            chat=cls.other_chat, sender=cls.user, content="went running yesterday"
+        )
+        ChatMessageFactory(chat=cls.chat, sender=cls.user, content="no match here")
+        cls.foreign_match = ChatMessageFactory(
+            chat=cls.stranger_chat, sender=cls.stranger, content="running alone"
+        )
+
+        cls.url = reverse("chat-messages-search")
+
+    def test_search_authentication_required(self):
+        """Test that authentication is required to search messages."""
+        response = self.client.get(self.url, {"query": "running"})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_search_query_required(self):
+        """Test that search query is required."""
+        self.client.force_authenticate(self.user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_search_only_in_user_chats(self):
+        """Test that only messages from the user's chats are found, ranked."""
+        self.client.force_authenticate(self.user)
+        response = self.client.get(self.url, {"query": "running"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data["results"]
+
+        self.assertEqual(
+            [r["id"] for r in results], [self.best_match.id, self.match.id]
+        )
+        self.assertEqual(results[0]["chat"], self.chat.id)
+        self.assertGreaterEqual(results[0]["rank"], results[1]["rank"])
+        self._assert_response_schema(response.data)
+
+    def test_search_in_one_chat(self):
+        """Test that search can be limited to one chat."""
+        self.client.force_authenticate(self.user)
+        response = self.client.get(
+            self.url, {"query": "running", "chat": self.other_chat.id}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([r["id"] for r in response.data["results"]], [self.match.id])
+
+    def _assert_response_schema(self, data):
+        """Validate that the response matches the expected schema."""
+        try:
+            jsonschema.validate(instance=data, schema=search_response_schema)
+        except jsonschema.exceptions.ValidationError as e:
+            self.fail(f"Response does not match schema: {e}")
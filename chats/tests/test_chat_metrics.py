@@ -0,0 +1,110 @@
+from unittest import mock
+
+from asgiref.sync import SyncToAsync
+from channels.db import database_sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.test import SimpleTestCase, TransactionTestCase
+from prometheus_client import REGISTRY
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.tests.factories.user import MemberFactory
+from chats.tests.factories.chat import ChatMemberFactory, ChatPrivateFactory
+from chats.metrics import get_db_thread_queue_depth
+from chats.tests.factories.chat_message import ChatMessageFactory
+from nevroth.asgi import application
+
+
+def get_sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class ChatMetricsTests(TransactionTestCase):
+    async def test_connections_and_handshakes_are_observed(self):
+        """Test that open connections and handshake latency are recorded."""
+        user = await database_sync_to_async(MemberFactory)()
+        connections = get_sample("chat_ws_connections", consumer="ChatListConsumer")
+        accepted = get_sample(
+            "chat_ws_connect_duration_seconds_count", outcome="accepted"
+        )
+        authenticated = get_sample(
+            "chat_ws_auth_duration_seconds_count", method="token"
+        )
+
+        communicator = WebsocketCommunicator(
+            application, f"ws/chat-list/?token={AccessToken.for_user(user)}"
+        )
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+
+        self.assertEqual(
+            get_sample("chat_ws_connections", consumer="ChatListConsumer"),
+            connections + 1,
+        )
+        self.assertEqual(
+            get_sample("chat_ws_connect_duration_seconds_count", outcome="accepted"),
+            accepted + 1,
+        )
+        self.assertEqual(
+            get_sample("chat_ws_auth_duration_seconds_count", method="token"),
+            authenticated + 1,
+        )
+
+        await communicator.disconnect()
+        self.assertEqual(
+            get_sample("chat_ws_connections", consumer="ChatListConsumer"),
+            connections,
+        )
+
+    async def test_rejected_handshakes_are_observed(self):
+        """Test that rejected connections are recorded and not counted as open."""
+        rejected = get_sample(
+            "chat_ws_connect_duration_seconds_count", outcome="rejected"
+        )
+        connections = get_sample("chat_ws_connections", consumer="ChatListConsumer")
+
+        communicator = WebsocketCommunicator(application, "ws/chat-list/")
+        connected, _ = await communicator.connect()
+        self.assertFalse(connected)
+
+        self.assertEqual(
+            get_sample("chat_ws_connect_duration_seconds_count", outcome="rejected"),
+            rejected + 1,
+        )
+        self.assertEqual(
+            get_sample("chat_ws_connections", consumer="ChatListConsumer"),
+            connections,
+        )
+
+    def test_group_sends_are_observed(self):
+        """Test that group sends of new messages are timed by group kind."""
+        chat = ChatPrivateFactory()
+        sender, receiver = MemberFactory.create_batch(2)
+        for user in [sender, receiver]:
+            ChatMemberFactory(chat=chat, user=user)
+        chat_sends = get_sample("chat_group_send_duration_seconds_count", group="chat")
+        chat_list_sends = get_sample(
+            "chat_group_send_duration_seconds_count", group="chat_list"
+        )
+
+        # Creating a message notifies its chat through a signal.
+        ChatMessageFactory(chat=chat, sender=sender)
+
+        self.assertEqual(
+            get_sample("chat_group_send_duration_seconds_count", group="chat"),
+            chat_sends + 1,
+        )
+        self.assertEqual(
+            get_sample("chat_group_send_duration_seconds_count", group="chat_list"),
+            chat_list_sends + 1,
+        )
+
+
+class DatabaseThreadQueueDepthTests(SimpleTestCase):
+    def test_queue_depth_is_read_from_executor(self):
+        """Test that calls waiting for the shared database thread are counted."""
+        self.assertEqual(get_db_thread_queue_depth(), 0)
+
+    def test_missing_executor_queue_is_skipped(self):
+        """Test that no depth is returned when asgiref doesn't expose the queue."""
+        with mock.patch.object(SyncToAsync, "single_thread_executor", object()):
+            self.assertIsNone(get_db_thread_queue_depth())
@@ -0,0 +1,78 @@
+from asgiref.sync import sync_to_async
+from channels.db import database_sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.tests.factories.user import MemberFactory
+from chats.tests.factories.chat import ChatMemberFactory, ChatPrivateFactory
+from chats.tests.factories.chat_message import ChatMessageCreatePayloadFactory
+from middlewares.tracing import TRACE_ID_HEADER
+from nevroth.asgi import application
+from nevroth.tracing import get_exporter
+
+
+@override_settings(
+    TRACING_ENABLED=True,
+    TRACING_SAMPLE_RATE=1,
+    TRACING_EXPORTER="nevroth.tracing.InMemorySpanExporter",
+)
+class ChatTracingTests(TransactionTestCase):
+    def setUp(self):
+        get_exporter.cache_clear()
+
+    async def test_new_message_is_traced_to_websocket_delivery(self):
+        """Test that a new message is traced from the request to its delivery."""
+        sender, receiver = await database_sync_to_async(MemberFactory.create_batch)(2)
+        chat = await database_sync_to_async(ChatPrivateFactory)()
+        for user in [sender, receiver]:
+            await database_sync_to_async(ChatMemberFactory)(chat=chat, user=user)
+
+        communicator = WebsocketCommunicator(
+            application, f"ws/chats/{chat.id}/?token={AccessToken.for_user(receiver)}"
+        )
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+
+        client = APIClient()
+        client.force_authenticate(user=sender)
+        payload = await database_sync_to_async(ChatMessageCreatePayloadFactory)(
+            chat=chat.id
+        )
+        response = await sync_to_async(client.post)(
+            reverse("chat-message-list"), payload
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        event = await communicator.receive_json_from()
+        self.assertNotIn("traceparent", event)
+        await communicator.disconnect()
+
+        spans = get_exporter().spans
+        self.assertTrue(
+            all(span["trace_id"] == response[TRACE_ID_HEADER] for span in spans)
+        )
+        spans_by_name = {span["name"]: span for span in spans}
+        group_send = next(
+            span
+            for span in spans
+            if span["name"] == "channels.group_send"
+            and span["attributes"]["group"] == "chat"
+        )
+        self.assertEqual(
+            spans_by_name["signal.post_save"]["parent_id"],
+            spans_by_name["http chat-message-list"]["span_id"],
+        )
+        self.assertEqual(
+            group_send["parent_id"], spans_by_name["signal.post_save"]["span_id"]
+        )
+        self.assertEqual(
+            spans_by_name["ws.new_message"]["parent_id"], group_send["span_id"]
+        )
+        self.assertEqual(
+            spans_by_name["ws.send"]["parent_id"],
+            spans_by_name["ws.new_message"]["span_id"],
+        )
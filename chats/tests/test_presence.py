@@ -0,0 +1,220 @@
+import time
+import uuid
+from unittest import mock
+
+import jsonschema
+
+from channels.db import database_sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from django_redis import get_redis_connection
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.tests.factories.user import MemberFactory
+from chats.services.presence import PresenceService
+from chats.tasks.presence import broadcast_presence_changes_task
+from chats.tests.factories.chat import ChatPrivateFactory, ChatMemberFactory
+from nevroth.asgi import application
+
+presence_schema = {
+    "type": "object",
+    "properties": {
+        "user": {"type": "integer"},
+        "online": {"type": "boolean"},
+        "last_seen": {"type": ["string", "null"], "format": "date-time"},
+    },
+    "required": ["user", "online", "last_seen"],
+    "additionalProperties": False,
+}
+
+presence_changed_event_schema = {
+    "type": "object",
+    "properties": {
+        "type": {"const": "presence_changed"},
+        "users": {"type": "array", "items": presence_schema},
+    },
+    "required": ["type", "users"],
+    "additionalProperties": False,
+}
+
+
+class PresenceKeysMixin:
+    """Isolate presence keys of every test under a unique prefix"""
+
+    def setUp(self):
+        super().setUp()
+        self.presence_prefix = f"presence-test-{uuid.uuid4().hex}"
+        settings_override = override_settings(PRESENCE_KEY_PREFIX=self.presence_prefix)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(self._delete_presence_keys)
+
+    def _delete_presence_keys(self):
+        connection = get_redis_connection("default")
+        keys = list(connection.scan_iter(f"{self.presence_prefix}:*"))
+        if keys:
+            connection.delete(*keys)
+
+
+class PresenceServiceTests(PresenceKeysMixin, APITestCase):
+    def test_user_online_while_any_socket_is_alive(self):
+        """Test that a user stays online until the last socket leaves."""
+        self.assertTrue(PresenceService.touch(1, "socket-a"))
+        self.assertFalse(PresenceService.touch(1, "socket-b"))
+
+        self.assertFalse(PresenceService.leave(1, "socket-a"))
+        self.assertTrue(PresenceService.get_presence([1])[0]["online"])
+
+        self.assertTrue(PresenceService.leave(1, "socket-b"))
+        presence = PresenceService.get_presence([1])[0]
+        self.assertFalse(presence["online"])
+        self.assertIsNotNone(presence["last_seen"])
+
+    def test_changed_users_are_collected_once(self):
+        """Test that status transitions are popped once per user."""
+        PresenceService.touch(1, "socket-a")
+        PresenceService.touch(1, "socket-b")
+        PresenceService.touch(2, "socket-c")
+
+        self.assertEqual(PresenceService.pop_changed_users(), [1, 2])
+        self.assertEqual(PresenceService.pop_changed_users(), [])
+
+    def test_expire_stale_users(self):
+        """Test that users without heartbeats within the TTL go offline."""
+        PresenceService.touch(1, "socket-a")
+        PresenceService.touch(2, "socket-b")
+        PresenceService.pop_changed_users()
+
+        self.assertEqual(PresenceService.expire_stale_users(), [])
+
+        with mock.patch("chats.services.presence.time.time") as now:
+            now.return_value = time.time() + 120
+            self.assertEqual(PresenceService.expire_stale_users(), [1, 2])
+
+        self.assertEqual(PresenceService.pop_changed_users(), [1, 2])
+
+    def test_unknown_user_is_offline(self):
+        """Test that users who never connected are reported offline."""
+        self.assertEqual(
+            PresenceService.get_presence([42]),
+            [{"user": 42, "online": False, "last_seen": None}],
+        )
+
+
+class PresenceListViewTests(PresenceKeysMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = MemberFactory()
+        cls.friend = MemberFactory()
+        cls.stranger = MemberFactory()
+
+        chat = ChatPrivateFactory()
+        ChatMemberFactory(chat=chat, user=cls.user)
+        ChatMemberFactory(chat=chat, user=cls.friend)
+
+        cls.url = reverse("presence-list")
+
+    def test_presence_authentication_required(self):
+        """Test that authentication is required to get presence."""
+        response = self.client.get(self.url, {"users": self.friend.id})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_presence_of_chat_partners(self):
+        """Test that presence is returned only for users sharing a chat."""
+        PresenceService.touch(self.friend.id, "socket-a")
+        PresenceService.touch(self.stranger.id, "socket-b")
+        self.client.force_authenticate(self.user)
+
+        response = self.client.get(
+            self.url, {"users": f"{self.friend.id},{self.stranger.id}"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]["user"], self.friend.id)
+        self.assertTrue(response.data[0]["online"])
+        for item in response.json():
+            self._assert_presence_schema(item)
+
+    @override_settings(PRESENCE_LOOKUP_MAX_USERS=1)
+    def test_presence_users_limit(self):
+        """Test that too many users in one request are rejected."""
+        self.client.force_authenticate(self.user)
+
+        response = self.client.get(
+            self.url, {"users": f"{self.friend.id},{self.stranger.id}"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_presence_invalid_users(self):
+        """Test that non-numeric users IDs are rejected."""
+        self.client.force_authenticate(self.user)
+
+        response = self.client.get(self.url, {"users": "1,abc"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def _assert_presence_schema(self, data):
+        """Validate that the response matches the expected schema."""
+        try:
+            jsonschema.validate(instance=data, schema=presence_schema)
+        except jsonschema.exceptions.ValidationError as e:
+            self.fail(f"Response does not match schema: {e}")
+
+
+class PresenceBroadcastTests(PresenceKeysMixin, TransactionTestCase):
+    async def test_chat_partner_receives_presence_changes(self):
+        """Test that chat partners receive batched presence changes."""
+        user = await database_sync_to_async(MemberFactory)()
+        friend = await database_sync_to_async(MemberFactory)()
+
+        chat = await database_sync_to_async(ChatPrivateFactory)()
+        await database_sync_to_async(ChatMemberFactory)(chat=chat, user=user)
+        await database_sync_to_async(ChatMemberFactory)(chat=chat, user=friend)
+
+        user_communicator = WebsocketCommunicator(
+            application, f"ws/chat-list/?token={AccessToken.for_user(user)}"
+        )
+        connected, _ = await user_communicator.connect()
+        self.assertTrue(connected)
+
+        friend_communicator = WebsocketCommunicator(
+            application, f"ws/chat-list/?token={AccessToken.for_user(friend)}"
+        )
+        connected, _ = await friend_communicator.connect()
+        self.assertTrue(connected)
+        await friend_communicator.send_json_to({"type": "heartbeat"})
+
+        await database_sync_to_async(broadcast_presence_changes_task)()
+
+        response = await user_communicator.receive_json_from()
+        self._assert_presence_changed_event_schema(response)
+        self.assertEqual(
+            [(item["user"], item["online"]) for item in response["users"]],
+            [(friend.id, True)],
+        )
+
+        response = await friend_communicator.receive_json_from()
+        self.assertEqual(
+            [(item["user"], item["online"]) for item in response["users"]],
+            [(user.id, True)],
+        )
+
+        await friend_communicator.disconnect()
+        await database_sync_to_async(broadcast_presence_changes_task)()
+
+        response = await user_communicator.receive_json_from()
+        self.assertEqual(response["users"][0]["user"], friend.id)
+        self.assertFalse(response["users"][0]["online"])
+        self.assertIsNotNone(response["users"][0]["last_seen"])
+
+        await user_communicator.disconnect()
+
+    def _assert_presence_changed_event_schema(self, data):
+        """Validate that the response matches the expected schema."""
+        try:
+            jsonschema.validate(instance=data, schema=presence_changed_event_schema)
+        except jsonschema.exceptions.ValidationError as e:
+            self.fail(f"Response does not match schema: {e}")
@@ -2,7 +2,13 @@ from django.urls.conf import path, include
 
 from rest_framework.routers import DefaultRouter
 
-from chats.views import ChatListCreateView, ChatMessageView, ChatMessageListView
+from chats.views import (
+    ChatListCreateView,
+    ChatMessageView,
+    ChatMessageListView,
+    ChatMessageSearchView,
+    PresenceListView,
+)
 
 router = DefaultRouter()
 router.register("messages", ChatMessageView, basename="chat-message")
@@ -18,5 +24,11 @@ urlpatterns = [
         ChatMessageListView.as_view(),
         name="chat-messages-list",
     ),
+    path(
+        "chats/messages/search/",
+        ChatMessageSearchView.as_view(),
+        name="chat-messages-search",
+    ),
+    path("presence/", PresenceListView.as_view(), name="presence-list"),
     path("", include(router.urls)),
 ]
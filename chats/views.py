@@ -1,5 +1,10 @@
+from django_filters.rest_framework import DjangoFilterBackend
+from drf_spectacular.utils import extend_schema
 from rest_framework import generics, mixins, viewsets
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
+from chats.filters import ChatMessageSearchFilter
 from chats.models import Chat, ChatMessage
 from chats.permissions import IsChatMessageOwner, IsChatMember
 from chats.serializers.chat import (
@@ -8,8 +13,13 @@ from chats.serializers.chat import (
     ChatMessageCreateSerializer,
     ChatMessageUpdateSerializer,
     ChatMessageSerializer,
+    ChatMessageSearchResultSerializer,
 )
+from chats.serializers.presence import PresenceQuerySerializer, PresenceSerializer
 from chats.services.chat import ChatService
+from chats.services.chat_message import ChatMessageService
+from chats.services.presence import PresenceService
+from nevroth.db.replica import ReadReplicaMixin
 
 
 class ChatListCreateView(generics.ListCreateAPIView):
@@ -26,13 +36,31 @@ class ChatListCreateView(generics.ListCreateAPIView):
         return ChatService.get_user_chats(self.request.user)
 
 
-class ChatMessageListView(generics.ListAPIView):
+class ChatMessageListView(ReadReplicaMixin, generics.ListAPIView):
     serializer_class = ChatMessageSerializer
     permission_classes = [IsChatMember]
 
     def get_queryset(self):
         chat_id = self.kwargs.get("id")
-        return ChatMessage.objects.filter(chat_id=chat_id).order_by("-created_at")
+        return (
+            ChatMessage.objects.filter(chat_id=chat_id)
+            .select_related("sender")
+            .order_by("-created_at")
+        )
+
+
+class ChatMessageSearchView(generics.ListAPIView):
+    serializer_class = ChatMessageSearchResultSerializer
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = ChatMessageSearchFilter
+
+    def get_queryset(self):
+        if getattr(self, "swagger_fake_view", False):
+            return ChatMessage.objects.none()
+
+        return ChatMessageService.get_user_messages(self.request.user).select_related(
+            "sender"
+        )
 
 
 class ChatMessageView(
@@ -58,3 +86,25 @@ class ChatMessageView(
             return ChatMessageCreateSerializer
 
         return ChatMessageUpdateSerializer
+
+
+class PresenceListView(APIView):
+    @extend_schema(
+        parameters=[PresenceQuerySerializer],
+        responses=PresenceSerializer(many=True),
+        description="Get online status of users sharing a chat with the caller",
+    )
+    def get(self, request):
+        serializer = PresenceQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        partners_ids = ChatService.get_chat_partners_ids([request.user.id])
+        users_ids = [
+            user_id
+            for user_id in serializer.validated_data["users"]
+            if user_id in partners_ids
+        ]
+
+        return Response(
+            PresenceSerializer(PresenceService.get_presence(users_ids), many=True).data
+        )
@@ -1,4 +1,14 @@
 #!/bin/bash
 set -e
-python /app/manage.py migrate
-daphne -b 0.0.0.0 -p 8000 nevroth.asgi:application
\ No newline at end of file
+# Migrations are applied once per release (the migrate service in
+# docker-compose), not on every boot of a serving container.
+if [ "$ASGI_SERVER" = "gunicorn" ]; then
+  exec gunicorn -c /app/gunicorn.conf.py
+fi
+
+# Metrics files of previous runs would be merged into the current ones.
+if [ -n "$PROMETHEUS_MULTIPROC_DIR" ]; then
+  rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+  mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+exec daphne -b 0.0.0.0 -p 8000 nevroth.asgi:application
\ No newline at end of file
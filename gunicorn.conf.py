@@ -0,0 +1,46 @@
+"""
+Gunicorn configuration of the production ASGI serving mode.
+
+Workers, threads and the kind of traffic served come from Django settings,
+see ASGI_* in nevroth/settings.py. `kill -HUP` on the master restarts the
+workers gracefully.
+"""
+
+import os
+import shutil
+
+from django.conf import settings
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "nevroth.settings")
+
+ASGI_APPLICATIONS = {
+    "all": "nevroth.asgi:application",
+    "http": "nevroth.asgi:http_application",
+    "websocket": "nevroth.asgi:websocket_application",
+}
+
+# Every worker is a separate process, so metrics are aggregated through files.
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus-asgi")
+
+wsgi_app = ASGI_APPLICATIONS[settings.ASGI_SERVE]
+worker_class = "nevroth.workers.ASGIWorker"
+bind = os.environ.get("ASGI_BIND", "0.0.0.0:8000")
+workers = settings.ASGI_WORKERS
+threads = settings.ASGI_THREADS
+graceful_timeout = settings.ASGI_GRACEFUL_TIMEOUT_SECONDS
+max_requests = settings.ASGI_MAX_REQUESTS
+max_requests_jitter = max_requests // 10
+keepalive = 5
+accesslog = "-"
+
+
+def on_starting(server):
+    # Metrics files of previous runs would be merged into the current ones.
+    shutil.rmtree(os.environ["PROMETHEUS_MULTIPROC_DIR"], ignore_errors=True)
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"])
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+
+def set_selected_at_registration(apps, schema_editor):
+    # Existing selections keep every broadcast since the user registered.
+    UserHabit = apps.get_model("habits", "UserHabit")
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+
+    UserHabit.objects.update(
+        created_at=Subquery(
+            User.objects.filter(pk=OuterRef("user_id")).values("created_at")[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("habits", "0005_habitprogress_habits_habi_user_id_a6243a_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userhabit",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, default=timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(set_selected_at_registration, migrations.RunPython.noop),
+    ]
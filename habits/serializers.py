@@ -1,5 +1,6 @@
 from datetime import datetime
 
+from django.db import transaction
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
 
@@ -9,6 +10,7 @@ from habits import models
 from habits.constants import REQUIRED_HABITS_COUNT, HABIT_FAIL_UPDATE_TIMEOUT_SECONDS
 from habits.models import Habit, UserHabit, HabitProgress
 from habits.services.calculate_streak import CalculateStreakService
+from notifications.services.notification import NotificationService
 
 
 class HabitSerializer(serializers.ModelSerializer):
@@ -23,16 +25,25 @@ class UserHabitsUpdateSerializer(serializers.Serializer):
         allow_empty=False,
     )
 
+    @transaction.atomic
     def save(self, **kwargs):
         user = self.context["request"].user
         habit_ids = self.validated_data["habits_ids"]
 
-        # Remove previous habits
-        UserHabit.objects.filter(user=user).delete()
+        # Kept habits aren't recreated, as they get broadcasts since selected.
+        current_ids = set(
+            UserHabit.objects.filter(user=user).values_list("habit_id", flat=True)
+        )
+        removed_ids = list(current_ids - set(habit_ids))
+        if removed_ids:
+            NotificationService.keep_received_broadcasts(user, removed_ids)
+            UserHabit.objects.filter(user=user, habit_id__in=removed_ids).delete()
 
         # Add new ones
         new_user_habits = [
-            UserHabit(user=user, habit_id=habit_id) for habit_id in habit_ids
+            UserHabit(user=user, habit_id=habit_id)
+            for habit_id in habit_ids
+            if habit_id not in current_ids
         ]
         UserHabit.objects.bulk_create(new_user_habits)
 
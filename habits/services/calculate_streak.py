@@ -24,17 +24,23 @@ class CalculateStreakService:
     def calculate_current_streak(cls, user_id: int, habit_id: int):
         """Calculate current streak of habit progress"""
         today = timezone.now().date()
-        streak = 0
-        day = today
+        success_dates = (
+            HabitProgress.objects.filter(
+                user__id=user_id,
+                habit__id=habit_id,
+                date__lte=today,
+                status=HabitProgress.Status.SUCCESS,
+            )
+            .order_by("-date")
+            .values_list("date", flat=True)
+        )
 
-        while True:
-            if HabitProgress.objects.filter(
-                user__id=user_id, habit__id=habit_id, date=day, status="success"
-            ).exists():
-                streak += 1
-                day -= timedelta(days=1)
-            else:
+        # Dates are unique per habit, so the streak ends at the first gap.
+        streak = 0
+        for date in success_dates.iterator():
+            if date != today - timedelta(days=streak):
                 break
+            streak += 1
 
         return streak
 
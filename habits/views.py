@@ -22,6 +22,7 @@ from habits.serializers import (
     HabitProgressSerializer,
     HabitStreaksSerializer,
 )
+from nevroth.db.replica import ReadReplicaMixin
 
 
 @method_decorator(cache_page(60 * 5, key_prefix="habits-list"), name="list")
@@ -53,7 +54,7 @@ class HabitViewSet(viewsets.ModelViewSet):
         return Response(result, status=status.HTTP_200_OK)
 
 
-class HabitProgressViewSet(generics.ListCreateAPIView):
+class HabitProgressViewSet(ReadReplicaMixin, generics.ListCreateAPIView):
     serializer_class = HabitProgressSerializer
     filter_backends = [DjangoFilterBackend]
     filterset_class = HabitProgressFilter
@@ -0,0 +1,24 @@
+import asyncio
+
+
+class ConcurrencyLimitMiddleware:
+    """
+    ASGI middleware limiting the requests the application handles at once.
+
+    Django runs the sync code of every request in a thread of its own, so the
+    threads, and the database connections they hold, are only bounded by the
+    requests in flight. Requests over the limit wait in the event loop.
+    """
+
+    def __init__(self, app, limit: int):
+        self.app = app
+        self.limit = limit
+        self._semaphore = None
+
+    async def __call__(self, scope, receive, send):
+        # Created lazily, as the semaphore belongs to the worker's event loop.
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.limit)
+
+        async with self._semaphore:
+            await self.app(scope, receive, send)
@@ -1,3 +1,4 @@
+from asgiref.sync import sync_to_async
 from channels.db import database_sync_to_async
 from channels.middleware import BaseMiddleware
 
@@ -7,8 +8,17 @@ from django.contrib.auth import get_user_model
 from rest_framework_simplejwt.tokens import AccessToken
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 
+import time
 from urllib.parse import parse_qs
 
+from accounts.services.ws_ticket import WebSocketTicketService
+from chats.metrics import (
+    CHAT_DB_THREAD_QUEUE_DEPTH,
+    CHAT_WS_AUTH_DURATION,
+    CHAT_WS_CONNECT_DURATION,
+    get_db_thread_queue_depth,
+)
+
 User = get_user_model()
 
 
@@ -17,19 +27,65 @@ class JWTAuthMiddleware(BaseMiddleware):
         self.app = app
 
     async def __call__(self, scope, receive, send):
+        started_at = time.perf_counter()
+        ticket = self.get_ticket_from_scope(scope)
         token = self.get_token_from_scope(scope)
 
-        if token:
+        if ticket:
+            method = "ticket"
+            scope["user"] = await self.get_user_from_ticket(ticket)
+        elif token:
+            method = "token"
+            queue_depth = get_db_thread_queue_depth()
+            if queue_depth is not None:
+                CHAT_DB_THREAD_QUEUE_DEPTH.observe(queue_depth)
             user = await self.get_user_from_token(token)
             scope["user"] = user
         else:
+            method = "anonymous"
             scope["user"] = AnonymousUser()
 
-        return await self.app(scope, receive, send)
+        CHAT_WS_AUTH_DURATION.labels(method).observe(time.perf_counter() - started_at)
 
-    def get_token_from_scope(self, scope):
+        return await self.app(scope, receive, self.observe_connect(send, started_at))
+
+    @staticmethod
+    def observe_connect(send, started_at):
+        """Wrap `send` to observe how long the handshake took to be answered"""
+        answered = False
+
+        async def observed_send(message):
+            nonlocal answered
+            if not answered and message["type"] in (
+                "websocket.accept",
+                "websocket.close",
+            ):
+                answered = True
+                outcome = (
+                    "accepted" if message["type"] == "websocket.accept" else "rejected"
+                )
+                CHAT_WS_CONNECT_DURATION.labels(outcome).observe(
+                    time.perf_counter() - started_at
+                )
+
+            await send(message)
+
+        return observed_send
+
+    def get_query_params(self, scope):
         query_string = scope.get("query_string", b"").decode("utf-8")
-        query_params = parse_qs(query_string)
+        return parse_qs(query_string)
+
+    def get_ticket_from_scope(self, scope):
+        query_params = self.get_query_params(scope)
+
+        if "ticket" in query_params:
+            return query_params["ticket"][0]
+
+        return None
+
+    def get_token_from_scope(self, scope):
+        query_params = self.get_query_params(scope)
 
         if "token" in query_params:
             return query_params["token"][0]
@@ -42,6 +98,11 @@ class JWTAuthMiddleware(BaseMiddleware):
 
         return None
 
+    @sync_to_async
+    def get_user_from_ticket(self, ticket):
+        # Only Redis is queried, the user is built from the ticket's card.
+        return WebSocketTicketService.redeem_ticket(ticket) or AnonymousUser()
+
     @database_sync_to_async
     def get_user_from_token(self, token):
         try:
@@ -0,0 +1,65 @@
+import time
+from contextlib import ExitStack
+
+from django.db import connections
+
+from nevroth.metrics import (
+    DB_QUERIES_PER_REQUEST,
+    DB_QUERY_DURATION_PER_REQUEST,
+    HTTP_REQUEST_DURATION,
+)
+
+UNMATCHED_ROUTE = "<unmatched>"
+KNOWN_METHODS = {"GET", "HEAD", "OPTIONS", "POST", "PUT", "PATCH", "DELETE"}
+
+
+class QueryObserver:
+    """Database execute wrapper counting queries and the time spent in them"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+
+
+class PrometheusMetricsMiddleware:
+    """
+    Observe latency and database usage of HTTP requests.
+
+    Requests are labeled by the name of their URL pattern rather than the path,
+    which keeps the number of time series bounded.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        observer = QueryObserver()
+        start = time.perf_counter()
+
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(observer))
+            response = self.get_response(request)
+
+        route = self.get_route(request)
+        method = request.method if request.method in KNOWN_METHODS else "OTHER"
+        HTTP_REQUEST_DURATION.labels(method, route, response.status_code).observe(
+            time.perf_counter() - start
+        )
+        DB_QUERIES_PER_REQUEST.labels(route).observe(observer.count)
+        DB_QUERY_DURATION_PER_REQUEST.labels(route).observe(observer.duration)
+
+        return response
+
+    @staticmethod
+    def get_route(request) -> str:
+        match = getattr(request, "resolver_match", None)
+        return match.view_name if match else UNMATCHED_ROUTE
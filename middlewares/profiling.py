@@ -0,0 +1,55 @@
+import random
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from redis import RedisError
+
+from nevroth.profiling import PROFILING_HEADER, ProfileService, profile_call
+
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+
+class SamplingProfilerMiddleware:
+    """
+    Profile requests carrying a signed profiling header or picked by sampling.
+
+    Other requests go straight to the next middleware, and the middleware is
+    left out of the chain altogether while profiling is disabled.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+
+    def __call__(self, request):
+        reason = self.get_reason(request)
+        if reason is None:
+            return self.get_response(request)
+
+        response, profiler, duration = profile_call(
+            lambda: self.get_response(request),
+            interval=settings.PROFILING_INTERVAL_MS / 1000,
+        )
+
+        try:
+            profile = ProfileService.save(request, profiler, duration, reason)
+        except RedisError:
+            # Profiling is best effort, so it doesn't fail the request.
+            return response
+
+        response[PROFILE_ID_HEADER] = profile["id"]
+        return response
+
+    @staticmethod
+    def get_reason(request) -> str | None:
+        token = request.headers.get(PROFILING_HEADER)
+        if token is not None and ProfileService.is_valid_token(token):
+            return "header"
+
+        rate = settings.PROFILING_SAMPLE_RATE
+        if rate and random.random() < rate:
+            return "sampled"
+
+        return None
@@ -0,0 +1,32 @@
+from django.conf import settings
+from redis import RedisError
+from rest_framework.permissions import SAFE_METHODS
+
+from nevroth.db.replica import ReplicaStickinessService
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Keep users on the primary for a short window after their successful writes.
+
+    The user is read after the view, as DRF views authenticate it themselves.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            settings.READ_REPLICA_ENABLED
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400
+        ):
+            user = getattr(request, "user", None)
+            if user is not None and user.is_authenticated:
+                try:
+                    ReplicaStickinessService.mark_write(user.id)
+                except RedisError:
+                    pass
+
+        return response
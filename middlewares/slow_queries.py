@@ -0,0 +1,24 @@
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from nevroth.slow_queries import SlowQueryRecorder
+
+
+class SlowQueryCaptureMiddleware:
+    """Record slow queries made while handling requests, see SlowQueryRecorder"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.SLOW_QUERY_CAPTURE_ENABLED:
+            return self.get_response(request)
+
+        recorder = SlowQueryRecorder(request)
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+
+            return self.get_response(request)
@@ -0,0 +1,48 @@
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from middlewares.metrics import PrometheusMetricsMiddleware, QueryObserver
+from nevroth.tracing import TRACEPARENT_KEY, extract, start_span
+
+TRACE_ID_HEADER = "X-Trace-Id"
+
+
+class TracingMiddleware:
+    """
+    Trace HTTP requests, continuing the trace of an incoming traceparent header.
+
+    The request span is current while the view runs, so spans of signals,
+    services, group sends and published tasks become its children.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.TRACING_ENABLED:
+            return self.get_response(request)
+
+        with start_span(
+            "http.request",
+            parent=extract({TRACEPARENT_KEY: request.headers.get(TRACEPARENT_KEY)}),
+            new_trace=True,
+            **{"http.method": request.method},
+        ) as span:
+            if span is None:
+                return self.get_response(request)
+
+            observer = QueryObserver()
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(observer))
+                response = self.get_response(request)
+
+            span.name = f"http {PrometheusMetricsMiddleware.get_route(request)}"
+            span.set_attribute("http.status_code", response.status_code)
+            span.set_attribute("db.queries", observer.count)
+            span.set_attribute("db.duration_ms", round(observer.duration * 1000, 3))
+
+        response[TRACE_ID_HEADER] = span.context.trace_id
+        return response
@@ -15,17 +15,26 @@ import os
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "nevroth.settings")
 django.setup()
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 from channels.routing import ProtocolTypeRouter, URLRouter
 
 from chats.routing import websocket_urlpatterns
+from middlewares.concurrency import ConcurrencyLimitMiddleware
 from middlewares.jwt_auth import JWTAuthMiddleware
 
-django_asgi_app = get_asgi_application()
+django_asgi_app = ConcurrencyLimitMiddleware(
+    get_asgi_application(), settings.ASGI_THREADS
+)
+websocket_asgi_app = JWTAuthMiddleware(URLRouter(websocket_urlpatterns))
 
 application = ProtocolTypeRouter(
     {
         "http": django_asgi_app,
-        "websocket": JWTAuthMiddleware(URLRouter(websocket_urlpatterns)),
+        "websocket": websocket_asgi_app,
     }
 )
+
+# Applications serving only one kind of traffic, for separate worker pools.
+http_application = ProtocolTypeRouter({"http": django_asgi_app})
+websocket_application = ProtocolTypeRouter({"websocket": websocket_asgi_app})
@@ -0,0 +1,26 @@
+from django_redis.client import DefaultClient
+
+from nevroth.metrics import CACHE_GETS
+
+_MISSING = object()
+
+
+class InstrumentedRedisClient(DefaultClient):
+    """Redis cache client counting hits and misses of reads"""
+
+    def get(self, key, default=None, version=None, client=None):
+        value = super().get(key, default=_MISSING, version=version, client=client)
+        if value is _MISSING:
+            CACHE_GETS.labels("miss").inc()
+            return default
+
+        CACHE_GETS.labels("hit").inc()
+        return value
+
+    def get_many(self, keys, version=None, client=None):
+        keys = list(keys)
+        values = super().get_many(keys, version=version, client=client)
+        CACHE_GETS.labels("hit").inc(len(values))
+        CACHE_GETS.labels("miss").inc(len(keys) - len(values))
+
+        return values
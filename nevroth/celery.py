@@ -2,6 +2,8 @@ import os
 
 from celery import Celery
 
+from nevroth import celery_db, celery_metrics, celery_tracing  # noqa: F401
+
 # Set the default Django settings module for the 'celery' program.
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "nevroth.settings")
 
@@ -0,0 +1,21 @@
+from celery.signals import worker_process_init
+from django.conf import settings
+from django.db import connections
+
+
+@worker_process_init.connect
+def configure_connection_pools(**kwargs):
+    # A pool inherited from the parent shares its sockets, so it's dropped
+    # without closing it and every child opens a small pool of its own.
+    for alias in connections:
+        connection = connections[alias]
+        options = connection.settings_dict["OPTIONS"]
+        if not options.get("pool"):
+            continue
+
+        connection._connection_pools.pop(alias, None)
+        options["pool"] = {
+            **options["pool"],
+            "min_size": 1,
+            "max_size": settings.WORKER_DB_POOL_MAX_SIZE,
+        }
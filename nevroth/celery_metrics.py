@@ -0,0 +1,52 @@
+import time
+
+from celery.signals import (
+    task_failure,
+    task_postrun,
+    task_prerun,
+    task_retry,
+    worker_ready,
+)
+from django.conf import settings
+from prometheus_client import start_http_server
+
+from nevroth.metrics import (
+    CELERY_TASK_DURATION,
+    CELERY_TASK_FAILURES,
+    CELERY_TASK_RETRIES,
+    get_registry,
+)
+
+# Start times of task runs in progress in this process, by task ID.
+_started_at = {}
+
+
+@task_prerun.connect
+def observe_task_start(task_id, task, **kwargs):
+    _started_at[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def observe_task_end(task_id, task, state=None, **kwargs):
+    started_at = _started_at.pop(task_id, None)
+    if started_at is not None:
+        CELERY_TASK_DURATION.labels(task.name, state or "UNKNOWN").observe(
+            time.perf_counter() - started_at
+        )
+
+
+@task_retry.connect
+def count_task_retry(sender, **kwargs):
+    CELERY_TASK_RETRIES.labels(sender.name).inc()
+
+
+@task_failure.connect
+def count_task_failure(sender, exception=None, **kwargs):
+    CELERY_TASK_FAILURES.labels(sender.name, type(exception).__name__).inc()
+
+
+@worker_ready.connect
+def start_metrics_server(sender, **kwargs):
+    # Pool processes record metrics, the main worker process serves them.
+    if settings.WORKER_METRICS_PORT:
+        start_http_server(settings.WORKER_METRICS_PORT, registry=get_registry())
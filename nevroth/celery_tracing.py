@@ -0,0 +1,38 @@
+from celery.signals import before_task_publish, task_failure, task_postrun, task_prerun
+
+from nevroth.tracing import TRACEPARENT_KEY, create_span, extract, inject
+
+# Spans of task runs in progress in this process with the tokens restoring
+# the previous current span, by task ID.
+_spans = {}
+
+
+@before_task_publish.connect
+def inject_trace_context(headers=None, **kwargs):
+    # Custom headers become attributes of the task request in the worker.
+    if headers is not None:
+        inject(headers)
+
+
+@task_prerun.connect
+def start_task_span(task_id, task, **kwargs):
+    parent = extract({TRACEPARENT_KEY: getattr(task.request, TRACEPARENT_KEY, None)})
+    span = create_span(f"celery.task {task.name}", parent=parent)
+    if span is not None:
+        _spans[task_id] = (span, span.activate())
+
+
+@task_failure.connect
+def mark_task_span_failed(task_id=None, exception=None, **kwargs):
+    span, _ = _spans.get(task_id, (None, None))
+    if span is not None and exception is not None:
+        span.set_error(exception)
+
+
+@task_postrun.connect
+def end_task_span(task_id, task, state=None, **kwargs):
+    span, token = _spans.pop(task_id, (None, None))
+    if span is not None:
+        span.set_attribute("celery.state", state or "UNKNOWN")
+        span.deactivate(token)
+        span.end()
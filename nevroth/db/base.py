@@ -0,0 +1,40 @@
+import time
+
+from django.db.backends.postgresql import base
+from psycopg_pool import PoolTimeout
+
+from nevroth.metrics import (
+    DB_POOL_AVAILABLE,
+    DB_POOL_REQUESTS_WAITING,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUTS,
+    DB_POOL_WAIT_DURATION,
+)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """PostgreSQL backend observing waits for connections of its pool"""
+
+    def get_new_connection(self, conn_params):
+        if not self.pool:
+            return super().get_new_connection(conn_params)
+
+        start = time.perf_counter()
+        try:
+            return super().get_new_connection(conn_params)
+        except PoolTimeout:
+            DB_POOL_TIMEOUTS.labels(self.alias).inc()
+            raise
+        finally:
+            DB_POOL_WAIT_DURATION.labels(self.alias).observe(
+                time.perf_counter() - start
+            )
+            self.observe_pool()
+
+    def observe_pool(self):
+        stats = self.pool.get_stats()
+        DB_POOL_SIZE.labels(self.alias).set(stats["pool_size"])
+        DB_POOL_AVAILABLE.labels(self.alias).set(stats["pool_available"])
+        DB_POOL_REQUESTS_WAITING.labels(self.alias).set(
+            stats.get("requests_waiting", 0)
+        )
@@ -0,0 +1,165 @@
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django_redis import get_redis_connection
+from redis import RedisError
+from rest_framework.permissions import SAFE_METHODS
+
+from nevroth.metrics import DB_REPLICA_FALLBACKS, DB_REPLICA_LAG
+
+PRIMARY_ALIAS = "default"
+REPLICA_ALIAS = "replica"
+
+# The lag is zero on a primary and while the replica has replayed everything
+# it received, so an idle primary doesn't make the replica look behind. A
+# replica that isn't streaming from the primary may have received nothing for
+# a long time, so its lag is unknown (NULL). Reading the receiver's status
+# needs the pg_read_all_stats role.
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (
+            SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming'
+        ) THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+_read_alias = ContextVar("read_alias", default=None)
+
+
+class ReplicaStickinessService:
+    """
+    Service to keep users who just wrote on the primary.
+
+    A write marks its user in Redis for a short window, during which their
+    reads skip the replica, so they see their own writes despite the lag.
+    """
+
+    @classmethod
+    def _key(cls, user_id: int) -> str:
+        return f"{settings.REPLICA_STICKY_KEY_PREFIX}:{user_id}"
+
+    @classmethod
+    def _get_connection(cls):
+        return get_redis_connection("default")
+
+    @classmethod
+    def mark_write(cls, user_id: int):
+        cls._get_connection().set(
+            cls._key(user_id), 1, ex=settings.REPLICA_STICKY_SECONDS
+        )
+
+    @classmethod
+    def is_sticky(cls, user_id: int) -> bool:
+        return bool(cls._get_connection().exists(cls._key(user_id)))
+
+
+class ReplicaLagService:
+    """Service to check the replica's lag, at most once per interval in a process"""
+
+    _lag = None
+    _checked_at = None
+
+    @classmethod
+    def get_lag(cls) -> float | None:
+        """Return the replica's lag in seconds, or None when it's unreachable"""
+        now = time.monotonic()
+        if (
+            cls._checked_at is None
+            or now - cls._checked_at >= settings.REPLICA_LAG_CHECK_INTERVAL_SECONDS
+        ):
+            cls._lag = cls.check_lag()
+            cls._checked_at = now
+
+        return cls._lag
+
+    @classmethod
+    def check_lag(cls) -> float | None:
+        try:
+            with connections[REPLICA_ALIAS].cursor() as cursor:
+                cursor.execute(REPLICA_LAG_SQL)
+                lag = cursor.fetchone()[0]
+        except DatabaseError:
+            return None
+
+        # An unknown lag counts as lagging too far behind.
+        lag = float("inf") if lag is None else float(lag)
+
+        DB_REPLICA_LAG.set(lag)
+        return lag
+
+    @classmethod
+    def reset(cls):
+        cls._lag = None
+        cls._checked_at = None
+
+
+def get_read_alias(request) -> str | None:
+    """
+    Return the replica alias when the request can be served from it.
+
+    Only safe requests read from the replica, and only while their user has
+    no recent writes and the replica doesn't lag too far behind.
+    """
+    if not settings.READ_REPLICA_ENABLED or request.method not in SAFE_METHODS:
+        return None
+
+    user = request.user
+    if user.is_authenticated:
+        try:
+            sticky = ReplicaStickinessService.is_sticky(user.id)
+        except RedisError:
+            sticky = True
+        if sticky:
+            DB_REPLICA_FALLBACKS.labels("sticky").inc()
+            return None
+
+    lag = ReplicaLagService.get_lag()
+    if lag is None or lag > settings.REPLICA_MAX_LAG_SECONDS:
+        DB_REPLICA_FALLBACKS.labels("lag").inc()
+        return None
+
+    return REPLICA_ALIAS
+
+
+class ReadReplicaMixin:
+    """
+    Serve safe requests of a view from the read replica, see get_read_alias.
+
+    The replica is used once the request is authenticated and permitted, so
+    permission checks still read from the primary.
+    """
+
+    _read_alias_token = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._read_alias_token = _read_alias.set(get_read_alias(request))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if self._read_alias_token is not None:
+            _read_alias.reset(self._read_alias_token)
+            self._read_alias_token = None
+
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class ReadReplicaRouter:
+    """Route reads of views using ReadReplicaMixin to the replica"""
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same data as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db == PRIMARY_ALIAS
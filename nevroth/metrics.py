@@ -0,0 +1,103 @@
+import os
+
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+    multiprocess,
+)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Duration of HTTP requests by route",
+    ["method", "route", "status"],
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "Number of database queries made by an HTTP request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 200),
+)
+DB_QUERY_DURATION_PER_REQUEST = Histogram(
+    "db_query_duration_per_request_seconds",
+    "Total time spent in database queries by an HTTP request",
+    ["route"],
+)
+DB_POOL_WAIT_DURATION = Histogram(
+    "db_pool_wait_duration_seconds",
+    "Time spent waiting for a connection from the pool by database alias",
+    ["alias"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts_total",
+    "Requests for a pooled connection that timed out by database alias",
+    ["alias"],
+)
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Connections opened by the pool by database alias",
+    ["alias"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_AVAILABLE = Gauge(
+    "db_pool_available",
+    "Idle connections in the pool by database alias",
+    ["alias"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_REQUESTS_WAITING = Gauge(
+    "db_pool_requests_waiting",
+    "Requests waiting for a pooled connection by database alias",
+    ["alias"],
+    multiprocess_mode="livesum",
+)
+DB_REPLICA_LAG = Gauge(
+    "db_replica_lag_seconds",
+    "Replication lag of the read replica at its last check",
+    multiprocess_mode="max",
+)
+DB_REPLICA_FALLBACKS = Counter(
+    "db_replica_fallbacks_total",
+    "Reads of replica views served from the primary by reason",
+    ["reason"],
+)
+CACHE_GETS = Counter(
+    "cache_gets_total",
+    "Keys read from the cache by result",
+    ["result"],
+)
+
+
+CELERY_TASK_DURATION = Histogram(
+    "celery_task_duration_seconds",
+    "Duration of Celery task runs by task and final state",
+    ["task", "state"],
+)
+CELERY_TASK_RETRIES = Counter(
+    "celery_task_retries_total",
+    "Celery task runs that were scheduled to be retried",
+    ["task"],
+)
+CELERY_TASK_FAILURES = Counter(
+    "celery_task_failures_total",
+    "Celery task runs that failed",
+    ["task", "exception"],
+)
+
+
+def get_registry():
+    """Return a registry of this process, or of all processes in multiprocess mode"""
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def generate_metrics() -> bytes:
+    return generate_latest(get_registry())
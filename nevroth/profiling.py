@@ -0,0 +1,143 @@
+import json
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core import signing
+from django_redis import get_redis_connection
+
+PROFILING_HEADER = "X-Profile"
+PROFILING_TOKEN_SALT = "nevroth.profiling"
+
+
+class SamplingProfiler:
+    """
+    Sample the call stack of one thread from a background thread.
+
+    The profiled thread isn't instrumented, so it only pays for the GIL handed
+    to the sampler once per interval. Samples are aggregated into the folded
+    stacks format read by flame graph tools like speedscope.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+
+    @property
+    def samples(self) -> int:
+        return sum(self.stacks.values())
+
+    def to_folded(self) -> str:
+        return "\n".join(
+            f"{stack} {count}" for stack, count in self.stacks.most_common()
+        )
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[self._format_stack(frame)] += 1
+
+    @staticmethod
+    def _format_stack(frame) -> str:
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            module = frame.f_globals.get("__name__", "?")
+            names.append(f"{module}.{code.co_qualname}:{frame.f_lineno}")
+            frame = frame.f_back
+
+        return ";".join(reversed(names))
+
+
+class ProfileService:
+    """Service to keep the latest request profiles in a capped Redis list"""
+
+    @classmethod
+    def _get_connection(cls):
+        return get_redis_connection("default")
+
+    @classmethod
+    def make_token(cls) -> str:
+        return signing.TimestampSigner(salt=PROFILING_TOKEN_SALT).sign(uuid.uuid4().hex)
+
+    @classmethod
+    def is_valid_token(cls, token: str) -> bool:
+        try:
+            signing.TimestampSigner(salt=PROFILING_TOKEN_SALT).unsign(
+                token, max_age=settings.PROFILING_TOKEN_MAX_AGE_SECONDS
+            )
+        except signing.BadSignature:
+            return False
+
+        return True
+
+    @classmethod
+    def save(cls, request, profiler: SamplingProfiler, duration: float, reason: str):
+        match = getattr(request, "resolver_match", None)
+        profile = {
+            "id": uuid.uuid4().hex,
+            "method": request.method,
+            "path": request.path,
+            "view": match.view_name if match else None,
+            "reason": reason,
+            "duration_ms": round(duration * 1000, 3),
+            "samples": profiler.samples,
+            "interval_ms": settings.PROFILING_INTERVAL_MS,
+            "created_at": datetime.now(dt_timezone.utc).isoformat(),
+            "stacks": profiler.to_folded(),
+        }
+
+        pipeline = cls._get_connection().pipeline()
+        pipeline.lpush(settings.PROFILING_KEY, json.dumps(profile))
+        pipeline.ltrim(settings.PROFILING_KEY, 0, settings.PROFILING_MAX_PROFILES - 1)
+        pipeline.execute()
+
+        return profile
+
+    @classmethod
+    def get_profiles(cls) -> list[dict]:
+        """Return stored profiles from the newest"""
+        return [
+            json.loads(profile)
+            for profile in cls._get_connection().lrange(settings.PROFILING_KEY, 0, -1)
+        ]
+
+    @classmethod
+    def get_profile(cls, profile_id: str) -> dict | None:
+        return next(
+            (profile for profile in cls.get_profiles() if profile["id"] == profile_id),
+            None,
+        )
+
+    @classmethod
+    def clear(cls):
+        cls._get_connection().delete(settings.PROFILING_KEY)
+
+
+def profile_call(func, interval: float):
+    """Call func under a sampling profiler, returning its result, profiler and duration"""
+    profiler = SamplingProfiler(threading.get_ident(), interval)
+    profiler.start()
+    start = time.perf_counter()
+    try:
+        result = func()
+    finally:
+        duration = time.perf_counter() - start
+        profiler.stop()
+
+    return result, profiler, duration
@@ -0,0 +1,85 @@
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from django.conf import settings
+from django.db.models import QuerySet
+from prometheus_client import Counter, Gauge
+
+RETENTION_DELETED_ROWS = Counter(
+    "retention_deleted_rows_total",
+    "Rows deleted by retention policies",
+    ["policy"],
+)
+RETENTION_BATCHES = Counter(
+    "retention_batches_total",
+    "Delete batches run by retention policies",
+    ["policy"],
+)
+RETENTION_LAST_SUCCESS = Gauge(
+    "retention_last_success_timestamp_seconds",
+    "Moment when a retention policy last purged all of its expired rows",
+    ["policy"],
+    multiprocess_mode="max",
+)
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """
+    Named rule selecting expired rows; the queryset is built on every run.
+
+    after_delete is called with the rows of every deleted batch, loaded before
+    the batch was deleted, for cleanup outside the database.
+    """
+
+    name: str
+    get_queryset: Callable[[], QuerySet]
+    after_delete: Callable[[list], None] | None = None
+
+
+class RetentionService:
+    """
+    Service to purge expired rows in small batches.
+
+    Rows are walked in primary key order and every batch is deleted in its own
+    short statement, followed by a pause. That bounds lock time and lets
+    autovacuum keep up, unlike deleting everything in one statement.
+    """
+
+    @classmethod
+    def purge(cls, policy: RetentionPolicy) -> int:
+        """Delete all rows expired according to the policy; returns their number"""
+        batch_size = settings.RETENTION_BATCH_SIZE
+        deleted = 0
+        last_pk = None
+
+        while True:
+            queryset = policy.get_queryset()
+            if last_pk is not None:
+                queryset = queryset.filter(pk__gt=last_pk)
+            pks = list(
+                queryset.order_by("pk").values_list("pk", flat=True)[:batch_size]
+            )
+            if not pks:
+                break
+
+            # Rows are checked again, in case they stopped being expired meanwhile.
+            batch = policy.get_queryset().filter(pk__in=pks)
+            rows = list(batch) if policy.after_delete else None
+            batch_deleted, _ = batch.delete()
+            deleted += batch_deleted
+            if policy.after_delete:
+                policy.after_delete(rows)
+            last_pk = pks[-1]
+
+            RETENTION_BATCHES.labels(policy.name).inc()
+            RETENTION_DELETED_ROWS.labels(policy.name).inc(batch_deleted)
+
+            if len(pks) < batch_size:
+                break
+            time.sleep(settings.RETENTION_BATCH_SLEEP_SECONDS)
+
+        RETENTION_LAST_SUCCESS.labels(policy.name).set_to_current_time()
+
+        return deleted
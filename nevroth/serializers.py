@@ -0,0 +1,36 @@
+from rest_framework import serializers
+
+
+class SlowQueryFingerprintsQuerySerializer(serializers.Serializer):
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+
+
+class SlowQueryFingerprintSerializer(serializers.Serializer):
+    fingerprint = serializers.CharField()
+    sql = serializers.CharField()
+    count = serializers.IntegerField()
+    total_ms = serializers.FloatField()
+    mean_ms = serializers.FloatField()
+    max_ms = serializers.FloatField()
+    views = serializers.ListField(child=serializers.CharField())
+    last_params = serializers.ListField(child=serializers.CharField())
+    last_plan = serializers.JSONField(allow_null=True)
+    last_recorded_at = serializers.DateTimeField()
+
+
+class ProfileSerializer(serializers.Serializer):
+    id = serializers.CharField()
+    method = serializers.CharField()
+    path = serializers.CharField()
+    view = serializers.CharField(allow_null=True)
+    reason = serializers.ChoiceField(choices=["header", "sampled"])
+    duration_ms = serializers.FloatField()
+    samples = serializers.IntegerField()
+    interval_ms = serializers.IntegerField()
+    created_at = serializers.DateTimeField()
+
+
+class ProfilingTokenSerializer(serializers.Serializer):
+    header = serializers.CharField()
+    token = serializers.CharField()
+    expires_in = serializers.IntegerField()
@@ -50,9 +50,15 @@ INSTALLED_APPS = [
     "habits",
     "friends",
     "notifications",
+    "benchmarks",
 ]
 
 MIDDLEWARE = [
+    "middlewares.tracing.TracingMiddleware",
+    "middlewares.metrics.PrometheusMetricsMiddleware",
+    "middlewares.slow_queries.SlowQueryCaptureMiddleware",
+    "middlewares.profiling.SamplingProfilerMiddleware",
+    "middlewares.replica.ReplicaStickinessMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -81,23 +87,80 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "nevroth.wsgi.application"
 
+# Production serving runs gunicorn with uvicorn workers, see gunicorn.conf.py.
+# ASGI_SERVE picks the traffic of the workers: "all", "http" or "websocket",
+# so HTTP and websockets can be served by separate pools. Django runs every
+# HTTP request in a thread of its own, so a process handles at most
+# ASGI_THREADS of them at once and the rest wait; the same number sizes the
+# executor of calls that aren't thread sensitive.
+ASGI_WORKERS = int(os.environ.get("ASGI_WORKERS", os.cpu_count() or 1))
+ASGI_THREADS = int(os.environ.get("ASGI_THREADS", 32))
+ASGI_SERVE = os.environ.get("ASGI_SERVE", "all")
+ASGI_GRACEFUL_TIMEOUT_SECONDS = 30
+# Workers are restarted after this many requests, 0 keeps them running
+ASGI_MAX_REQUESTS = int(os.environ.get("ASGI_MAX_REQUESTS", 0))
+
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Every process has its own connection pool. A request or a
+# database_sync_to_async call holds a connection until it ends. A serving
+# worker handles at most ASGI_THREADS requests at once, and consumers' calls
+# share one more thread, so the default pool never runs out; with a smaller
+# one, requests over it wait DB_POOL_TIMEOUT_SECONDS and then fail. Celery's
+# prefork children run one task at a time and use WORKER_DB_POOL_MAX_SIZE.
+DB_POOL_MIN_SIZE = int(os.environ.get("DB_POOL_MIN_SIZE", 2))
+DB_POOL_MAX_SIZE = int(os.environ.get("DB_POOL_MAX_SIZE", ASGI_THREADS + 1))
+DB_POOL_TIMEOUT_SECONDS = float(os.environ.get("DB_POOL_TIMEOUT_SECONDS", 10))
+WORKER_DB_POOL_MAX_SIZE = 2
+
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql",
+        "ENGINE": "nevroth.db",
         "NAME": os.environ.get("DB_NAME", "nevroth_db"),
         "USER": os.environ.get("DB_USER", "postgres"),
         "PASSWORD": os.environ.get("DB_PASS", "password"),
         "HOST": os.environ.get("DB_HOST", "localhost"),
         "PORT": "5432",
+        # Pooled connections are checked before they're handed out.
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "pool": {
+                "min_size": DB_POOL_MIN_SIZE,
+                "max_size": DB_POOL_MAX_SIZE,
+                "timeout": DB_POOL_TIMEOUT_SECONDS,
+                # Idle connections over min_size are closed, and every
+                # connection is replaced after an hour.
+                "max_idle": 300,
+                "max_lifetime": 3600,
+            },
+        },
     },
 }
 
+# Reads of views using nevroth.db.replica.ReadReplicaMixin go to a streaming
+# replica when DB_REPLICA_HOST is set. A user's reads stay on the primary for
+# REPLICA_STICKY_SECONDS after their writes, and every read does while the
+# replica lags more than REPLICA_MAX_LAG_SECONDS, checked once per interval.
+DB_REPLICA_HOST = os.environ.get("DB_REPLICA_HOST")
+READ_REPLICA_ENABLED = DB_REPLICA_HOST is not None and not TESTING
+REPLICA_STICKY_SECONDS = 5
+REPLICA_STICKY_KEY_PREFIX = "replica-sticky"
+REPLICA_MAX_LAG_SECONDS = 2
+REPLICA_LAG_CHECK_INTERVAL_SECONDS = 1
+
+DATABASES["replica"] = {
+    **DATABASES["default"],
+    "HOST": DB_REPLICA_HOST or DATABASES["default"]["HOST"],
+    "OPTIONS": {"pool": {**DATABASES["default"]["OPTIONS"]["pool"]}},
+    # Tests use the test database as the replica.
+    "TEST": {"MIRROR": "default"},
+}
+DATABASE_ROUTERS = ["nevroth.db.replica.ReadReplicaRouter"]
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.ClaimsJWTAuthentication",
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
@@ -107,6 +170,11 @@ REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "nevroth.pagination.CustomPageNumberPagination",
 }
 
+SIMPLE_JWT = {
+    "TOKEN_OBTAIN_SERIALIZER": "accounts.serializers.ClaimsTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "accounts.serializers.ClaimsTokenRefreshSerializer",
+}
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Nevroth Project API",
     "DESCRIPTION": "API for Nevroth – an app to help users track and improve their progress in overcoming harmful habits.",
@@ -185,7 +253,7 @@ CACHES = {
         "BACKEND": "django_redis.cache.RedisCache",
         "LOCATION": f"redis://{REDIS_HOST}:{REDIS_PORT}/1",
         "OPTIONS": {
-            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "CLIENT_CLASS": "nevroth.cache.InstrumentedRedisClient",
         },
     }
 }
@@ -201,6 +269,72 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Broadcast jobs insert notifications in chunks, paced to keep the primary
+# responsive, and are resumed when they stop progressing.
+BROADCAST_CHUNK_SIZE = 1000
+BROADCAST_MAX_NOTIFICATIONS_PER_SECOND = 5000
+BROADCAST_JOB_STALL_SECONDS = 300
+
+# Cached unread counters expire to bound drift from the database.
+NOTIFICATIONS_UNREAD_KEY_PREFIX = "notifications-unread"
+NOTIFICATIONS_UNREAD_TTL_SECONDS = 24 * 60 * 60
+# A recount slower than this isn't cached.
+NOTIFICATIONS_UNREAD_RECOUNT_TIMEOUT_SECONDS = 30
+# Number of concurrent group sends while pushing a broadcast chunk.
+NOTIFICATIONS_PUSH_BATCH_SIZE = 100
+
+# Markers of changed users outlive access tokens issued before the change.
+USER_CHANGED_KEY_PREFIX = "user-changed"
+
+# Websocket connect tickets are single-use and only valid for a short time.
+WS_TICKET_KEY_PREFIX = "ws-ticket"
+WS_TICKET_TTL_SECONDS = 30
+
+# Presence: sockets send heartbeats more often than the TTL, and status
+# changes are broadcast to chat lists once per interval.
+PRESENCE_ENABLED = True
+PRESENCE_KEY_PREFIX = "presence"
+PRESENCE_TTL_SECONDS = 60
+PRESENCE_BROADCAST_INTERVAL_SECONDS = 5
+PRESENCE_LOOKUP_MAX_USERS = 100
+
+# Chat sockets buffer at most this many outbound events; a client whose
+# buffer stays full longer than the grace period is disconnected.
+CHAT_WS_OUTBOUND_QUEUE_SIZE = 100
+CHAT_WS_SLOW_CONSUMER_GRACE_SECONDS = 10
+
+# Queries of requests slower than the threshold are recorded with their plan
+# into a bounded Redis list, see nevroth.slow_queries.
+SLOW_QUERY_CAPTURE_ENABLED = not TESTING
+SLOW_QUERY_THRESHOLD_MS = float(os.environ.get("SLOW_QUERY_THRESHOLD_MS", 200))
+SLOW_QUERY_KEY = "slow-queries"
+SLOW_QUERY_BUFFER_SIZE = 1000
+
+# Requests are profiled when they carry a signed X-Profile header or are picked
+# by the sampling rate; the latest profiles are kept in a capped Redis list.
+PROFILING_ENABLED = True
+PROFILING_SAMPLE_RATE = float(os.environ.get("PROFILING_SAMPLE_RATE", 0))
+PROFILING_INTERVAL_MS = 5
+PROFILING_TOKEN_MAX_AGE_SECONDS = 15 * 60
+PROFILING_KEY = "profiles"
+PROFILING_MAX_PROFILES = 50
+
+# Requests, signals, group sends, Celery tasks and websocket deliveries are
+# traced, linked by a traceparent carried in channel events and task headers.
+# Spans go to the exporter: a JSON lines file or an OTLP/HTTP collector.
+TRACING_ENABLED = os.environ.get("TRACING_ENABLED", "false").lower() == "true"
+TRACING_SAMPLE_RATE = float(os.environ.get("TRACING_SAMPLE_RATE", 1))
+TRACING_EXPORTER = os.environ.get(
+    "TRACING_EXPORTER", "nevroth.tracing.FileSpanExporter"
+)
+TRACING_FILE_PATH = os.environ.get(
+    "TRACING_FILE_PATH", os.path.join(BASE_DIR, "traces.jsonl")
+)
+TRACING_OTLP_ENDPOINT = os.environ.get(
+    "TRACING_OTLP_ENDPOINT", "http://localhost:4318/v1/traces"
+)
+TRACING_SERVICE_NAME = "nevroth"
+
 # Celery Configuration Options
 CELERY_BROKER_URL = os.getenv("REDIS_URL", f"redis://{REDIS_HOST}:{REDIS_PORT}/2")
 CELERY_RESULT_BACKEND = os.getenv("REDIS_URL", f"redis://{REDIS_HOST}:{REDIS_PORT}/3")
@@ -208,16 +342,61 @@ CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 
+# Celery workers serve their metrics on this port when it's set
+WORKER_METRICS_PORT = int(os.environ.get("WORKER_METRICS_PORT", 0)) or None
+
 CELERY_BEAT_SCHEDULE = {
     "delete-old-chat-messages-every-night": {
         "task": "chats.tasks.cleanup.cleanup_old_messages_task",
         "schedule": crontab(minute=0, hour=3),  # Every day at 03:00 AM
         "args": [],
     },
+    "create-chat-message-partitions-every-night": {
+        "task": "chats.tasks.partitions.create_chat_message_partitions_task",
+        "schedule": crontab(minute=0, hour=2),  # Every day at 02:00 AM
+        "args": [],
+    },
+    "purge-expired-notifications-every-night": {
+        "task": "notifications.tasks.retention.purge_expired_notifications_task",
+        "schedule": crontab(minute=30, hour=3),  # Every day at 03:30 AM
+        "args": [],
+    },
+    "purge-expired-account-records-every-night": {
+        "task": "accounts.tasks.retention.purge_expired_account_records_task",
+        "schedule": crontab(minute=45, hour=3),  # Every day at 03:45 AM
+        "args": [],
+    },
+    "resume-stalled-broadcast-jobs": {
+        "task": "notifications.tasks.broadcast.resume_broadcast_jobs_task",
+        "schedule": crontab(),  # Every minute
+        "args": [],
+    },
+    "broadcast-presence-changes": {
+        "task": "chats.tasks.presence.broadcast_presence_changes_task",
+        "schedule": PRESENCE_BROADCAST_INTERVAL_SECONDS,
+        "args": [],
+        "options": {"expires": PRESENCE_BROADCAST_INTERVAL_SECONDS},
+    },
 }
 
 FOLLOW_UP_HABIT_DELAY = 3600  # 1 hour in seconds
 OLD_MESSAGE_RETENTION_DAYS = 30
+CHAT_MESSAGE_PARTITIONS_AHEAD_WEEKS = 4
+
+# Expiring chat messages are archived to the default storage before removal
+CHAT_ARCHIVE_ENABLED = not TESTING
+CHAT_ARCHIVE_PREFIX = "chat-archive"
+CHAT_ARCHIVE_FETCH_SIZE = 2000
+CHAT_ARCHIVE_CHUNK_MAX_MESSAGES = 10000
+
+# Expired rows are purged in small batches with a pause after each of them
+RETENTION_BATCH_SIZE = 1000
+RETENTION_BATCH_SLEEP_SECONDS = 0.1
+READ_NOTIFICATION_RETENTION_DAYS = 30
+BROADCAST_NOTIFICATION_RETENTION_DAYS = 90
+# Messages are created right before their notifications, so fresh ones are kept
+ORPHANED_NOTIFICATION_MESSAGE_RETENTION_HOURS = 24
+VERIFY_TOKEN_LIFETIME_HOURS = 24
 
 
 if not TESTING:
@@ -228,6 +407,9 @@ if not TESTING:
     AWS_S3_ENDPOINT_URL = os.environ.get("AWS_S3_ENDPOINT_URL", "http://localhost:4566")
     AWS_QUERYSTRING_AUTH = True
     AWS_QUERYSTRING_EXPIRE = 3600
+    # Signed URLs are reused while they stay valid for at least this long.
+    AWS_SIGNED_URL_MIN_VALIDITY = 600
+    AWS_SIGNED_URL_CACHE_MAX_SIZE = 10000
     AWS_S3_FILE_OVERWRITE = False
 
     STATIC_URL = "/static/"
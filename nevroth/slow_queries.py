@@ -0,0 +1,190 @@
+import hashlib
+import json
+import re
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django_redis import get_redis_connection
+from redis import RedisError
+
+EXPLAINABLE_STATEMENTS = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+# Literals and placeholders become "?", and lists of them collapse, so queries
+# differing only in values share a fingerprint.
+FINGERPRINT_REPLACEMENTS = [
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"%s"), "?"),
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)"), "(?, ...)"),
+    (re.compile(r"\s+"), " "),
+]
+
+
+def normalize_sql(sql: str) -> str:
+    for pattern, replacement in FINGERPRINT_REPLACEMENTS:
+        sql = pattern.sub(replacement, sql)
+
+    return sql.strip()
+
+
+def fingerprint_sql(sql: str) -> str:
+    return hashlib.sha1(normalize_sql(sql).encode("utf-8")).hexdigest()[:16]
+
+
+def redact_params(params) -> list[str]:
+    """Keep only the types of the parameters, as values may be personal data"""
+    if params is None:
+        return []
+    if isinstance(params, dict):
+        params = params.values()
+
+    return [f"<{type(param).__name__}>" for param in params]
+
+
+def redact_plan(plan):
+    """Replace literals in the plan, where Postgres prints the bound parameters"""
+    if isinstance(plan, str):
+        return normalize_sql(plan)
+    if isinstance(plan, list):
+        return [redact_plan(node) for node in plan]
+    if isinstance(plan, dict):
+        return {key: redact_plan(value) for key, value in plan.items()}
+
+    return plan
+
+
+class SlowQueryService:
+    """
+    Service to keep the latest slow queries in a bounded Redis list.
+
+    The list works as a ring buffer: new entries are pushed to its head and
+    the oldest ones are trimmed away.
+    """
+
+    @classmethod
+    def _get_connection(cls):
+        return get_redis_connection("default")
+
+    @classmethod
+    def record(cls, entry: dict):
+        pipeline = cls._get_connection().pipeline()
+        pipeline.lpush(settings.SLOW_QUERY_KEY, json.dumps(entry))
+        pipeline.ltrim(settings.SLOW_QUERY_KEY, 0, settings.SLOW_QUERY_BUFFER_SIZE - 1)
+        pipeline.execute()
+
+    @classmethod
+    def get_entries(cls) -> list[dict]:
+        """Return recorded entries from the newest"""
+        return [
+            json.loads(entry)
+            for entry in cls._get_connection().lrange(settings.SLOW_QUERY_KEY, 0, -1)
+        ]
+
+    @classmethod
+    def get_top_fingerprints(cls, limit: int) -> list[dict]:
+        """Aggregate recorded entries by fingerprint, ordered by their total time"""
+        fingerprints = {}
+
+        for entry in cls.get_entries():
+            stats = fingerprints.get(entry["fingerprint"])
+            if stats is None:
+                # Entries come from the newest, so the first one is the latest.
+                stats = fingerprints[entry["fingerprint"]] = {
+                    "fingerprint": entry["fingerprint"],
+                    "sql": entry["sql"],
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "views": set(),
+                    "last_params": entry["params"],
+                    "last_plan": entry["plan"],
+                    "last_recorded_at": entry["recorded_at"],
+                }
+
+            stats["count"] += 1
+            stats["total_ms"] += entry["duration_ms"]
+            stats["max_ms"] = max(stats["max_ms"], entry["duration_ms"])
+            if entry["view"]:
+                stats["views"].add(entry["view"])
+
+        top = sorted(
+            fingerprints.values(), key=lambda stats: stats["total_ms"], reverse=True
+        )[:limit]
+        for stats in top:
+            stats["total_ms"] = round(stats["total_ms"], 3)
+            stats["mean_ms"] = round(stats["total_ms"] / stats["count"], 3)
+            stats["views"] = sorted(stats["views"])
+
+        return top
+
+    @classmethod
+    def clear(cls):
+        cls._get_connection().delete(settings.SLOW_QUERY_KEY)
+
+
+class SlowQueryRecorder:
+    """
+    Database execute wrapper recording queries slower than the threshold.
+
+    Every slow query is recorded with its fingerprint, redacted parameters,
+    the view of the request and the plan from `EXPLAIN` without `ANALYZE`,
+    which doesn't run the query again. Literals in the plan are redacted too.
+    """
+
+    def __init__(self, request=None):
+        self.request = request
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration_ms = (time.perf_counter() - start) * 1000
+
+        if duration_ms >= settings.SLOW_QUERY_THRESHOLD_MS:
+            self.record(context["connection"], sql, params, many, duration_ms)
+
+        return result
+
+    def record(self, connection, sql, params, many, duration_ms):
+        entry = {
+            "fingerprint": fingerprint_sql(sql),
+            "sql": normalize_sql(sql),
+            "duration_ms": round(duration_ms, 3),
+            "params": redact_params(params[0] if many and params else params),
+            "view": self.get_view_name(),
+            "plan": None if many else self.explain(connection, sql, params),
+            "recorded_at": datetime.now(dt_timezone.utc).isoformat(),
+        }
+
+        try:
+            SlowQueryService.record(entry)
+        except RedisError:
+            # Capturing is best effort, so it doesn't fail the request.
+            pass
+
+    def get_view_name(self) -> str | None:
+        match = getattr(self.request, "resolver_match", None)
+        return match.view_name if match else None
+
+    @classmethod
+    def explain(cls, connection, sql, params) -> list | None:
+        if not sql.lstrip().upper().startswith(EXPLAINABLE_STATEMENTS):
+            return None
+
+        # A raw cursor bypasses execute wrappers, and a failed EXPLAIN inside a
+        # transaction is rolled back to the savepoint to keep it usable.
+        in_transaction = connection.in_atomic_block
+        with connection.connection.cursor() as cursor:
+            try:
+                if in_transaction:
+                    cursor.execute("SAVEPOINT slow_query_explain")
+                cursor.execute(f"EXPLAIN (ANALYZE false, FORMAT JSON) {sql}", params)
+                plan = cursor.fetchone()[0]
+                if in_transaction:
+                    cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+            except connection.Database.Error:
+                if in_transaction:
+                    cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+                return None
+
+        return redact_plan(plan)
@@ -1,10 +1,64 @@
+import threading
+import time
+from collections import OrderedDict
+
 from storages.backends.s3boto3 import S3Boto3Storage
 from django.conf import settings
 
 
+class SignedUrlCache:
+    """Thread-safe LRU cache of signed URLs, each expiring after its own TTL"""
+
+    def __init__(self):
+        self._urls = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            cached = self._urls.get(key)
+            if cached is None:
+                return None
+
+            url, expires_at = cached
+            if expires_at <= time.monotonic():
+                del self._urls[key]
+                return None
+
+            self._urls.move_to_end(key)
+            return url
+
+    def set(self, key: str, url: str, ttl: float):
+        with self._lock:
+            self._urls[key] = (url, time.monotonic() + ttl)
+            self._urls.move_to_end(key)
+            while len(self._urls) > settings.AWS_SIGNED_URL_CACHE_MAX_SIZE:
+                self._urls.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._urls.clear()
+
+
+# Shared by every storage instance and thread of the process.
+signed_url_cache = SignedUrlCache()
+
+
 class CustomS3Storage(S3Boto3Storage):
     def url(self, name, parameters=None, expire=None, http_method=None):
-        url = super().url(name, parameters, expire)
+        # Only plain download URLs are the same for every caller.
+        cacheable = parameters is None and expire is None and http_method is None
+        cache_key = f"{self.bucket_name}/{name}"
+        if cacheable and (url := signed_url_cache.get(cache_key)) is not None:
+            return url
+
+        url = super().url(name, parameters, expire, http_method)
         if settings.AWS_S3_ENDPOINT_URL in url:
-            return url.replace(settings.AWS_S3_ENDPOINT_URL, "http://localhost:4566")
+            url = url.replace(settings.AWS_S3_ENDPOINT_URL, "http://localhost:4566")
+
+        if cacheable:
+            # A cached URL stays valid for a while after it's handed out.
+            ttl = self.querystring_expire - settings.AWS_SIGNED_URL_MIN_VALIDITY
+            if ttl > 0:
+                signed_url_cache.set(cache_key, url, ttl)
+
         return url
@@ -0,0 +1,62 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+
+class QueryBudgetTestMixin:
+    """
+    Mixin asserting how many queries an endpoint makes.
+
+    List endpoints are requested with every page size of `PAGE_SIZES` and must
+    make the same number of queries for all of them, so a serializer touching
+    a relation per row fails the test even while it stays within the budget.
+    """
+
+    PAGE_SIZES = (1, 50)
+
+    def capture_queries(self, url: str, params: dict | None = None):
+        # Cached responses and counters would hide queries of the next request.
+        cache.clear()
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params or {})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+
+        return response, [query["sql"] for query in context.captured_queries]
+
+    def assertQueryBudget(self, url: str, budget: int, params: dict | None = None):
+        _, queries = self.capture_queries(url, params)
+        self._assert_within_budget(url, queries, budget)
+
+    def assertListQueryBudget(self, url: str, budget: int, params: dict | None = None):
+        queries_by_page_size = {}
+
+        for page_size in self.PAGE_SIZES:
+            response, queries = self.capture_queries(
+                url, {**(params or {}), "page_size": page_size}
+            )
+            self.assertEqual(
+                len(response.data["results"]),
+                page_size,
+                f"{url} must have at least {page_size} items to fill the page",
+            )
+            self._assert_within_budget(url, queries, budget)
+            queries_by_page_size[page_size] = queries
+
+        counts = {size: len(queries) for size, queries in queries_by_page_size.items()}
+        self.assertEqual(
+            len(set(counts.values())),
+            1,
+            f"Query count of {url} grows with the page size {counts}:\n"
+            + "\n".join(queries_by_page_size[max(self.PAGE_SIZES)]),
+        )
+
+    def _assert_within_budget(self, url: str, queries: list[str], budget: int):
+        self.assertLessEqual(
+            len(queries),
+            budget,
+            f"{url} made {len(queries)} queries over the budget of {budget}:\n"
+            + "\n".join(queries),
+        )
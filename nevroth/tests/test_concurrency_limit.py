@@ -0,0 +1,39 @@
+import asyncio
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from middlewares.concurrency import ConcurrencyLimitMiddleware
+from nevroth.asgi import django_asgi_app
+
+
+class ConcurrencyLimitTests(SimpleTestCase):
+    async def test_requests_over_limit_wait(self):
+        """Test that no more than the limit of requests are handled at once."""
+        in_flight = 0
+        max_in_flight = 0
+        release = asyncio.Event()
+
+        async def app(scope, receive, send):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await release.wait()
+            in_flight -= 1
+
+        limited = ConcurrencyLimitMiddleware(app, limit=2)
+        requests = [
+            asyncio.create_task(limited({"type": "http"}, None, None)) for _ in range(5)
+        ]
+
+        await asyncio.sleep(0.01)
+        self.assertEqual(in_flight, 2)
+
+        release.set()
+        await asyncio.gather(*requests)
+        self.assertEqual(max_in_flight, 2)
+
+    def test_django_application_is_limited_by_threads(self):
+        """Test that HTTP requests are limited to the threads of a worker."""
+        self.assertIsInstance(django_asgi_app, ConcurrencyLimitMiddleware)
+        self.assertEqual(django_asgi_app.limit, settings.ASGI_THREADS)
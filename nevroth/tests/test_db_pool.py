@@ -0,0 +1,103 @@
+from unittest import mock
+
+from psycopg.pq import TransactionStatus
+
+from django.conf import settings
+from django.db import OperationalError, connection, connections, transaction
+from django.test import SimpleTestCase, TransactionTestCase
+from prometheus_client import REGISTRY
+
+from accounts.tests.factories.user import MemberFactory
+from nevroth.celery_db import configure_connection_pools
+
+
+def get_sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class ConnectionPoolTests(TransactionTestCase):
+    def test_connections_are_reused_from_pool(self):
+        """Test that closed connections go back to the pool and are reused."""
+        connection.ensure_connection()
+        raw_connection = connection.connection
+        waits = get_sample("db_pool_wait_duration_seconds_count", alias="default")
+
+        connection.close()
+        connection.ensure_connection()
+
+        self.assertIs(connection.connection, raw_connection)
+        self.assertEqual(
+            get_sample("db_pool_wait_duration_seconds_count", alias="default"),
+            waits + 1,
+        )
+        self.assertGreaterEqual(get_sample("db_pool_size", alias="default"), 1)
+
+    def test_atomic_block_keeps_its_connection(self):
+        """Test that a transaction keeps one pooled connection until it ends."""
+        connection.close()
+
+        with transaction.atomic():
+            MemberFactory()
+            raw_connection = connection.connection
+            MemberFactory()
+
+            self.assertIs(connection.connection, raw_connection)
+            self.assertEqual(
+                raw_connection.info.transaction_status, TransactionStatus.INTRANS
+            )
+
+    def test_exhausted_pool_times_out(self):
+        """Test that a connection request waits for the timeout on an exhausted pool."""
+        connection.close()
+        default_pool = connection._connection_pools.pop("default")
+        self.addCleanup(
+            connection._connection_pools.__setitem__, "default", default_pool
+        )
+
+        small_pool = {"min_size": 1, "max_size": 1, "timeout": 0.2}
+        with mock.patch.dict(connection.settings_dict["OPTIONS"]["pool"], small_pool):
+            self.addCleanup(connection.close_pool)
+            self.addCleanup(connection.close)
+            connection.ensure_connection()
+            timeouts = get_sample("db_pool_timeouts_total", alias="default")
+
+            other = connections.create_connection("default")
+            with self.assertRaises(OperationalError):
+                other.ensure_connection()
+
+            self.assertEqual(
+                get_sample("db_pool_timeouts_total", alias="default"), timeouts + 1
+            )
+            self.assertGreaterEqual(
+                get_sample("db_pool_wait_duration_seconds_sum", alias="default"), 0.2
+            )
+
+            # The connection is available again once the first one is returned.
+            connection.close()
+            other.ensure_connection()
+            other.close()
+
+
+class ConnectionPoolSizeTests(SimpleTestCase):
+    def test_pool_covers_worker_concurrency(self):
+        """Test that the default pool has a connection for every serving thread."""
+        self.assertGreaterEqual(settings.DB_POOL_MAX_SIZE, settings.ASGI_THREADS + 1)
+
+
+class CeleryConnectionPoolTests(SimpleTestCase):
+    def test_worker_processes_open_own_small_pool(self):
+        """Test that prefork children drop the parent's pool and shrink their own."""
+        default = connections["default"]
+
+        with (
+            mock.patch.dict(default.settings_dict["OPTIONS"]),
+            mock.patch.dict(default._connection_pools, {"default": mock.Mock()}),
+        ):
+            configure_connection_pools()
+
+            self.assertNotIn("default", default._connection_pools)
+            self.assertEqual(default.settings_dict["OPTIONS"]["pool"]["min_size"], 1)
+            self.assertEqual(
+                default.settings_dict["OPTIONS"]["pool"]["max_size"],
+                settings.WORKER_DB_POOL_MAX_SIZE,
+            )
@@ -0,0 +1,92 @@
+import uuid
+
+from django.core.cache import cache
+from django.urls import reverse
+from prometheus_client import REGISTRY
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.tasks.followup import follow_up_no_habits_selected_task
+from accounts.tests.factories.user import MemberFactory
+
+
+class PrometheusMetricsTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = MemberFactory()
+        cls.metrics_url = reverse("metrics")
+
+    def _get_sample(self, name, **labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_metrics_endpoint_is_public(self):
+        """Test that metrics can be scraped without authentication."""
+        response = self.client.get(self.metrics_url, HTTP_ACCEPT="text/plain")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        self.assertIn(b"http_request_duration_seconds", response.content)
+
+    def test_requests_are_labeled_by_route(self):
+        """Test that request latency and queries are labeled by the URL name."""
+        self.client.force_authenticate(self.member)
+        labels = {"method": "GET", "route": "notification-list", "status": "200"}
+        requests_before = self._get_sample(
+            "http_request_duration_seconds_count", **labels
+        )
+        queries_before = self._get_sample(
+            "db_queries_per_request_sum", route="notification-list"
+        )
+
+        response = self.client.get(reverse("notification-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(
+            self._get_sample("http_request_duration_seconds_count", **labels),
+            requests_before + 1,
+        )
+        self.assertGreater(
+            self._get_sample("db_queries_per_request_sum", route="notification-list"),
+            queries_before,
+        )
+
+    def test_unmatched_paths_share_one_route(self):
+        """Test that unknown paths don't create a time series each."""
+        labels = {"method": "GET", "route": "<unmatched>", "status": "404"}
+        before = self._get_sample("http_request_duration_seconds_count", **labels)
+
+        self.client.get(f"/{uuid.uuid4().hex}/")
+        self.client.get(f"/{uuid.uuid4().hex}/")
+
+        self.assertEqual(
+            self._get_sample("http_request_duration_seconds_count", **labels),
+            before + 2,
+        )
+
+    def test_cache_hits_and_misses_are_counted(self):
+        """Test that cache reads are counted by result."""
+        key = f"metrics-test-{uuid.uuid4().hex}"
+        hits = self._get_sample("cache_gets_total", result="hit")
+        misses = self._get_sample("cache_gets_total", result="miss")
+
+        self.assertIsNone(cache.get(key))
+        cache.set(key, 0, timeout=10)
+        self.assertEqual(cache.get(key), 0)
+        cache.get_many([key, f"{key}-missing"])
+
+        self.assertEqual(self._get_sample("cache_gets_total", result="hit"), hits + 2)
+        self.assertEqual(
+            self._get_sample("cache_gets_total", result="miss"), misses + 2
+        )
+
+    def test_celery_task_runs_are_timed(self):
+        """Test that Celery task runs are timed by task and state."""
+        labels = {"task": follow_up_no_habits_selected_task.name, "state": "SUCCESS"}
+        before = self._get_sample("celery_task_duration_seconds_count", **labels)
+
+        follow_up_no_habits_selected_task.apply(args=[self.member.id])
+
+        self.assertEqual(
+            self._get_sample("celery_task_duration_seconds_count", **labels),
+            before + 1,
+        )
@@ -0,0 +1,175 @@
+import time
+
+import jsonschema
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.tests.factories.user import AdminFactory, MemberFactory
+from middlewares.profiling import PROFILE_ID_HEADER, SamplingProfilerMiddleware
+from nevroth.profiling import PROFILING_HEADER, ProfileService, profile_call
+
+profile_schema = {
+    "type": "object",
+    "properties": {
+        "id": {"type": "string"},
+        "method": {"type": "string"},
+        "path": {"type": "string"},
+        "view": {"type": ["string", "null"]},
+        "reason": {"type": "string", "enum": ["header", "sampled"]},
+        "duration_ms": {"type": "number"},
+        "samples": {"type": "integer"},
+        "interval_ms": {"type": "integer"},
+        "created_at": {"type": "string", "format": "date-time"},
+    },
+    "required": [
+        "id",
+        "method",
+        "path",
+        "view",
+        "reason",
+        "duration_ms",
+        "samples",
+        "interval_ms",
+        "created_at",
+    ],
+    "additionalProperties": False,
+}
+
+
+def spin(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+class SamplingProfilerTests(SimpleTestCase):
+    def test_profiler_samples_the_calling_thread(self):
+        """Test that the profiler aggregates stacks of the profiled call."""
+        _, profiler, duration = profile_call(lambda: spin(0.1), interval=0.001)
+
+        self.assertGreater(profiler.samples, 0)
+        self.assertGreaterEqual(duration, 0.1)
+        self.assertIn("nevroth.tests.test_profiling.spin", profiler.to_folded())
+
+    def test_profiling_token_is_verified(self):
+        """Test that only fresh tokens signed by the server are accepted."""
+        token = ProfileService.make_token()
+
+        self.assertTrue(ProfileService.is_valid_token(token))
+        self.assertFalse(ProfileService.is_valid_token(token + "x"))
+        with override_settings(PROFILING_TOKEN_MAX_AGE_SECONDS=-1):
+            self.assertFalse(ProfileService.is_valid_token(token))
+
+    @override_settings(PROFILING_SAMPLE_RATE=0)
+    def test_requests_without_token_are_not_profiled(self):
+        """Test that requests are only picked by a valid token or sampling."""
+        factory = RequestFactory()
+
+        self.assertIsNone(SamplingProfilerMiddleware.get_reason(factory.get("/")))
+        self.assertIsNone(
+            SamplingProfilerMiddleware.get_reason(
+                factory.get("/", headers={PROFILING_HEADER: "forged"})
+            )
+        )
+        self.assertEqual(
+            SamplingProfilerMiddleware.get_reason(
+                factory.get(
+                    "/", headers={PROFILING_HEADER: ProfileService.make_token()}
+                )
+            ),
+            "header",
+        )
+        with override_settings(PROFILING_SAMPLE_RATE=1):
+            self.assertEqual(
+                SamplingProfilerMiddleware.get_reason(factory.get("/")), "sampled"
+            )
+
+    @override_settings(PROFILING_ENABLED=False)
+    def test_disabled_middleware_is_not_used(self):
+        """Test that the middleware leaves the chain while profiling is disabled."""
+        with self.assertRaises(MiddlewareNotUsed):
+            SamplingProfilerMiddleware(lambda request: HttpResponse())
+
+
+@override_settings(PROFILING_KEY="test-profiles", PROFILING_SAMPLE_RATE=0)
+class ProfilesTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = AdminFactory()
+        cls.member = MemberFactory()
+        cls.url = reverse("profiles")
+
+    def setUp(self):
+        ProfileService.clear()
+        self.addCleanup(ProfileService.clear)
+
+    def _get_token(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.post(reverse("profiling_token"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["header"], PROFILING_HEADER)
+
+        return response.data["token"]
+
+    def test_request_with_token_is_profiled(self):
+        """Test that a request with a profiling token is profiled and downloadable."""
+        token = self._get_token()
+
+        response = self.client.get(
+            reverse("habit-list"), headers={PROFILING_HEADER: token}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        profile_id = response[PROFILE_ID_HEADER]
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        self._assert_profile_schema(response.data[0])
+        self.assertEqual(response.data[0]["id"], profile_id)
+        self.assertEqual(response.data[0]["view"], "habit-list")
+        self.assertEqual(response.data[0]["reason"], "header")
+
+        response = self.client.get(
+            reverse("profile_download", kwargs={"profile_id": profile_id})
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("attachment", response["Content-Disposition"])
+
+    def test_request_without_token_is_not_profiled(self):
+        """Test that requests without a profiling token aren't profiled."""
+        self.client.force_authenticate(self.admin)
+
+        response = self.client.get(reverse("habit-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn(PROFILE_ID_HEADER, response)
+        self.assertEqual(ProfileService.get_profiles(), [])
+
+    def test_download_unknown_profile(self):
+        """Test that downloading an unknown profile returns 404."""
+        self.client.force_authenticate(self.admin)
+
+        response = self.client.get(
+            reverse("profile_download", kwargs={"profile_id": "unknown"})
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_member_cannot_access_profiles(self):
+        """Test that only admins can get profiling tokens and profiles."""
+        self.client.force_authenticate(self.member)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        response = self.client.post(reverse("profiling_token"))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def _assert_profile_schema(self, data):
+        try:
+            jsonschema.validate(instance=data, schema=profile_schema)
+        except jsonschema.exceptions.ValidationError as e:
+            self.fail(f"Response does not match schema: {e.message}")
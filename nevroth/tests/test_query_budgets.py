@@ -0,0 +1,156 @@
+from datetime import timedelta
+
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from accounts.models import LightweightUser
+from accounts.tests.factories.user import AdminFactory, MemberFactory
+from chats.models import Chat
+from chats.tests.factories.chat import ChatFactory, ChatMemberFactory
+from chats.tests.factories.chat_message import ChatMessageFactory
+from friends.tests.factories.friends_relation import (
+    FriendsRelationAcceptedFactory,
+    FriendsRelationPendingFactory,
+)
+from habits.models import HabitProgress
+from habits.tests.factories.habit import (
+    HabitFactory,
+    HabitProgressSuccessFactory,
+    UserHabitFactory,
+)
+from nevroth.tests.query_budget import QueryBudgetTestMixin
+from notifications.tests.factories.notification import (
+    BroadcastJobFactory,
+    BroadcastNotificationFactory,
+    NotificationFactory,
+)
+
+# Enough rows to fill the largest page with one left for the next one.
+SEED_SIZE = max(QueryBudgetTestMixin.PAGE_SIZES) + 1
+
+
+# Hundreds of users are created, so skip the slow default password hashing.
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class QueryBudgetTests(QueryBudgetTestMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = AdminFactory()
+        cls.member = MemberFactory()
+
+        cls.habits = HabitFactory.create_batch(SEED_SIZE)
+        cls.habit = cls.habits[0]
+        UserHabitFactory(user=cls.member, habit=cls.habit)
+
+        # Users sharing a habit and a group chat with the member
+        cls.users = MemberFactory.create_batch(SEED_SIZE)
+        cls.group_chat = ChatFactory(chat_type=Chat.ChatType.GROUP)
+        ChatMemberFactory(chat=cls.group_chat, user=cls.member)
+        for user in cls.users:
+            UserHabitFactory(user=user, habit=cls.habit)
+            ChatMemberFactory(chat=cls.group_chat, user=user)
+            ChatMessageFactory(
+                chat=cls.group_chat, sender=user, content="Hello from the group"
+            )
+
+            private_chat = ChatFactory(chat_type=Chat.ChatType.PRIVATE)
+            ChatMemberFactory(chat=private_chat, user=cls.member)
+            ChatMemberFactory(chat=private_chat, user=user)
+
+        FriendsRelationPendingFactory.create_batch(SEED_SIZE, to_user=cls.member)
+        FriendsRelationPendingFactory.create_batch(SEED_SIZE, from_user=cls.member)
+        FriendsRelationAcceptedFactory.create_batch(SEED_SIZE, to_user=cls.member)
+
+        # A success streak ending today, one day per progress
+        today = timezone.now().date()
+        for days_ago in reversed(range(SEED_SIZE)):
+            progress = HabitProgressSuccessFactory(user=cls.member, habit=cls.habit)
+            HabitProgress.objects.filter(pk=progress.pk).update(
+                date=today - timedelta(days=days_ago)
+            )
+
+        cls.notifications = NotificationFactory.create_batch(
+            SEED_SIZE, recipient=cls.member, message__sender=cls.admin
+        )
+        BroadcastNotificationFactory.create_batch(
+            SEED_SIZE, habits_ids=[cls.habit.id], message__sender=cls.admin
+        )
+        cls.jobs = BroadcastJobFactory.create_batch(
+            SEED_SIZE, broadcast__message__sender=cls.admin
+        )
+
+    def _authenticate(self, user):
+        # Authentication builds users from token claims, see ClaimsJWTAuthentication.
+        self.client.force_authenticate(
+            LightweightUser.from_card(LightweightUser.get_card(user))
+        )
+
+    def test_accounts_endpoints_query_budgets(self):
+        """Test that accounts endpoints make a flat number of queries."""
+        self._authenticate(self.member)
+
+        self.assertQueryBudget(reverse("user-profile"), budget=1)
+        self.assertListQueryBudget(reverse("users"), budget=2)
+        self.assertListQueryBudget(reverse("suggested-friends-list"), budget=2)
+
+    def test_chats_endpoints_query_budgets(self):
+        """Test that chats endpoints make a flat number of queries."""
+        self._authenticate(self.member)
+
+        self.assertListQueryBudget(reverse("chat-list-create"), budget=2)
+        self.assertListQueryBudget(
+            reverse("chat-messages-list", kwargs={"id": self.group_chat.id}),
+            budget=3,
+        )
+        self.assertListQueryBudget(
+            reverse("chat-messages-search"), budget=2, params={"query": "hello"}
+        )
+        self.assertQueryBudget(
+            reverse("presence-list"),
+            budget=1,
+            params={"users": ",".join(str(user.id) for user in self.users)},
+        )
+
+    def test_habits_endpoints_query_budgets(self):
+        """Test that habits endpoints make a flat number of queries."""
+        self._authenticate(self.member)
+
+        self.assertListQueryBudget(reverse("habit-list"), budget=2)
+        self.assertQueryBudget(
+            reverse("habit-detail", kwargs={"pk": self.habit.id}), budget=1
+        )
+        self.assertListQueryBudget(reverse("habit-progress"), budget=2)
+        self.assertQueryBudget(
+            reverse("habit-progress-streak", kwargs={"habit_id": self.habit.id}),
+            budget=3,
+        )
+
+    def test_friends_endpoints_query_budgets(self):
+        """Test that friends endpoints make a flat number of queries."""
+        self._authenticate(self.member)
+
+        self.assertListQueryBudget(reverse("incoming-friend-requests"), budget=2)
+        self.assertListQueryBudget(reverse("outgoing-friend-requests"), budget=2)
+        self.assertListQueryBudget(reverse("friends-list"), budget=2)
+
+    def test_notifications_endpoints_query_budgets(self):
+        """Test that notifications endpoints make a flat number of queries."""
+        self._authenticate(self.member)
+
+        self.assertListQueryBudget(reverse("notification-list"), budget=3)
+        self.assertQueryBudget(
+            reverse("notification-detail", kwargs={"pk": self.notifications[0].id}),
+            budget=1,
+        )
+        self.assertQueryBudget(reverse("notification-unread_count"), budget=2)
+
+    def test_broadcast_jobs_endpoints_query_budgets(self):
+        """Test that broadcast jobs endpoints make a flat number of queries."""
+        self._authenticate(self.admin)
+
+        self.assertListQueryBudget(reverse("broadcast-job-list"), budget=2)
+        self.assertQueryBudget(
+            reverse("broadcast-job-detail", kwargs={"pk": self.jobs[0].id}),
+            budget=1,
+        )
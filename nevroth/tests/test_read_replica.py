@@ -0,0 +1,142 @@
+from unittest import mock
+
+from django.db import connections
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django_redis import get_redis_connection
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+
+from accounts.tests.factories.user import MemberFactory
+from habits.models import HabitProgress
+from habits.tests.factories.habit import (
+    HabitProgressCreatePayloadFactory,
+    HabitProgressSuccessFactory,
+)
+from nevroth.db.replica import (
+    ReadReplicaRouter,
+    ReplicaLagService,
+    ReplicaStickinessService,
+)
+
+
+def count_progress_queries(queries):
+    return sum(
+        HabitProgress._meta.db_table in query["sql"]
+        for query in queries.captured_queries
+    )
+
+
+# The test database mirrors the replica, so data committed on the primary is
+# visible to it.
+@override_settings(READ_REPLICA_ENABLED=True)
+class ReadReplicaTests(APITransactionTestCase):
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        ReplicaLagService.reset()
+        self.addCleanup(ReplicaLagService.reset)
+
+        self.member = MemberFactory()
+        HabitProgressSuccessFactory(user=self.member)
+        self.url = reverse("habit-progress")
+        self.client.force_authenticate(self.member)
+
+        redis = get_redis_connection("default")
+        key = ReplicaStickinessService._key(self.member.id)
+        redis.delete(key)
+        self.addCleanup(redis.delete, key)
+
+    def test_reads_are_served_from_replica(self):
+        """Test that safe requests of replica views read from the replica."""
+        with CaptureQueriesContext(connections["replica"]) as replica_queries:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 1)
+        self.assertGreater(count_progress_queries(replica_queries), 0)
+
+    def test_user_reads_own_writes_from_primary(self):
+        """Test that reads of a user who just wrote stay on the primary."""
+        response = self.client.post(self.url, HabitProgressCreatePayloadFactory())
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(ReplicaStickinessService.is_sticky(self.member.id))
+
+        with CaptureQueriesContext(connections["replica"]) as replica_queries:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(count_progress_queries(replica_queries), 0)
+
+    def test_failed_writes_do_not_stick(self):
+        """Test that rejected writes don't keep the user on the primary."""
+        payload = HabitProgressCreatePayloadFactory()
+        payload.pop("status")
+
+        response = self.client.post(self.url, payload)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(ReplicaStickinessService.is_sticky(self.member.id))
+
+    def test_lagging_replica_falls_back_to_primary(self):
+        """Test that reads go to the primary while the replica lags too far."""
+        with (
+            override_settings(REPLICA_MAX_LAG_SECONDS=2),
+            mock.patch.object(ReplicaLagService, "check_lag", return_value=5.0),
+            CaptureQueriesContext(connections["replica"]) as replica_queries,
+        ):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(count_progress_queries(replica_queries), 0)
+
+    def test_unreachable_replica_falls_back_to_primary(self):
+        """Test that reads go to the primary when the lag can't be checked."""
+        with (
+            mock.patch.object(ReplicaLagService, "check_lag", return_value=None),
+            CaptureQueriesContext(connections["replica"]) as replica_queries,
+        ):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(count_progress_queries(replica_queries), 0)
+
+    def test_lag_is_checked_once_per_interval(self):
+        """Test that the replica's lag is cached between checks."""
+        with mock.patch.object(
+            ReplicaLagService, "check_lag", return_value=0.0
+        ) as check_lag:
+            self.client.get(self.url)
+            self.client.get(self.url)
+
+        check_lag.assert_called_once()
+
+    @override_settings(READ_REPLICA_ENABLED=False)
+    def test_disabled_replica_is_not_used(self):
+        """Test that every read goes to the primary without a replica."""
+        with CaptureQueriesContext(connections["replica"]) as replica_queries:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(replica_queries), 0)
+
+
+class ReadReplicaRouterTests(SimpleTestCase):
+    def test_writes_and_migrations_use_primary(self):
+        """Test that only the primary is written to and migrated."""
+        router = ReadReplicaRouter()
+
+        self.assertIsNone(router.db_for_read(HabitProgress))
+        self.assertEqual(router.db_for_write(HabitProgress), "default")
+        self.assertTrue(router.allow_migrate("default", "habits"))
+        self.assertFalse(router.allow_migrate("replica", "habits"))
+
+    def test_replica_not_streaming_is_lagging(self):
+        """Test that an unknown lag of a disconnected replica counts as lagging."""
+        with mock.patch("nevroth.db.replica.connections") as replica_connections:
+            cursor = replica_connections.__getitem__.return_value.cursor
+            cursor.return_value.__enter__.return_value.fetchone.return_value = (None,)
+
+            self.assertEqual(ReplicaLagService.check_lag(), float("inf"))
@@ -0,0 +1,207 @@
+import json
+
+import jsonschema
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.tests.factories.user import AdminFactory, MemberFactory
+from nevroth.slow_queries import (
+    SlowQueryService,
+    fingerprint_sql,
+    SlowQueryRecorder,
+    normalize_sql,
+    redact_params,
+    redact_plan,
+)
+
+User = get_user_model()
+
+slow_query_fingerprint_schema = {
+    "type": "object",
+    "properties": {
+        "fingerprint": {"type": "string"},
+        "sql": {"type": "string"},
+        "count": {"type": "integer"},
+        "total_ms": {"type": "number"},
+        "mean_ms": {"type": "number"},
+        "max_ms": {"type": "number"},
+        "views": {"type": "array", "items": {"type": "string"}},
+        "last_params": {"type": "array", "items": {"type": "string"}},
+        "last_plan": {"type": ["array", "null"]},
+        "last_recorded_at": {"type": "string", "format": "date-time"},
+    },
+    "required": [
+        "fingerprint",
+        "sql",
+        "count",
+        "total_ms",
+        "mean_ms",
+        "max_ms",
+        "views",
+        "last_params",
+        "last_plan",
+        "last_recorded_at",
+    ],
+    "additionalProperties": False,
+}
+
+
+class SlowQueryFingerprintTests(SimpleTestCase):
+    def test_queries_differing_in_values_share_fingerprint(self):
+        """Test that literals, placeholders and lists don't change the fingerprint."""
+        first = "SELECT * FROM t1 WHERE id IN (%s, %s) AND name = 'Alice'  LIMIT 10"
+        second = "SELECT * FROM t1 WHERE id IN (%s, %s, %s) AND name = 'Bob' LIMIT 5"
+
+        self.assertEqual(fingerprint_sql(first), fingerprint_sql(second))
+        self.assertEqual(
+            normalize_sql(first),
+            "SELECT * FROM t1 WHERE id IN (?, ...) AND name = ? LIMIT ?",
+        )
+        self.assertNotEqual(
+            fingerprint_sql(first), fingerprint_sql("SELECT * FROM t2 WHERE id = %s")
+        )
+
+    def test_params_are_redacted(self):
+        """Test that only types of the parameters are kept."""
+        self.assertEqual(
+            redact_params([1, "secret@example.com", None]),
+            ["<int>", "<str>", "<NoneType>"],
+        )
+        self.assertEqual(redact_params({"email": "secret"}), ["<str>"])
+        self.assertEqual(redact_params(None), [])
+
+    def test_plan_literals_are_redacted(self):
+        """Test that values bound into plan conditions are replaced."""
+        plan = [
+            {
+                "Plan": {
+                    "Node Type": "Index Scan",
+                    "Index Name": "accounts_user_email_key",
+                    "Index Cond": "((email)::text = 'secret@example.com'::text)",
+                    "Filter": "(id <> 42)",
+                    "Total Cost": 8.17,
+                }
+            }
+        ]
+
+        self.assertEqual(
+            redact_plan(plan),
+            [
+                {
+                    "Plan": {
+                        "Node Type": "Index Scan",
+                        "Index Name": "accounts_user_email_key",
+                        "Index Cond": "((email)::text = ?::text)",
+                        "Filter": "(id <> ?)",
+                        "Total Cost": 8.17,
+                    }
+                }
+            ],
+        )
+
+
+@override_settings(
+    SLOW_QUERY_CAPTURE_ENABLED=True,
+    SLOW_QUERY_THRESHOLD_MS=0,
+    SLOW_QUERY_KEY="test-slow-queries",
+    SLOW_QUERY_BUFFER_SIZE=5,
+)
+class SlowQueryCaptureTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = AdminFactory()
+        cls.member = MemberFactory()
+        cls.url = reverse("slow_queries")
+
+    def setUp(self):
+        SlowQueryService.clear()
+        self.addCleanup(SlowQueryService.clear)
+
+    def test_slow_queries_are_recorded_with_plan(self):
+        """Test that queries over the threshold are recorded with their plan."""
+        self.client.force_authenticate(self.member)
+
+        response = self.client.get(reverse("user-profile"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        entries = SlowQueryService.get_entries()
+        self.assertGreater(len(entries), 0)
+        self.assertEqual(entries[0]["view"], "user-profile")
+        self.assertIsInstance(entries[0]["plan"], list)
+        self.assertIn("Plan", entries[0]["plan"][0])
+        self.assertEqual(entries[0]["params"], ["<int>"])
+
+    def test_parameter_values_are_not_stored(self):
+        """Test that parameter values appear neither in params nor in the plan."""
+        email = "secret-person@example.com"
+
+        with connection.execute_wrapper(SlowQueryRecorder()):
+            list(User.objects.filter(email=email))
+
+        entries = SlowQueryService.get_entries()
+        self.assertEqual(len(entries), 1)
+        self.assertIsInstance(entries[0]["plan"], list)
+        self.assertNotIn(email, json.dumps(entries))
+
+    def test_buffer_is_bounded(self):
+        """Test that only the latest entries are kept."""
+        self.client.force_authenticate(self.member)
+
+        for _ in range(3):
+            self.client.get(reverse("habit-list"))
+            self.client.get(reverse("user-profile"))
+
+        self.assertEqual(len(SlowQueryService.get_entries()), 5)
+
+    def test_member_cannot_list_slow_queries(self):
+        """Test that only admins can list slow queries."""
+        self.client.force_authenticate(self.member)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_admin_lists_top_fingerprints(self):
+        """Test that fingerprints are listed from the largest total time."""
+        self._record("SELECT * FROM a WHERE id = 1", 5, "user-profile")
+        self._record("SELECT * FROM a WHERE id = 2", 1, "habit-list")
+        self._record("SELECT * FROM b", 4, "user-profile")
+        self._record("SELECT * FROM c", 9, None)
+        self.client.force_authenticate(self.admin)
+
+        response = self.client.get(self.url, {"limit": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        for fingerprint in response.data:
+            self._assert_fingerprint_schema(fingerprint)
+        self.assertEqual(
+            [fingerprint["sql"] for fingerprint in response.data],
+            ["SELECT * FROM c", "SELECT * FROM a WHERE id = ?"],
+        )
+        self.assertEqual(response.data[1]["count"], 2)
+        self.assertEqual(response.data[1]["total_ms"], 6)
+        self.assertEqual(response.data[1]["max_ms"], 5)
+        self.assertEqual(response.data[1]["views"], ["habit-list", "user-profile"])
+
+    def _record(self, sql, duration_ms, view):
+        SlowQueryService.record(
+            {
+                "fingerprint": fingerprint_sql(sql),
+                "sql": normalize_sql(sql),
+                "duration_ms": duration_ms,
+                "params": [],
+                "view": view,
+                "plan": None,
+                "recorded_at": "2025-01-01T00:00:00+00:00",
+            }
+        )
+
+    def _assert_fingerprint_schema(self, data):
+        try:
+            jsonschema.validate(instance=data, schema=slow_query_fingerprint_schema)
+        except jsonschema.exceptions.ValidationError as e:
+            self.fail(f"Response does not match schema: {e.message}")
@@ -0,0 +1,129 @@
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase, override_settings
+
+from nevroth.celery_tracing import end_task_span, inject_trace_context, start_task_span
+from nevroth.tracing import (
+    TRACEPARENT_KEY,
+    OTLPSpanExporter,
+    SpanContext,
+    SpanExporter,
+    create_span,
+    extract,
+    get_exporter,
+    inject,
+    start_span,
+)
+
+
+class IncompleteSpanExporter(SpanExporter):
+    """Exporter missing the export method"""
+
+
+@override_settings(
+    TRACING_ENABLED=True,
+    TRACING_SAMPLE_RATE=1,
+    TRACING_EXPORTER="nevroth.tracing.InMemorySpanExporter",
+)
+class TracingTests(SimpleTestCase):
+    def setUp(self):
+        get_exporter.cache_clear()
+
+    def get_spans(self):
+        return {span["name"]: span for span in get_exporter().spans}
+
+    def test_nested_spans_share_trace(self):
+        """Test that spans started inside a span become its children."""
+        with start_span("root", new_trace=True) as root:
+            with start_span("child", step=1):
+                pass
+
+        spans = self.get_spans()
+        self.assertIsNone(spans["root"]["parent_id"])
+        self.assertEqual(spans["child"]["trace_id"], root.context.trace_id)
+        self.assertEqual(spans["child"]["parent_id"], root.context.span_id)
+        self.assertEqual(spans["child"]["attributes"], {"step": 1})
+
+    def test_failed_span_is_marked(self):
+        """Test that an exception raised inside a span marks it as failed."""
+        with self.assertRaises(ValueError):
+            with start_span("root", new_trace=True):
+                raise ValueError
+
+        span = self.get_spans()["root"]
+        self.assertEqual(span["status"], "error")
+        self.assertEqual(span["attributes"]["error.type"], "ValueError")
+
+    def test_spans_outside_of_traces_are_skipped(self):
+        """Test that spans are only created inside traces or for new ones."""
+        self.assertIsNone(create_span("orphan"))
+
+        with override_settings(TRACING_SAMPLE_RATE=0):
+            self.assertIsNone(create_span("unsampled", new_trace=True))
+
+        with override_settings(TRACING_ENABLED=False):
+            self.assertIsNone(create_span("disabled", new_trace=True))
+
+    def test_trace_context_is_propagated(self):
+        """Test that the current span is injected into carriers and extracted."""
+        self.assertEqual(inject({}), {})
+
+        with start_span("root", new_trace=True) as root:
+            carrier = inject({"type": "new_message"})
+
+        self.assertEqual(extract(carrier), root.context)
+        self.assertIsNone(extract({TRACEPARENT_KEY: "00-invalid-01"}))
+        self.assertIsNone(extract(None))
+
+    def test_task_continues_trace_of_publisher(self):
+        """Test that a task run continues the trace from its headers."""
+        headers = {}
+        with start_span("root", new_trace=True) as root:
+            inject_trace_context(headers=headers)
+
+        task = SimpleNamespace(
+            name="send_mail_task", request=SimpleNamespace(**headers)
+        )
+        start_task_span("task-id", task)
+        end_task_span("task-id", task, state="SUCCESS")
+
+        span = self.get_spans()["celery.task send_mail_task"]
+        self.assertEqual(span["trace_id"], root.context.trace_id)
+        self.assertEqual(span["parent_id"], root.context.span_id)
+        self.assertEqual(span["attributes"], {"celery.state": "SUCCESS"})
+
+    def test_spans_are_converted_to_otlp(self):
+        """Test that spans are converted to the OTLP JSON format."""
+        context = SpanContext("a" * 32, "b" * 16)
+        span = {
+            "trace_id": context.trace_id,
+            "span_id": context.span_id,
+            "parent_id": None,
+            "name": "http chat-message-list",
+            "start_time": 1.5,
+            "duration_ms": 2.0,
+            "status": "error",
+            "attributes": {"http.status_code": 500, "http.method": "POST"},
+            "process": 1,
+        }
+
+        otlp_span = OTLPSpanExporter._to_otlp_span(span)
+
+        self.assertEqual(otlp_span["startTimeUnixNano"], "1500000000")
+        self.assertEqual(otlp_span["endTimeUnixNano"], "1502000000")
+        self.assertEqual(otlp_span["status"], {"code": 2})
+        self.assertEqual(
+            otlp_span["attributes"],
+            [
+                {"key": "http.status_code", "value": {"intValue": "500"}},
+                {"key": "http.method", "value": {"stringValue": "POST"}},
+            ],
+        )
+
+    @override_settings(
+        TRACING_EXPORTER="nevroth.tests.test_tracing.IncompleteSpanExporter"
+    )
+    def test_incomplete_exporter_fails_when_created(self):
+        """Test that an exporter without the export method can't be created."""
+        with self.assertRaises(TypeError):
+            get_exporter()
@@ -0,0 +1,297 @@
+import json
+import os
+import queue
+import random
+import re
+import threading
+import time
+import urllib.request
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import cache
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+# Trace context is carried in W3C `traceparent` format, under this key in
+# channel layer events and Celery task headers, and as an HTTP header.
+TRACEPARENT_KEY = "traceparent"
+TRACEPARENT_PATTERN = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+_current_span = ContextVar("current_span", default=None)
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    trace_id: str
+    span_id: str
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+
+class Span:
+    def __init__(self, name: str, context: SpanContext, parent_id, attributes=None):
+        self.name = name
+        self.context = context
+        self.parent_id = parent_id
+        self.attributes = dict(attributes or {})
+        self.status = "ok"
+        self.start_time = time.time()
+        self._started_at = time.perf_counter()
+        self.duration_ms = None
+
+    def activate(self):
+        """Make the span current, returning a token to restore the previous one"""
+        return _current_span.set(self)
+
+    @staticmethod
+    def deactivate(token):
+        _current_span.reset(token)
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def set_error(self, exception: Exception):
+        self.status = "error"
+        self.attributes["error.type"] = type(exception).__name__
+
+    def end(self):
+        if self.duration_ms is not None:
+            return
+
+        self.duration_ms = round((time.perf_counter() - self._started_at) * 1000, 3)
+        get_exporter().export(self.to_dict())
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.context.trace_id,
+            "span_id": self.context.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_time": self.start_time,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "attributes": self.attributes,
+            "process": os.getpid(),
+        }
+
+
+def get_current_span() -> Span | None:
+    return _current_span.get()
+
+
+def create_span(
+    name: str, parent: SpanContext | None = None, new_trace=False, **attributes
+) -> Span | None:
+    """
+    Create a child span of `parent` or of the current span.
+
+    Without either of them a new sampled trace is only started with
+    `new_trace`, so events and calls outside of traces aren't traced.
+    """
+    if not settings.TRACING_ENABLED:
+        return None
+
+    if parent is None and (current := get_current_span()) is not None:
+        parent = current.context
+
+    if parent is None:
+        if not new_trace or random.random() >= settings.TRACING_SAMPLE_RATE:
+            return None
+        trace_id = os.urandom(16).hex()
+    else:
+        trace_id = parent.trace_id
+
+    return Span(
+        name,
+        SpanContext(trace_id, os.urandom(8).hex()),
+        parent.span_id if parent else None,
+        attributes,
+    )
+
+
+@contextmanager
+def start_span(
+    name: str, parent: SpanContext | None = None, new_trace=False, **attributes
+):
+    """Run the block in a span made current, see `create_span`"""
+    span = create_span(name, parent, new_trace, **attributes)
+    if span is None:
+        yield None
+        return
+
+    token = span.activate()
+    try:
+        yield span
+    except Exception as e:
+        span.set_error(e)
+        raise
+    finally:
+        span.deactivate(token)
+        span.end()
+
+
+def inject(carrier: dict) -> dict:
+    """Add the trace context of the current span, if any, to the carrier"""
+    span = get_current_span()
+    if span is not None:
+        carrier[TRACEPARENT_KEY] = span.context.traceparent
+
+    return carrier
+
+
+def extract(carrier) -> SpanContext | None:
+    traceparent = carrier.get(TRACEPARENT_KEY) if carrier else None
+    match = TRACEPARENT_PATTERN.match(traceparent or "")
+    if match is None:
+        return None
+
+    return SpanContext(*match.groups())
+
+
+class SpanExporter(ABC):
+    @abstractmethod
+    def export(self, span: dict):
+        pass
+
+
+class InMemorySpanExporter(SpanExporter):
+    """Keep finished spans in memory, used by tests"""
+
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span: dict):
+        self.spans.append(span)
+
+
+class FileSpanExporter(SpanExporter):
+    """Append finished spans as JSON lines to a local file"""
+
+    def __init__(self):
+        self.path = settings.TRACING_FILE_PATH
+        self._lock = threading.Lock()
+
+    def export(self, span: dict):
+        line = json.dumps(span) + "\n"
+        with self._lock, open(self.path, "a") as file:
+            file.write(line)
+
+
+class OTLPSpanExporter(SpanExporter):
+    """
+    Send finished spans to an OpenTelemetry collector with OTLP over HTTP.
+
+    Spans are queued and posted in batches from a background thread, so
+    requests never wait for the collector. Spans are dropped while the queue
+    is full or the collector is unreachable.
+    """
+
+    BATCH_SIZE = 512
+    QUEUE_SIZE = 8192
+    FLUSH_INTERVAL_SECONDS = 2
+    TIMEOUT_SECONDS = 5
+
+    def __init__(self):
+        self.endpoint = settings.TRACING_OTLP_ENDPOINT
+        self.service_name = settings.TRACING_SERVICE_NAME
+        self._queue = queue.Queue(maxsize=self.QUEUE_SIZE)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def export(self, span: dict):
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            pass
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.FLUSH_INTERVAL_SECONDS
+            while len(batch) < self.BATCH_SIZE:
+                try:
+                    batch.append(
+                        self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                    )
+                except queue.Empty:
+                    break
+
+            self._post(batch)
+
+    def _post(self, batch: list[dict]):
+        request = urllib.request.Request(
+            self.endpoint,
+            data=json.dumps(self.to_otlp(batch)).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        try:
+            urllib.request.urlopen(request, timeout=self.TIMEOUT_SECONDS).close()
+        except OSError:
+            pass
+
+    def to_otlp(self, spans: list[dict]) -> dict:
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            self._attribute("service.name", self.service_name)
+                        ]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": __name__},
+                            "spans": [self._to_otlp_span(span) for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    @classmethod
+    def _to_otlp_span(cls, span: dict) -> dict:
+        start = int(span["start_time"] * 1e9)
+        return {
+            "traceId": span["trace_id"],
+            "spanId": span["span_id"],
+            "parentSpanId": span["parent_id"] or "",
+            "name": span["name"],
+            "kind": 1,
+            "startTimeUnixNano": str(start),
+            "endTimeUnixNano": str(start + int(span["duration_ms"] * 1e6)),
+            "attributes": [
+                cls._attribute(key, value) for key, value in span["attributes"].items()
+            ],
+            # OTLP status codes: 1 is OK, 2 is ERROR.
+            "status": {"code": 2 if span["status"] == "error" else 1},
+        }
+
+    @staticmethod
+    def _attribute(key: str, value) -> dict:
+        if isinstance(value, bool):
+            return {"key": key, "value": {"boolValue": value}}
+        if isinstance(value, int):
+            return {"key": key, "value": {"intValue": str(value)}}
+        if isinstance(value, float):
+            return {"key": key, "value": {"doubleValue": value}}
+
+        return {"key": key, "value": {"stringValue": str(value)}}
+
+
+@cache
+def get_exporter() -> SpanExporter:
+    return import_string(settings.TRACING_EXPORTER)()
+
+
+@receiver(setting_changed)
+def reset_exporter(setting, **kwargs):
+    if setting.startswith("TRACING_"):
+        get_exporter.cache_clear()
@@ -20,7 +20,14 @@ from django.urls import path
 from django.urls.conf import include
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
-from nevroth.views import simple_health_check
+from nevroth.views import (
+    metrics,
+    profile_download,
+    profiles,
+    profiling_token,
+    simple_health_check,
+    slow_queries,
+)
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -29,7 +36,12 @@ urlpatterns = [
     path("api/", include("habits.urls")),
     path("api/", include("friends.urls")),
     path("api/", include("notifications.urls")),
+    path("api/slow-queries/", slow_queries, name="slow_queries"),
+    path("api/profiles/", profiles, name="profiles"),
+    path("api/profiles/token/", profiling_token, name="profiling_token"),
+    path("api/profiles/<str:profile_id>/", profile_download, name="profile_download"),
     path("alive/", simple_health_check, name="simple_health_check"),
+    path("metrics/", metrics, name="metrics"),
     # Documentation
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     path(
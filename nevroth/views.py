@@ -2,10 +2,27 @@ from rest_framework.decorators import (
     api_view,
     authentication_classes,
     permission_classes,
+    renderer_classes,
     schema,
 )
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from drf_spectacular.utils import extend_schema
+from prometheus_client import CONTENT_TYPE_LATEST
+from rest_framework.renderers import BaseRenderer
 from rest_framework.response import Response
 
+from nevroth.metrics import generate_metrics
+from nevroth.profiling import PROFILING_HEADER, ProfileService
+from nevroth.serializers import (
+    ProfileSerializer,
+    ProfilingTokenSerializer,
+    SlowQueryFingerprintSerializer,
+    SlowQueryFingerprintsQuerySerializer,
+)
+from nevroth.slow_queries import SlowQueryService
+from notifications.permissions import IsAdminRole
+
 
 @api_view(["GET"])
 @schema(None)
@@ -13,3 +30,83 @@ from rest_framework.response import Response
 @permission_classes([])
 def simple_health_check(request):
     return Response()
+
+
+class PlainTextRenderer(BaseRenderer):
+    media_type = "text/plain"
+    format = "txt"
+
+
+@api_view(["GET"])
+@schema(None)
+@renderer_classes([PlainTextRenderer])
+@authentication_classes([])
+@permission_classes([])
+def metrics(request):
+    return HttpResponse(generate_metrics(), content_type=CONTENT_TYPE_LATEST)
+
+
+@extend_schema(
+    parameters=[SlowQueryFingerprintsQuerySerializer],
+    responses=SlowQueryFingerprintSerializer(many=True),
+    description="Get fingerprints of recently captured slow queries by total time",
+)
+@api_view(["GET"])
+@permission_classes([IsAdminRole])
+def slow_queries(request):
+    serializer = SlowQueryFingerprintsQuerySerializer(data=request.query_params)
+    serializer.is_valid(raise_exception=True)
+
+    fingerprints = SlowQueryService.get_top_fingerprints(
+        serializer.validated_data["limit"]
+    )
+
+    return Response(SlowQueryFingerprintSerializer(fingerprints, many=True).data)
+
+
+@extend_schema(
+    responses=ProfileSerializer(many=True),
+    description="Get the latest request profiles from the newest",
+)
+@api_view(["GET"])
+@permission_classes([IsAdminRole])
+def profiles(request):
+    return Response(ProfileSerializer(ProfileService.get_profiles(), many=True).data)
+
+
+@extend_schema(
+    responses={(200, "text/plain"): str},
+    description="Download a request profile as folded stacks, e.g. for speedscope",
+)
+@api_view(["GET"])
+@renderer_classes([PlainTextRenderer])
+@permission_classes([IsAdminRole])
+def profile_download(request, profile_id):
+    profile = ProfileService.get_profile(profile_id)
+    if profile is None:
+        raise Http404
+
+    response = HttpResponse(profile["stacks"], content_type="text/plain")
+    response["Content-Disposition"] = (
+        f'attachment; filename="profile-{profile_id}.folded"'
+    )
+    return response
+
+
+@extend_schema(
+    request=None,
+    responses=ProfilingTokenSerializer,
+    description="Get a token to profile requests sending it in the returned header",
+)
+@api_view(["POST"])
+@permission_classes([IsAdminRole])
+def profiling_token(request):
+    return Response(
+        ProfilingTokenSerializer(
+            {
+                "header": PROFILING_HEADER,
+                "token": ProfileService.make_token(),
+                "expires_in": settings.PROFILING_TOKEN_MAX_AGE_SECONDS,
+            }
+        ).data
+    )
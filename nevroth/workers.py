@@ -0,0 +1,24 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from uvicorn_worker import UvicornWorker
+
+
+class ASGIWorker(UvicornWorker):
+    """
+    Gunicorn worker serving the ASGI application with uvicorn.
+
+    The default executor of the worker's event loop, which runs sync code that
+    isn't thread sensitive and other blocking calls, is sized by gunicorn's
+    `threads` setting. Django runs requests in threads of their own instead,
+    which the application limits itself, see ConcurrencyLimitMiddleware. The
+    application doesn't speak the lifespan protocol.
+    """
+
+    CONFIG_KWARGS = {**UvicornWorker.CONFIG_KWARGS, "lifespan": "off"}
+
+    async def _serve(self):
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=self.cfg.threads, thread_name_prefix="asgi")
+        )
+        await super()._serve()
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import NotificationMessage, Notification
+from .models import BroadcastNotification, NotificationMessage, Notification
 
 
 @admin.register(NotificationMessage)
@@ -30,3 +30,17 @@ class NotificationAdmin(admin.ModelAdmin):
         )
 
     message_preview.short_description = "Message"
+
+
+@admin.register(BroadcastNotification)
+class BroadcastNotificationAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "message",
+        "habits_ids",
+        "audience_snapshot_at",
+        "published_at",
+    )
+    list_filter = ("published_at",)
+    search_fields = ("message__text",)
+    ordering = ("-created_at",)
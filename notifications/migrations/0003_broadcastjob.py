@@ -0,0 +1,117 @@
+# Generated by Django 5.2.3 on 2026-10-19 12:22
+
+import django.contrib.postgres.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notifications", "0002_alter_notification_is_read_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BroadcastJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "habits_ids",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.IntegerField(),
+                        size=None,
+                        verbose_name="habits IDs",
+                    ),
+                ),
+                (
+                    "invalid_habits_ids",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.IntegerField(),
+                        default=list,
+                        size=None,
+                        verbose_name="invalid habits IDs",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("scheduled", "scheduled"),
+                            ("running", "running"),
+                            ("completed", "completed"),
+                        ],
+                        default="scheduled",
+                        max_length=16,
+                        verbose_name="status",
+                    ),
+                ),
+                (
+                    "scheduled_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="scheduled at"
+                    ),
+                ),
+                (
+                    "last_recipient_id",
+                    models.BigIntegerField(default=0, verbose_name="last recipient ID"),
+                ),
+                (
+                    "total_recipients",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="total recipients"
+                    ),
+                ),
+                (
+                    "created_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="created count"
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="created at"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="updated at"),
+                ),
+                (
+                    "started_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="started at"
+                    ),
+                ),
+                (
+                    "finished_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="finished at"
+                    ),
+                ),
+                (
+                    "message",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="broadcast_jobs",
+                        to="notifications.notificationmessage",
+                        verbose_name="message",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["status", "updated_at"],
+                        name="notificatio_status_2675ad_idx",
+                    )
+                ],
+            },
+        ),
+    ]
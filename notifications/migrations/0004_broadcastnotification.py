@@ -0,0 +1,147 @@
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def move_jobs_audience_to_broadcasts(apps, schema_editor):
+    BroadcastJob = apps.get_model("notifications", "BroadcastJob")
+    BroadcastNotification = apps.get_model("notifications", "BroadcastNotification")
+
+    for job in BroadcastJob.objects.all():
+        job.broadcast = BroadcastNotification.objects.create(
+            message_id=job.message_id,
+            habits_ids=job.habits_ids,
+            audience_snapshot_at=job.scheduled_at or job.created_at,
+        )
+
+        # Started jobs have already created notification rows, so their
+        # broadcasts stay unpublished to avoid showing the message twice.
+        if job.status != "scheduled":
+            job.status = "completed"
+            job.finished_at = job.finished_at or job.updated_at
+
+        job.save(update_fields=["broadcast", "status", "finished_at"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notifications", "0003_broadcastjob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BroadcastNotification",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "habits_ids",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.IntegerField(),
+                        size=None,
+                        verbose_name="habits IDs",
+                    ),
+                ),
+                (
+                    "audience_snapshot_at",
+                    models.DateTimeField(verbose_name="audience snapshot at"),
+                ),
+                (
+                    "published_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="published at"
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="created at"),
+                ),
+                (
+                    "message",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="broadcasts",
+                        to="notifications.notificationmessage",
+                        verbose_name="message",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    django.contrib.postgres.indexes.GinIndex(
+                        fields=["habits_ids"], name="notifications_broadcast_habits"
+                    ),
+                    models.Index(
+                        fields=["-published_at"], name="notifications_broadcast_pub"
+                    ),
+                ],
+            },
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="broadcast",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="states",
+                to="notifications.broadcastnotification",
+                verbose_name="broadcast",
+            ),
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="is_dismissed",
+            field=models.BooleanField(default=False, verbose_name="is dismissed"),
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                condition=models.Q(("broadcast__isnull", True)),
+                fields=["recipient", "-sent_at"],
+                name="notifications_personal_feed",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="notification",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("broadcast__isnull", False)),
+                fields=("recipient", "broadcast"),
+                name="notifications_unique_broadcast_state",
+            ),
+        ),
+        migrations.AddField(
+            model_name="broadcastjob",
+            name="broadcast",
+            field=models.OneToOneField(
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="job",
+                to="notifications.broadcastnotification",
+                verbose_name="broadcast",
+            ),
+        ),
+        migrations.RenameField(
+            model_name="broadcastjob",
+            old_name="created_count",
+            new_name="delivered_count",
+        ),
+        migrations.AlterField(
+            model_name="broadcastjob",
+            name="delivered_count",
+            field=models.PositiveIntegerField(
+                default=0, verbose_name="delivered count"
+            ),
+        ),
+        migrations.RunPython(
+            move_jobs_audience_to_broadcasts, migrations.RunPython.noop
+        ),
+    ]
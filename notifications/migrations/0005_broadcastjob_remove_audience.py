@@ -0,0 +1,32 @@
+# Separate from 0004: PostgreSQL can't alter a table with pending deferred
+# constraint checks left by the data migration in the same transaction.
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notifications", "0004_broadcastnotification"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="broadcastjob",
+            name="broadcast",
+            field=models.OneToOneField(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="job",
+                to="notifications.broadcastnotification",
+                verbose_name="broadcast",
+            ),
+        ),
+        migrations.RemoveField(
+            model_name="broadcastjob",
+            name="habits_ids",
+        ),
+        migrations.RemoveField(
+            model_name="broadcastjob",
+            name="message",
+        ),
+    ]
@@ -1,3 +1,5 @@
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.conf import settings
 from django.core.files.storage import default_storage
@@ -21,6 +23,33 @@ class NotificationMessage(models.Model):
         return None
 
 
+class BroadcastNotification(models.Model):
+    """
+    Notification stored once for its whole audience.
+
+    The audience is every user who selected any of the habits before the
+    snapshot. Per-user `Notification` rows are only created once a user reads
+    or dismisses the broadcast, or drops the habit they got it through.
+    """
+
+    message = models.ForeignKey(
+        NotificationMessage,
+        on_delete=models.CASCADE,
+        related_name="broadcasts",
+        verbose_name=_("message"),
+    )
+    habits_ids = ArrayField(models.IntegerField(), verbose_name=_("habits IDs"))
+    audience_snapshot_at = models.DateTimeField(_("audience snapshot at"))
+    published_at = models.DateTimeField(_("published at"), null=True, blank=True)
+    created_at = models.DateTimeField(_("created at"), auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["habits_ids"], name="notifications_broadcast_habits"),
+            models.Index(fields=["-published_at"], name="notifications_broadcast_pub"),
+        ]
+
+
 class Notification(models.Model):
     recipient = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -34,5 +63,68 @@ class Notification(models.Model):
         related_name="notifications",
         verbose_name=_("message"),
     )
+    # Set for a user's state of a broadcast; such rows aren't feed items.
+    broadcast = models.ForeignKey(
+        BroadcastNotification,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="states",
+        verbose_name=_("broadcast"),
+    )
     is_read = models.BooleanField(_("is read"), default=False)
+    is_dismissed = models.BooleanField(_("is dismissed"), default=False)
     sent_at = models.DateTimeField(_("sent at"), auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["recipient", "-sent_at"],
+                condition=models.Q(broadcast__isnull=True),
+                name="notifications_personal_feed",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["recipient", "broadcast"],
+                condition=models.Q(broadcast__isnull=False),
+                name="notifications_unique_broadcast_state",
+            ),
+        ]
+
+
+class BroadcastJob(models.Model):
+    class Status(models.TextChoices):
+        SCHEDULED = "scheduled", _("scheduled")
+        RUNNING = "running", _("running")
+        COMPLETED = "completed", _("completed")
+
+    broadcast = models.OneToOneField(
+        BroadcastNotification,
+        on_delete=models.CASCADE,
+        related_name="job",
+        verbose_name=_("broadcast"),
+    )
+    invalid_habits_ids = ArrayField(
+        models.IntegerField(), default=list, verbose_name=_("invalid habits IDs")
+    )
+    status = models.CharField(
+        _("status"), max_length=16, choices=Status.choices, default=Status.SCHEDULED
+    )
+    scheduled_at = models.DateTimeField(_("scheduled at"), null=True, blank=True)
+
+    # Recipients are processed in ascending ID order, so the last processed ID
+    # is the point to resume from.
+    last_recipient_id = models.BigIntegerField(_("last recipient ID"), default=0)
+    total_recipients = models.PositiveIntegerField(_("total recipients"), default=0)
+    delivered_count = models.PositiveIntegerField(_("delivered count"), default=0)
+
+    created_at = models.DateTimeField(_("created at"), auto_now_add=True)
+    updated_at = models.DateTimeField(_("updated at"), auto_now=True)
+    started_at = models.DateTimeField(_("started at"), null=True, blank=True)
+    finished_at = models.DateTimeField(_("finished at"), null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "updated_at"]),
+        ]
@@ -22,6 +22,11 @@ class RoleBasedNotificationPermission(BasePermission):
         return request.user.role == User.Role.ADMIN
 
 
+class IsAdminRole(BasePermission):
+    def has_permission(self, request, view):
+        return request.user.is_authenticated and request.user.role == User.Role.ADMIN
+
+
 class IsNotificationOwner(BasePermission):
     def has_permission(self, request, view):
         return request.user.is_authenticated
@@ -2,8 +2,11 @@ from django.db import transaction
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
-from habits.models import UserHabit
-from notifications.models import Notification, NotificationMessage
+from drf_spectacular.utils import extend_schema_field, OpenApiTypes
+
+from notifications.models import BroadcastJob, Notification, NotificationMessage
+from notifications.services.broadcast import BroadcastJobService
+from notifications.services.notification import NotificationService
 
 User = get_user_model()
 
@@ -22,18 +25,60 @@ class NotificationSerializer(serializers.ModelSerializer):
         fields = ["id", "recipient", "message", "is_read", "sent_at"]
 
 
+class NotificationFeedItemSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    kind = serializers.ChoiceField(
+        choices=[NotificationService.PERSONAL, NotificationService.BROADCAST]
+    )
+    recipient = serializers.IntegerField()
+    message = NotificationMessageSerializer()
+    is_read = serializers.BooleanField()
+    sent_at = serializers.DateTimeField()
+
+
 class NotificationReadSerializer(serializers.ModelSerializer):
     class Meta:
         model = Notification
         fields = ["id"]
 
     def update(self, instance, validated_data):
-        instance.is_read = True
-        instance.save(update_fields=["is_read"])
+        NotificationService.mark_as_read(instance)
 
         return instance
 
 
+class NotificationBulkReadSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), required=False, max_length=1000
+    )
+    broadcasts_ids = serializers.ListField(
+        child=serializers.IntegerField(), required=False, max_length=1000
+    )
+    before = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs):
+        has_ids = "ids" in attrs or "broadcasts_ids" in attrs
+        if has_ids == ("before" in attrs):
+            raise serializers.ValidationError(
+                "Provide either notifications IDs or the 'before' timestamp."
+            )
+
+        return attrs
+
+    def save(self, **kwargs):
+        return NotificationService.mark_many_as_read(
+            self.context["request"].user, **self.validated_data
+        )
+
+
+class NotificationBulkReadResponseSerializer(serializers.Serializer):
+    marked = serializers.IntegerField()
+
+
+class UnreadCountSerializer(serializers.Serializer):
+    unread = serializers.IntegerField()
+
+
 class CreateNotificationForUserSerializer(serializers.Serializer):
     recipient = serializers.PrimaryKeyRelatedField(
         queryset=User.objects.all(),
@@ -58,21 +103,7 @@ class CreateNotificationForUserSerializer(serializers.Serializer):
 
         message = NotificationMessage.objects.create(**message_data)
 
-        notification = Notification.objects.create(
-            recipient=recipient,
-            message=message,
-        )
-
-        return notification
-
-
-class CreateNotificationsByHabitsResponseSerializer(serializers.Serializer):
-    created = serializers.IntegerField()
-    skipped = serializers.IntegerField()
-    invalid_habits_ids = serializers.ListField(
-        child=serializers.IntegerField(), default=[]
-    )
-    message = serializers.CharField()
+        return NotificationService.create_notification(recipient, message)
 
 
 class CreateNotificationsByHabitsSerializer(serializers.Serializer):
@@ -83,57 +114,55 @@ class CreateNotificationsByHabitsSerializer(serializers.Serializer):
     text = serializers.CharField(required=True, max_length=300)
     image_path = serializers.CharField(required=False, write_only=True)
     image_url = serializers.CharField(required=False, read_only=True)
+    scheduled_at = serializers.DateTimeField(required=False, allow_null=True)
 
-    @transaction.atomic
     def create(self, validated_data):
-        habits_ids = validated_data.get("habits_ids")
-        text = validated_data.get("text")
-        image_path = validated_data.get("image_path")
-        sender = self.context["request"].user
-
-        message_data = {
-            "sender": sender,
-            "text": text,
-        }
-        if image_path:
-            message_data["image_path"] = image_path
-
-        message = NotificationMessage.objects.create(**message_data)
-
-        user_habits = UserHabit.objects.filter(habit__id__in=habits_ids).select_related(
-            "user"
+        return BroadcastJobService.submit(
+            sender=self.context["request"].user,
+            text=validated_data.get("text"),
+            habits_ids=validated_data.get("habits_ids"),
+            image_path=validated_data.get("image_path"),
+            scheduled_at=validated_data.get("scheduled_at"),
         )
 
-        valid_habit_ids = set(user_habits.values_list("habit_id", flat=True))
-        invalid_ids = list(set(habits_ids) - valid_habit_ids)
 
-        notifications = [
-            Notification(
-                recipient=user_habit.user,
-                message=message,
-            )
-            for user_habit in user_habits
+class BroadcastJobSerializer(serializers.ModelSerializer):
+    habits_ids = serializers.ListField(
+        child=serializers.IntegerField(), source="broadcast.habits_ids"
+    )
+    delivered = serializers.IntegerField(source="delivered_count")
+    skipped = serializers.SerializerMethodField()
+    progress = serializers.SerializerMethodField()
+
+    class Meta:
+        model = BroadcastJob
+        fields = [
+            "id",
+            "status",
+            "habits_ids",
+            "invalid_habits_ids",
+            "scheduled_at",
+            "total_recipients",
+            "delivered",
+            "skipped",
+            "progress",
+            "created_at",
+            "started_at",
+            "finished_at",
         ]
-        Notification.objects.bulk_create(notifications, batch_size=1000)
-
-        created_count = len(notifications)
-
-        response_data = {
-            "created": created_count,
-            "skipped": len(invalid_ids),
-            "invalid_habits_ids": invalid_ids,
-            "message": (
-                f"Created {created_count} notification(s). "
-                f"{len(invalid_ids)} habits IDs were invalid and ignored."
-            ),
-        }
 
-        serialized_response = CreateNotificationsByHabitsResponseSerializer(
-            data=response_data
-        )
-        serialized_response.is_valid(raise_exception=True)
+    @extend_schema_field(OpenApiTypes.INT)
+    def get_skipped(self, obj):
+        return len(obj.invalid_habits_ids)
+
+    @extend_schema_field(OpenApiTypes.FLOAT)
+    def get_progress(self, obj):
+        if obj.status == BroadcastJob.Status.COMPLETED:
+            return 1.0
+        if not obj.total_recipients:
+            return 0.0
 
-        return serialized_response.data
+        return round(obj.delivered_count / obj.total_recipients, 4)
 
 
 class PreSignedSerializer(serializers.Serializer):
@@ -147,3 +176,12 @@ class PreSignedSerializer(serializers.Serializer):
 class ResponsePreSignedImageUploadSerializer(serializers.Serializer):
     image_path = serializers.CharField(required=True)
     pre_signed_url = serializers.CharField(required=True)
+
+
+class PreSignedBatchSerializer(serializers.Serializer):
+    MAX_IMAGES = 10
+    images = PreSignedSerializer(many=True, allow_empty=False, max_length=MAX_IMAGES)
+
+
+class ResponsePreSignedImageBatchUploadSerializer(serializers.Serializer):
+    images = ResponsePreSignedImageUploadSerializer(many=True)
@@ -0,0 +1,156 @@
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from notifications.models import (
+    BroadcastJob,
+    BroadcastNotification,
+    NotificationMessage,
+)
+from notifications.services.notification import NotificationService
+from notifications.services.realtime import NotificationPushService
+from notifications.services.unread_counter import UnreadNotificationCounterService
+
+User = get_user_model()
+
+
+class BroadcastJobService:
+    """
+    Service to deliver notifications by habits as paced background jobs.
+
+    A job publishes its broadcast, which makes it visible in the audience's
+    feeds, and then walks the audience in keyset chunks for delivery. Every
+    chunk is committed along with the job's progress, so an interrupted job
+    resumes right after its last committed chunk.
+    """
+
+    @classmethod
+    @transaction.atomic
+    def submit(
+        cls,
+        sender: User,
+        text: str,
+        habits_ids: list[int],
+        image_path: str | None = None,
+        scheduled_at: datetime | None = None,
+    ) -> BroadcastJob:
+        from notifications.tasks.broadcast import process_broadcast_job_task
+
+        message_data = {"sender": sender, "text": text}
+        if image_path:
+            message_data["image_path"] = image_path
+        message = NotificationMessage.objects.create(**message_data)
+
+        habits_ids = list(dict.fromkeys(habits_ids))
+        valid_habits_ids = NotificationService.get_habits_ids_with_users(habits_ids)
+
+        broadcast = BroadcastNotification.objects.create(
+            message=message,
+            habits_ids=[id_ for id_ in habits_ids if id_ in valid_habits_ids],
+            audience_snapshot_at=scheduled_at or timezone.now(),
+        )
+        job = BroadcastJob.objects.create(
+            broadcast=broadcast,
+            invalid_habits_ids=[
+                id_ for id_ in habits_ids if id_ not in valid_habits_ids
+            ],
+            scheduled_at=scheduled_at,
+        )
+
+        transaction.on_commit(
+            lambda: process_broadcast_job_task.apply_async((job.id,), eta=scheduled_at)
+        )
+
+        return job
+
+    @classmethod
+    def get_chunk_delay(cls) -> float:
+        """Seconds between chunks to keep to the configured rate"""
+        rate = settings.BROADCAST_MAX_NOTIFICATIONS_PER_SECOND
+        if not rate:
+            return 0
+
+        return settings.BROADCAST_CHUNK_SIZE / rate
+
+    @classmethod
+    @transaction.atomic
+    def process_next_chunk(cls, job_id: int) -> BroadcastJob | None:
+        """
+        Deliver the next chunk of the job.
+
+        Returns None if the job must not be processed now: it is locked by
+        another worker, not due yet, or another worker has just processed a
+        chunk (the later of two concurrent task chains then stops).
+        """
+        job = (
+            BroadcastJob.objects.select_for_update(skip_locked=True, of=("self",))
+            .select_related("broadcast__message")
+            .filter(id=job_id)
+            .first()
+        )
+        now = timezone.now()
+
+        if job is None or job.status == BroadcastJob.Status.COMPLETED:
+            return job
+        if job.scheduled_at and job.scheduled_at > now:
+            return None
+        if job.status == BroadcastJob.Status.RUNNING and job.updated_at > now - (
+            timedelta(seconds=cls.get_chunk_delay() / 2)
+        ):
+            return None
+
+        broadcast = job.broadcast
+        if job.status == BroadcastJob.Status.SCHEDULED:
+            # The audience is fixed at the moment the broadcast goes public.
+            broadcast.audience_snapshot_at = broadcast.published_at = now
+            broadcast.save(update_fields=["audience_snapshot_at", "published_at"])
+
+            job.status = BroadcastJob.Status.RUNNING
+            job.started_at = now
+            job.total_recipients = NotificationService.get_broadcast_audience(
+                broadcast
+            ).count()
+
+        recipients_ids = NotificationService.get_broadcast_recipients_ids(
+            broadcast,
+            after_user_id=job.last_recipient_id,
+            limit=settings.BROADCAST_CHUNK_SIZE,
+        )
+        job.delivered_count += len(recipients_ids)
+        if recipients_ids:
+            job.last_recipient_id = recipients_ids[-1]
+            # A counter cached since publishing may already include the broadcast,
+            # so the chunk's counters are recomputed rather than incremented.
+            transaction.on_commit(
+                lambda: UnreadNotificationCounterService.invalidate(recipients_ids)
+            )
+            transaction.on_commit(
+                lambda: NotificationPushService.push(
+                    recipients_ids,
+                    NotificationService.get_broadcast_feed_item(broadcast),
+                ),
+                robust=True,
+            )
+
+        if len(recipients_ids) < settings.BROADCAST_CHUNK_SIZE:
+            job.status = BroadcastJob.Status.COMPLETED
+            job.finished_at = now
+
+        job.save()
+        return job
+
+    @classmethod
+    def get_stalled_jobs_ids(cls) -> list[int]:
+        """Return due jobs which haven't progressed for a while"""
+        now = timezone.now()
+        stalled_before = now - timedelta(seconds=settings.BROADCAST_JOB_STALL_SECONDS)
+
+        return list(
+            BroadcastJob.objects.exclude(status=BroadcastJob.Status.COMPLETED)
+            .filter(updated_at__lt=stalled_before)
+            .exclude(scheduled_at__gt=now)
+            .values_list("id", flat=True)
+        )
@@ -0,0 +1,344 @@
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
+from django.contrib.postgres.expressions import ArraySubquery
+from django.contrib.postgres.fields import ArrayField
+from django.db import transaction
+from django.db.models import (
+    CharField,
+    Exists,
+    ExpressionWrapper,
+    F,
+    Func,
+    IntegerField,
+    OuterRef,
+    Q,
+    Value,
+)
+from django.utils import timezone
+
+from habits.models import UserHabit
+from notifications.models import (
+    BroadcastNotification,
+    Notification,
+    NotificationMessage,
+)
+from notifications.services.realtime import NotificationPushService
+from notifications.services.unread_counter import UnreadNotificationCounterService
+
+User = get_user_model()
+
+HABITS_IDS_FIELD = ArrayField(IntegerField())
+
+FEED_FIELDS = ["item_id", "kind", "item_message_id", "item_is_read", "item_sent_at"]
+
+
+class NotificationService:
+    PERSONAL = "personal"
+    BROADCAST = "broadcast"
+
+    @classmethod
+    def get_habits_ids_with_users(cls, habits_ids: list[int]) -> set[int]:
+        return set(
+            UserHabit.objects.filter(habit_id__in=habits_ids)
+            .values_list("habit_id", flat=True)
+            .distinct()
+        )
+
+    @classmethod
+    def get_broadcast_audience(cls, broadcast: BroadcastNotification):
+        """Return IDs of users in the broadcast's audience"""
+        return (
+            UserHabit.objects.filter(
+                habit_id__in=broadcast.habits_ids,
+                created_at__lte=broadcast.audience_snapshot_at,
+            )
+            .values_list("user_id", flat=True)
+            .distinct()
+        )
+
+    @classmethod
+    def get_broadcast_recipients_ids(
+        cls, broadcast: BroadcastNotification, after_user_id: int, limit: int
+    ) -> list[int]:
+        """Return the next keyset chunk of the audience in ascending ID order"""
+        return list(
+            cls.get_broadcast_audience(broadcast)
+            .filter(user_id__gt=after_user_id)
+            .order_by("user_id")[:limit]
+        )
+
+    @classmethod
+    def get_personal_notifications(cls, user: User):
+        return Notification.objects.filter(recipient_id=user.id, broadcast__isnull=True)
+
+    @classmethod
+    def get_user_broadcasts(cls, user: User):
+        """
+        Return published broadcasts addressed to the user and not dismissed.
+
+        A broadcast is addressed to the user if they selected any of its habits
+        before its audience snapshot. Broadcasts the user has a state row for
+        stay addressed after they drop the habit.
+        """
+        user_habits = UserHabit.objects.filter(user_id=user.id)
+        selected_before_snapshot = user_habits.alias(
+            broadcast_habits_ids=ExpressionWrapper(
+                OuterRef("habits_ids"), output_field=HABITS_IDS_FIELD
+            )
+        ).filter(
+            broadcast_habits_ids__contains=Func(
+                F("habit_id"),
+                template="ARRAY[%(expressions)s]",
+                output_field=HABITS_IDS_FIELD,
+            ),
+            created_at__lte=OuterRef("audience_snapshot_at"),
+        )
+        states = Notification.objects.filter(
+            broadcast=OuterRef("pk"), recipient_id=user.id
+        )
+        received = Notification.objects.filter(
+            recipient_id=user.id, broadcast__isnull=False
+        ).values("broadcast_id")
+
+        return (
+            BroadcastNotification.objects.filter(
+                Q(
+                    Exists(selected_before_snapshot),
+                    habits_ids__overlap=ArraySubquery(user_habits.values("habit_id")),
+                )
+                | Q(id__in=received),
+                published_at__lte=timezone.now(),
+            )
+            .exclude(Exists(states.filter(is_dismissed=True)))
+            .annotate(is_read=Exists(states.filter(is_read=True)))
+        )
+
+    @classmethod
+    def get_feed(cls, user: User):
+        """
+        Return personal notifications and broadcasts of the user as one feed.
+
+        Items are rows with `FEED_FIELDS` ordered from the newest; use
+        `hydrate_feed` to turn a page of them into feed items.
+        """
+        personal = cls.get_personal_notifications(user).annotate(
+            item_id=F("id"),
+            kind=Value(cls.PERSONAL, output_field=CharField()),
+            item_message_id=F("message_id"),
+            item_is_read=F("is_read"),
+            item_sent_at=F("sent_at"),
+        )
+        broadcasts = cls.get_user_broadcasts(user).annotate(
+            item_id=F("id"),
+            kind=Value(cls.BROADCAST, output_field=CharField()),
+            item_message_id=F("message_id"),
+            item_is_read=F("is_read"),
+            item_sent_at=F("published_at"),
+        )
+
+        return (
+            personal.values(*FEED_FIELDS)
+            .union(broadcasts.values(*FEED_FIELDS), all=True)
+            .order_by("-item_sent_at", "-item_id")
+        )
+
+    @classmethod
+    def hydrate_feed(cls, user: User, rows: list[dict]) -> list[dict]:
+        messages = NotificationMessage.objects.in_bulk(
+            {row["item_message_id"] for row in rows}
+        )
+
+        return [
+            {
+                "id": row["item_id"],
+                "kind": row["kind"],
+                "recipient": user.id,
+                "message": messages[row["item_message_id"]],
+                "is_read": row["item_is_read"],
+                "sent_at": row["item_sent_at"],
+            }
+            for row in rows
+        ]
+
+    @classmethod
+    def create_notification(cls, recipient: User, message: NotificationMessage):
+        notification = Notification.objects.create(recipient=recipient, message=message)
+        cls._adjust_unread_count_on_commit([recipient.id], 1)
+        transaction.on_commit(
+            lambda: NotificationPushService.push(
+                [recipient.id], cls.get_notification_feed_item(notification)
+            ),
+            robust=True,
+        )
+
+        return notification
+
+    @classmethod
+    def delete_notification(cls, notification: Notification):
+        notification.delete()
+        if not notification.is_read:
+            cls._adjust_unread_count_on_commit([notification.recipient_id], -1)
+
+    @classmethod
+    def count_unread(cls, user: User) -> int:
+        personal = cls.get_personal_notifications(user).filter(is_read=False).count()
+        broadcasts = cls.get_user_broadcasts(user).filter(is_read=False).count()
+
+        return personal + broadcasts
+
+    @classmethod
+    def get_unread_count(cls, user: User) -> int:
+        count = UnreadNotificationCounterService.get(user.id)
+        if count is None:
+            recount = UnreadNotificationCounterService.start_recount(user.id)
+            count = cls.count_unread(user)
+            UnreadNotificationCounterService.set(user.id, count, recount)
+
+        return count
+
+    @classmethod
+    def mark_as_read(cls, notification: Notification):
+        updated = Notification.objects.filter(id=notification.id, is_read=False).update(
+            is_read=True
+        )
+        notification.is_read = True
+        cls._adjust_unread_count_on_commit([notification.recipient_id], -updated)
+
+    @classmethod
+    @transaction.atomic
+    def mark_many_as_read(
+        cls,
+        user: User,
+        ids: list[int] = None,
+        broadcasts_ids: list[int] = None,
+        before: datetime | None = None,
+    ) -> int:
+        """
+        Mark personal notifications and broadcasts of the user as read.
+
+        Notifications are selected either by their IDs or by being sent at or
+        before the moment. Returns the number of notifications marked as read.
+        """
+        if before is not None:
+            personal_filter = Q(sent_at__lte=before)
+            broadcasts_filter = Q(published_at__lte=before)
+        else:
+            personal_filter = Q(id__in=ids or [])
+            broadcasts_filter = Q(id__in=broadcasts_ids or [])
+
+        marked = (
+            cls.get_personal_notifications(user)
+            .filter(personal_filter, is_read=False)
+            .update(is_read=True)
+        )
+
+        unread_broadcasts = list(
+            cls.get_user_broadcasts(user)
+            .filter(broadcasts_filter, is_read=False)
+            .values_list("id", "message_id")
+        )
+        if unread_broadcasts:
+            # Existing state rows are updated; inserting them again is skipped.
+            Notification.objects.filter(
+                recipient_id=user.id,
+                broadcast_id__in=[
+                    broadcast_id for broadcast_id, _ in unread_broadcasts
+                ],
+            ).update(is_read=True)
+            Notification.objects.bulk_create(
+                [
+                    Notification(
+                        recipient_id=user.id,
+                        broadcast_id=broadcast_id,
+                        message_id=message_id,
+                        is_read=True,
+                    )
+                    for broadcast_id, message_id in unread_broadcasts
+                ],
+                ignore_conflicts=True,
+            )
+            marked += len(unread_broadcasts)
+
+        cls._adjust_unread_count_on_commit([user.id], -marked)
+
+        return marked
+
+    @classmethod
+    def get_notification_feed_item(cls, notification: Notification) -> dict:
+        return {
+            "id": notification.id,
+            "kind": cls.PERSONAL,
+            "recipient": notification.recipient_id,
+            "message": notification.message,
+            "is_read": notification.is_read,
+            "sent_at": notification.sent_at,
+        }
+
+    @classmethod
+    def get_broadcast_feed_item(cls, broadcast: BroadcastNotification) -> dict:
+        """Return the broadcast as a new feed item of any user in its audience"""
+        return {
+            "id": broadcast.id,
+            "kind": cls.BROADCAST,
+            "recipient": None,
+            "message": broadcast.message,
+            "is_read": False,
+            "sent_at": broadcast.published_at,
+        }
+
+    @classmethod
+    def keep_received_broadcasts(cls, user: User, habits_ids: list[int]):
+        """
+        Keep broadcasts the user got through habits they're about to drop.
+
+        Call before removing the habits; the broadcasts get state rows, so they
+        stay in the user's feed with their unread state.
+        """
+        received = list(
+            cls.get_user_broadcasts(user)
+            .filter(habits_ids__overlap=habits_ids)
+            .values_list("id", "message_id")
+        )
+        Notification.objects.bulk_create(
+            [
+                Notification(
+                    recipient_id=user.id,
+                    broadcast_id=broadcast_id,
+                    message_id=message_id,
+                )
+                for broadcast_id, message_id in received
+            ],
+            ignore_conflicts=True,
+        )
+
+    @classmethod
+    def mark_broadcast_as_read(cls, user: User, broadcast: BroadcastNotification):
+        """Mark a broadcast annotated by `get_user_broadcasts` as read"""
+        cls._update_broadcast_state(user, broadcast, is_read=True)
+
+    @classmethod
+    def dismiss_broadcast(cls, user: User, broadcast: BroadcastNotification):
+        """Dismiss a broadcast annotated by `get_user_broadcasts`"""
+        cls._update_broadcast_state(user, broadcast, is_dismissed=True)
+
+    @classmethod
+    def _update_broadcast_state(
+        cls, user: User, broadcast: BroadcastNotification, **state
+    ):
+        # The user's row for a broadcast only appears once it has some state.
+        Notification.objects.update_or_create(
+            recipient_id=user.id,
+            broadcast=broadcast,
+            defaults=state,
+            create_defaults={**state, "message_id": broadcast.message_id},
+        )
+        if not broadcast.is_read:
+            cls._adjust_unread_count_on_commit([user.id], -1)
+
+    @classmethod
+    def _adjust_unread_count_on_commit(cls, users_ids: list[int], amount: int):
+        if amount:
+            transaction.on_commit(
+                lambda: UnreadNotificationCounterService.adjust(users_ids, amount)
+            )
@@ -0,0 +1,56 @@
+import asyncio
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+
+from chats.consumers.groups import get_user_chat_list_group_name
+from chats.enums import ChatWebSocketServerEventType
+from nevroth.tracing import inject, start_span
+
+
+class NotificationPushService:
+    """
+    Service to push new notifications to chat list sockets of their recipients.
+
+    Pushing is best effort: users who aren't connected see the notifications
+    in their feed.
+    """
+
+    @classmethod
+    def push(cls, users_ids: list[int], item: dict):
+        """Push a feed item, as built by `NotificationService`, to the users"""
+        if not users_ids:
+            return
+
+        # The item is serialized once; only its recipient differs between users.
+        notification = cls._serialize(item)
+        with start_span("notifications.push", recipients=len(users_ids)):
+            async_to_sync(cls._send)(users_ids, notification)
+
+    @classmethod
+    def _serialize(cls, item: dict) -> dict:
+        from notifications.serializers import NotificationFeedItemSerializer
+
+        return NotificationFeedItemSerializer(item).data
+
+    @classmethod
+    async def _send(cls, users_ids: list[int], notification: dict):
+        channel_layer = get_channel_layer()
+        batch_size = settings.NOTIFICATIONS_PUSH_BATCH_SIZE
+
+        for start in range(0, len(users_ids), batch_size):
+            await asyncio.gather(
+                *(
+                    channel_layer.group_send(
+                        get_user_chat_list_group_name(user_id),
+                        inject(
+                            {
+                                "type": ChatWebSocketServerEventType.NEW_NOTIFICATION,
+                                "notification": {**notification, "recipient": user_id},
+                            }
+                        ),
+                    )
+                    for user_id in users_ids[start : start + batch_size]
+                )
+            )
@@ -0,0 +1,92 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from nevroth.retention import RetentionPolicy
+from notifications.models import (
+    BroadcastJob,
+    BroadcastNotification,
+    Notification,
+    NotificationMessage,
+)
+from notifications.services.notification import NotificationService
+from notifications.services.unread_counter import UnreadNotificationCounterService
+
+
+class NotificationRetentionService:
+    """Retention policies of notifications, ordered so that parents go last"""
+
+    @classmethod
+    def get_policies(cls) -> list[RetentionPolicy]:
+        return [
+            RetentionPolicy("read_notifications", cls.get_expired_read_notifications),
+            RetentionPolicy(
+                "broadcast_states",
+                cls.get_expired_broadcast_states,
+                after_delete=cls.invalidate_states_recipients,
+            ),
+            RetentionPolicy(
+                "broadcasts",
+                cls.get_expired_broadcasts,
+                after_delete=cls.invalidate_broadcasts_audience,
+            ),
+            RetentionPolicy(
+                "orphaned_notification_messages", cls.get_orphaned_messages
+            ),
+        ]
+
+    @classmethod
+    def get_expired_read_notifications(cls):
+        # A broadcast's state row is kept, or the broadcast would be unread again.
+        return Notification.objects.filter(
+            broadcast__isnull=True,
+            is_read=True,
+            sent_at__lt=timezone.now()
+            - timedelta(days=settings.READ_NOTIFICATION_RETENTION_DAYS),
+        )
+
+    @classmethod
+    def get_expired_broadcast_states(cls):
+        return Notification.objects.filter(
+            broadcast__in=cls.get_expired_broadcasts().values("id")
+        )
+
+    @classmethod
+    def get_expired_broadcasts(cls):
+        return BroadcastNotification.objects.filter(
+            published_at__lt=timezone.now()
+            - timedelta(days=settings.BROADCAST_NOTIFICATION_RETENTION_DAYS),
+            job__status=BroadcastJob.Status.COMPLETED,
+        )
+
+    @classmethod
+    def invalidate_states_recipients(cls, states: list[Notification]):
+        # An unread state row keeps a broadcast in the feed of a user who
+        # dropped its habits.
+        UnreadNotificationCounterService.invalidate(
+            list({state.recipient_id for state in states if not state.is_read})
+        )
+
+    @classmethod
+    def invalidate_broadcasts_audience(cls, broadcasts: list[BroadcastNotification]):
+        # Purged broadcasts may still be counted as unread by cached counters.
+        for broadcast in broadcasts:
+            audience = NotificationService.get_broadcast_audience(broadcast)
+            users_ids = []
+            for user_id in audience.iterator():
+                users_ids.append(user_id)
+                if len(users_ids) == settings.RETENTION_BATCH_SIZE:
+                    UnreadNotificationCounterService.invalidate(users_ids)
+                    users_ids = []
+            UnreadNotificationCounterService.invalidate(users_ids)
+
+    @classmethod
+    def get_orphaned_messages(cls):
+        return NotificationMessage.objects.filter(
+            ~Exists(Notification.objects.filter(message=OuterRef("pk"))),
+            ~Exists(BroadcastNotification.objects.filter(message=OuterRef("pk"))),
+            created_at__lt=timezone.now()
+            - timedelta(hours=settings.ORPHANED_NOTIFICATION_MESSAGE_RETENTION_HOURS),
+        )
@@ -1,3 +1,5 @@
+import os
+import threading
 import uuid
 import boto3
 from django.conf import settings
@@ -6,16 +8,37 @@ from django.conf import settings
 class S3Service:
     """Service for handling S3 operations such as generating pre-signed URLs."""
 
-    @staticmethod
-    def get_s3_client():
-        """Create and return an S3 client."""
-        return boto3.client(
-            "s3",
-            region_name=settings.AWS_S3_REGION_NAME,
-            aws_access_key_id=settings.AWS_S3_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_S3_SECRET_ACCESS_KEY,
-            endpoint_url=settings.AWS_S3_ENDPOINT_URL,
-        )
+    # Clients are thread-safe, but mustn't be shared with forked processes.
+    _client = None
+    _client_pid = None
+    _client_lock = threading.Lock()
+
+    @classmethod
+    def get_s3_client(cls):
+        """Return the S3 client of the current process, creating it once."""
+        with cls._client_lock:
+            if cls._client is None or cls._client_pid != os.getpid():
+                cls._client = boto3.client(
+                    "s3",
+                    region_name=settings.AWS_S3_REGION_NAME,
+                    aws_access_key_id=settings.AWS_S3_ACCESS_KEY_ID,
+                    aws_secret_access_key=settings.AWS_S3_SECRET_ACCESS_KEY,
+                    endpoint_url=settings.AWS_S3_ENDPOINT_URL,
+                )
+                cls._client_pid = os.getpid()
+
+            return cls._client
+
+    @classmethod
+    def generate_presign_urls(cls, images: list[dict]) -> list[tuple[str, str]]:
+        """Generate pre-signed upload URLs for several images at once."""
+        return [
+            cls.generate_presign_url(
+                image_extension=image["image_extension"],
+                content_type=image.get("content_type", "application/octet-stream"),
+            )
+            for image in images
+        ]
 
     @classmethod
     def generate_presign_url(
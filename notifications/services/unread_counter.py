@@ -0,0 +1,107 @@
+import uuid
+
+from django.conf import settings
+from django_redis import get_redis_connection
+
+# KEYS: counter, recount; ARGV: amount
+ADJUST_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    redis.call('DEL', KEYS[2])
+    return -1
+end
+local count = redis.call('INCRBY', KEYS[1], ARGV[1])
+if count < 0 then
+    redis.call('SET', KEYS[1], 0, 'KEEPTTL')
+    return 0
+end
+return count
+"""
+
+# KEYS: counter, recount; ARGV: recount token, count, ttl
+STORE_SCRIPT = """
+if redis.call('GET', KEYS[2]) ~= ARGV[1] then
+    return 0
+end
+redis.call('DEL', KEYS[2])
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3], 'NX')
+return 1
+"""
+
+
+class UnreadNotificationCounterService:
+    """
+    Service to cache the number of unread notifications of users in Redis.
+
+    A counter is computed from the database on the first read and then kept up
+    to date by atomic adjustments, which are skipped while the counter isn't
+    cached. A recount is marked before the database is read, and adjustments
+    or invalidations arriving meanwhile remove the mark, so a count that may
+    have missed them isn't stored. Counters expire, so a drifted counter is
+    eventually recomputed.
+    """
+
+    @classmethod
+    def _key(cls, user_id: int) -> str:
+        return f"{settings.NOTIFICATIONS_UNREAD_KEY_PREFIX}:{user_id}"
+
+    @classmethod
+    def _recount_key(cls, user_id: int) -> str:
+        return f"{cls._key(user_id)}:recount"
+
+    @classmethod
+    def _get_connection(cls):
+        return get_redis_connection("default")
+
+    @classmethod
+    def get(cls, user_id: int) -> int | None:
+        count = cls._get_connection().get(cls._key(user_id))
+        return None if count is None else int(count)
+
+    @classmethod
+    def start_recount(cls, user_id: int) -> str:
+        """Mark a recount of the user's counter, call before reading the database"""
+        token = uuid.uuid4().hex
+        cls._get_connection().set(
+            cls._recount_key(user_id),
+            token,
+            ex=settings.NOTIFICATIONS_UNREAD_RECOUNT_TIMEOUT_SECONDS,
+        )
+
+        return token
+
+    @classmethod
+    def set(cls, user_id: int, count: int, recount: str) -> bool:
+        """
+        Cache the count of a recount, unless the counter changed since it started.
+
+        A counter cached and adjusted by a concurrent request isn't overwritten.
+        """
+        script = cls._get_connection().register_script(STORE_SCRIPT)
+        return bool(
+            script(
+                keys=[cls._key(user_id), cls._recount_key(user_id)],
+                args=[recount, count, settings.NOTIFICATIONS_UNREAD_TTL_SECONDS],
+            )
+        )
+
+    @classmethod
+    def adjust(cls, users_ids: list[int], amount: int):
+        if not users_ids or not amount:
+            return
+
+        script = cls._get_connection().register_script(ADJUST_SCRIPT)
+        pipeline = cls._get_connection().pipeline(transaction=False)
+        for user_id in users_ids:
+            script(
+                keys=[cls._key(user_id), cls._recount_key(user_id)],
+                args=[amount],
+                client=pipeline,
+            )
+        pipeline.execute()
+
+    @classmethod
+    def invalidate(cls, users_ids: list[int]):
+        if users_ids:
+            cls._get_connection().delete(
+                *map(cls._key, users_ids), *map(cls._recount_key, users_ids)
+            )
@@ -0,0 +1,20 @@
+from celery import shared_task
+
+from notifications.models import BroadcastJob
+from notifications.services.broadcast import BroadcastJobService
+
+
+@shared_task
+def process_broadcast_job_task(job_id: int):
+    job = BroadcastJobService.process_next_chunk(job_id)
+
+    if job is not None and job.status == BroadcastJob.Status.RUNNING:
+        process_broadcast_job_task.apply_async(
+            (job_id,), countdown=BroadcastJobService.get_chunk_delay()
+        )
+
+
+@shared_task
+def resume_broadcast_jobs_task():
+    for job_id in BroadcastJobService.get_stalled_jobs_ids():
+        process_broadcast_job_task.delay(job_id)
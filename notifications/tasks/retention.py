@@ -0,0 +1,12 @@
+from celery import shared_task
+
+from nevroth.retention import RetentionService
+from notifications.services.retention import NotificationRetentionService
+
+
+@shared_task
+def purge_expired_notifications_task():
+    return {
+        policy.name: RetentionService.purge(policy)
+        for policy in NotificationRetentionService.get_policies()
+    }
@@ -1,4 +1,5 @@
 import factory
+from django.utils import timezone
 from factory.django import DjangoModelFactory
 
 from accounts.tests.factories.user import BaseUserFactory
@@ -6,7 +7,7 @@ from accounts.tests.factories.user import BaseUserFactory
 from faker import Faker
 
 from habits.tests.factories.habit import HabitFactory
-from notifications.models import Notification
+from notifications.models import BroadcastJob, BroadcastNotification, Notification
 from notifications.tests.factories.helpers import generate_s3_path
 from notifications.tests.factories.message import NotificationMessageFactory
 
@@ -21,6 +22,23 @@ class NotificationFactory(DjangoModelFactory):
     message = factory.SubFactory(NotificationMessageFactory)
 
 
+class BroadcastNotificationFactory(DjangoModelFactory):
+    class Meta:
+        model = BroadcastNotification
+
+    message = factory.SubFactory(NotificationMessageFactory)
+    habits_ids = factory.LazyFunction(list)
+    audience_snapshot_at = factory.LazyFunction(timezone.now)
+    published_at = factory.LazyAttribute(lambda o: o.audience_snapshot_at)
+
+
+class BroadcastJobFactory(DjangoModelFactory):
+    class Meta:
+        model = BroadcastJob
+
+    broadcast = factory.SubFactory(BroadcastNotificationFactory)
+
+
 class NotificationCreateForUserPayloadFactory(factory.Factory):
     class Meta:
         model = dict
@@ -0,0 +1,41 @@
+from unittest import mock
+
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from accounts.tests.factories.user import AdminFactory, MemberFactory
+from habits.tests.factories.habit import HabitFactory, UserHabitFactory
+from notifications.models import BroadcastJob
+from notifications.services.broadcast import BroadcastJobService
+from notifications.tasks.broadcast import process_broadcast_job_task
+
+
+@override_settings(BROADCAST_CHUNK_SIZE=1, BROADCAST_MAX_NOTIFICATIONS_PER_SECOND=2)
+class ProcessBroadcastJobTaskTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        habit = HabitFactory()
+        for user in MemberFactory.create_batch(2):
+            UserHabitFactory(user=user, habit=habit)
+
+        cls.job = BroadcastJobService.submit(
+            sender=AdminFactory(), text="Hello", habits_ids=[habit.id]
+        )
+
+    @mock.patch("notifications.tasks.broadcast.process_broadcast_job_task.apply_async")
+    def test_task_schedules_next_chunk_at_configured_rate(self, apply_async):
+        """Test that the task paces the next chunk by the configured rate."""
+        process_broadcast_job_task(self.job.id)
+
+        apply_async.assert_called_once_with((self.job.id,), countdown=0.5)
+
+    @mock.patch("notifications.tasks.broadcast.process_broadcast_job_task.apply_async")
+    def test_task_stops_when_job_is_completed(self, apply_async):
+        """Test that no chunk is scheduled after the job is completed."""
+        BroadcastJob.objects.filter(id=self.job.id).update(
+            status=BroadcastJob.Status.COMPLETED
+        )
+
+        process_broadcast_job_task(self.job.id)
+
+        apply_async.assert_not_called()
@@ -0,0 +1,118 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from accounts.tests.factories.user import AdminFactory, MemberFactory
+from nevroth.retention import RetentionPolicy, RetentionService
+from notifications.models import (
+    BroadcastJob,
+    BroadcastNotification,
+    Notification,
+    NotificationMessage,
+)
+from notifications.tasks.retention import purge_expired_notifications_task
+from notifications.tests.factories.message import NotificationMessageFactory
+from notifications.tests.factories.notification import (
+    BroadcastNotificationFactory,
+    NotificationFactory,
+)
+
+
+@override_settings(
+    READ_NOTIFICATION_RETENTION_DAYS=30,
+    BROADCAST_NOTIFICATION_RETENTION_DAYS=90,
+    ORPHANED_NOTIFICATION_MESSAGE_RETENTION_HOURS=24,
+    RETENTION_BATCH_SIZE=2,
+    RETENTION_BATCH_SLEEP_SECONDS=0,
+)
+class PurgeExpiredNotificationsTaskTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = MemberFactory()
+        now = timezone.now()
+
+        cls.old_read = NotificationFactory.create_batch(
+            3, recipient=cls.member, is_read=True
+        )
+        cls.old_unread = NotificationFactory(recipient=cls.member)
+        cls.recent_read = NotificationFactory(recipient=cls.member, is_read=True)
+        Notification.objects.filter(
+            id__in=[n.id for n in cls.old_read] + [cls.old_unread.id]
+        ).update(sent_at=now - timedelta(days=31))
+
+        cls.old_broadcast = BroadcastNotificationFactory(
+            published_at=now - timedelta(days=91)
+        )
+        cls.recent_broadcast = BroadcastNotificationFactory()
+        for broadcast in [cls.old_broadcast, cls.recent_broadcast]:
+            BroadcastJob.objects.create(
+                broadcast=broadcast, status=BroadcastJob.Status.COMPLETED
+            )
+            NotificationFactory(
+                recipient=cls.member,
+                broadcast=broadcast,
+                message=broadcast.message,
+                is_read=True,
+                sent_at=now - timedelta(days=91),
+            )
+
+        cls.fresh_orphan = NotificationMessageFactory(sender=AdminFactory())
+
+    def test_expired_rows_are_purged(self):
+        """Test that expired notifications, broadcasts and messages are deleted."""
+        old_messages_ids = [n.message_id for n in self.old_read] + [
+            self.old_broadcast.message_id
+        ]
+
+        result = purge_expired_notifications_task()
+
+        self.assertEqual(
+            result,
+            {
+                "read_notifications": 3,
+                "broadcast_states": 1,
+                "broadcasts": 2,  # the broadcast and its job
+                "orphaned_notification_messages": 0,
+            },
+        )
+        self.assertCountEqual(
+            Notification.objects.filter(broadcast__isnull=True),
+            [self.old_unread, self.recent_read],
+        )
+        self.assertQuerySetEqual(
+            BroadcastNotification.objects.all(), [self.recent_broadcast]
+        )
+        self.assertTrue(
+            Notification.objects.filter(broadcast=self.recent_broadcast).exists()
+        )
+
+        # Messages of purged rows are only removed once they are old enough.
+        NotificationMessage.objects.update(
+            created_at=timezone.now() - timedelta(days=2)
+        )
+        result = purge_expired_notifications_task()
+
+        self.assertEqual(
+            result["orphaned_notification_messages"], len(old_messages_ids) + 1
+        )
+        self.assertFalse(
+            NotificationMessage.objects.filter(id__in=old_messages_ids).exists()
+        )
+
+    @mock.patch("nevroth.retention.time.sleep")
+    def test_rows_are_deleted_in_keyset_batches(self, sleep):
+        """Test that a policy deletes in batches and pauses between full ones."""
+        policy = RetentionPolicy(
+            "test", lambda: Notification.objects.filter(recipient=self.member)
+        )
+        expected = Notification.objects.filter(recipient=self.member).count()
+
+        # 7 rows: three full batches and a partial one, each selected and deleted
+        with self.assertNumQueries(4 * 2):
+            deleted = RetentionService.purge(policy)
+
+        self.assertEqual(deleted, expected)
+        self.assertEqual(sleep.call_count, 3)
@@ -0,0 +1,115 @@
+from datetime import timedelta
+
+import jsonschema
+
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.tests.factories.user import AdminFactory, MemberFactory
+from habits.tests.factories.habit import HabitFactory, UserHabitFactory
+from notifications.models import BroadcastJob, Notification
+from notifications.services.broadcast import BroadcastJobService
+from notifications.tests.test_notification import broadcast_job_schema
+
+
+@override_settings(BROADCAST_CHUNK_SIZE=2, BROADCAST_MAX_NOTIFICATIONS_PER_SECOND=0)
+class BroadcastJobTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = AdminFactory()
+        cls.member = MemberFactory()
+
+        cls.habit = HabitFactory()
+        cls.other_habit = HabitFactory()
+        cls.users = MemberFactory.create_batch(5)
+        for user in cls.users:
+            UserHabitFactory(user=user, habit=cls.habit)
+        UserHabitFactory(user=cls.users[0], habit=cls.other_habit)
+
+    def _submit(self, **kwargs):
+        return BroadcastJobService.submit(
+            sender=self.admin,
+            text="Keep going!",
+            habits_ids=[self.habit.id, self.other_habit.id],
+            **kwargs,
+        )
+
+    def test_job_is_processed_in_chunks(self):
+        """Test that a job delivers recipients chunk by chunk in ID order."""
+        job = self._submit()
+
+        job = BroadcastJobService.process_next_chunk(job.id)
+        self.assertEqual(job.status, BroadcastJob.Status.RUNNING)
+        self.assertEqual(job.total_recipients, 5)
+        self.assertEqual(job.delivered_count, 2)
+        self.assertEqual(
+            job.last_recipient_id, sorted(user.id for user in self.users)[1]
+        )
+
+        while job.status != BroadcastJob.Status.COMPLETED:
+            job = BroadcastJobService.process_next_chunk(job.id)
+
+        self.assertEqual(job.delivered_count, 5)
+        self.assertIsNotNone(job.finished_at)
+        self.assertFalse(Notification.objects.filter(broadcast=job.broadcast).exists())
+
+    def test_interrupted_job_resumes_after_last_chunk(self):
+        """Test that a resumed job doesn't notify processed recipients again."""
+        job = self._submit()
+        BroadcastJobService.process_next_chunk(job.id)
+
+        # The worker died: the job stopped progressing a while ago.
+        BroadcastJob.objects.filter(id=job.id).update(
+            updated_at=timezone.now() - timedelta(hours=1)
+        )
+        self.assertEqual(BroadcastJobService.get_stalled_jobs_ids(), [job.id])
+
+        while job.status != BroadcastJob.Status.COMPLETED:
+            job = BroadcastJobService.process_next_chunk(job.id)
+
+        self.assertEqual(job.delivered_count, len(self.users))
+        self.assertEqual(job.last_recipient_id, max(user.id for user in self.users))
+
+    def test_scheduled_job_waits_for_its_time(self):
+        """Test that a job isn't processed before its scheduled time."""
+        job = self._submit(scheduled_at=timezone.now() + timedelta(hours=1))
+
+        self.assertIsNone(BroadcastJobService.process_next_chunk(job.id))
+        job.broadcast.refresh_from_db()
+        self.assertIsNone(job.broadcast.published_at)
+        self.assertEqual(BroadcastJobService.get_stalled_jobs_ids(), [])
+
+    def test_retrieve_job_progress(self):
+        """Test that admin can follow the job's progress."""
+        job = self._submit()
+        BroadcastJobService.process_next_chunk(job.id)
+        self.client.force_authenticate(self.admin)
+
+        response = self.client.get(
+            reverse("broadcast-job-detail", kwargs={"pk": job.id})
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["delivered"], 2)
+        self.assertEqual(response.data["progress"], 0.4)
+        self._assert_broadcast_job_schema(response.data)
+
+    def test_member_cannot_retrieve_jobs(self):
+        """Test that members have no access to broadcast jobs."""
+        job = self._submit()
+        self.client.force_authenticate(self.member)
+
+        response = self.client.get(
+            reverse("broadcast-job-detail", kwargs={"pk": job.id})
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def _assert_broadcast_job_schema(self, data):
+        """Validate that the response matches the expected schema."""
+        try:
+            jsonschema.validate(instance=data, schema=broadcast_job_schema)
+        except jsonschema.exceptions.ValidationError as e:
+            self.fail(f"Response does not match schema: {e}")
@@ -1,5 +1,3 @@
-from collections import Counter
-
 import jsonschema
 import random
 
@@ -12,7 +10,8 @@ from rest_framework.settings import api_settings
 from accounts.tests.factories.user import MemberFactory, AdminFactory
 from habits.models import Habit
 from habits.tests.factories.habit import HabitFactory, UserHabitFactory
-from notifications.models import Notification
+from notifications.models import BroadcastJob, Notification
+from notifications.services.broadcast import BroadcastJobService
 from notifications.tests.factories.notification import (
     NotificationFactory,
     NotificationCreateForUserPayloadFactory,
@@ -53,33 +52,68 @@ notification_detail_schema = {
     "additionalProperties": False,
 }
 
+notification_feed_item_schema = {
+    "type": "object",
+    "properties": {
+        "id": {"type": "integer"},
+        "kind": {"type": "string", "enum": ["personal", "broadcast"]},
+        "recipient": {"type": "integer"},
+        "message": notification_message_schema,
+        "is_read": {"type": "boolean"},
+        "sent_at": {
+            "type": "string",
+            "format": "date-time",
+        },
+    },
+    "required": ["id", "kind", "recipient", "message", "is_read", "sent_at"],
+    "additionalProperties": False,
+}
+
 notification_list_schema = {
     "type": "array",
-    "items": notification_detail_schema,
+    "items": notification_feed_item_schema,
 }
 
-create_notifications_by_habits_response_schema = {
+broadcast_job_schema = {
     "type": "object",
     "properties": {
-        "created": {
-            "type": "integer",
-            "description": "Number of notifications successfully created",
-        },
-        "skipped": {
-            "type": "integer",
-            "description": "Number of invalid or ignored habit IDs",
-        },
+        "id": {"type": "integer"},
+        "status": {"type": "string", "enum": ["scheduled", "running", "completed"]},
+        "habits_ids": {"type": "array", "items": {"type": "integer"}},
         "invalid_habits_ids": {
             "type": "array",
             "items": {"type": "integer"},
             "description": "List of habit IDs that were invalid or not found",
         },
-        "message": {
-            "type": "string",
-            "description": "Human-readable summary of the result",
+        "scheduled_at": {"type": ["string", "null"], "format": "date-time"},
+        "total_recipients": {"type": "integer"},
+        "delivered": {
+            "type": "integer",
+            "description": "Number of recipients the broadcast was delivered to",
+        },
+        "skipped": {
+            "type": "integer",
+            "description": "Number of invalid or ignored habit IDs",
         },
+        "progress": {"type": "number", "minimum": 0, "maximum": 1},
+        "created_at": {"type": "string", "format": "date-time"},
+        "started_at": {"type": ["string", "null"], "format": "date-time"},
+        "finished_at": {"type": ["string", "null"], "format": "date-time"},
     },
-    "required": ["created", "skipped", "invalid_habits_ids", "message"],
+    "required": [
+        "id",
+        "status",
+        "habits_ids",
+        "invalid_habits_ids",
+        "scheduled_at",
+        "total_recipients",
+        "delivered",
+        "skipped",
+        "progress",
+        "created_at",
+        "started_at",
+        "finished_at",
+    ],
     "additionalProperties": False,
 }
 
@@ -315,26 +349,33 @@ class NotificationTestS(APITestCase):
         response = self.client.post(
             self.create_notifications_by_habits, payload, format="json"
         )
-        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-
-        # check if notifications' count is correct for users
-        expected_notifications_count = Counter(user for (user, habit) in user_habits)
-        self.assertEqual(
-            Notification.objects.filter(recipient=self.member).count(),
-            expected_notifications_count[self.member],
-        )
-        self.assertEqual(
-            Notification.objects.filter(recipient=self.admin).count(),
-            expected_notifications_count[self.admin],
-        )
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
 
         result = response.data
-
-        self.assertEqual(result["created"], len(set(user_habits)))
+        self.assertEqual(result["status"], BroadcastJob.Status.SCHEDULED)
         self.assertEqual(result["skipped"], 1)
         self.assertEqual(result["invalid_habits_ids"], [invalid_habit_id])
+        self._assert_broadcast_job_schema(result)
+
+        # the broadcast is published by the job, not by the request
+        job = BroadcastJob.objects.get(id=result["id"])
+        self.assertIsNone(job.broadcast.published_at)
+        BroadcastJobService.process_next_chunk(result["id"])
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, BroadcastJob.Status.COMPLETED)
+        self.assertIsNotNone(job.broadcast.published_at)
+        self.assertEqual(job.delivered_count, len({user for (user, _) in user_habits}))
+
+        # no per-user rows are written, and every user sees the broadcast once
+        self.assertFalse(Notification.objects.exists())
+        for user in [self.member, self.admin]:
+            self.client.force_authenticate(user)
+            response = self.client.get(self.list_url)
 
-        self._assert_create_notifications_by_habits_response_schema(result)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data["count"], 1)
+            self.assertEqual(response.data["results"][0]["kind"], "broadcast")
 
     def test_cannot_create_notifications_by_habits_without_text(self):
         """Test that notifications by habit cannot be created without text."""
@@ -432,11 +473,9 @@ class NotificationTestS(APITestCase):
         except jsonschema.exceptions.ValidationError as e:
             self.fail(f"Response does not match schema: {e}")
 
-    def _assert_create_notifications_by_habits_response_schema(self, data):
+    def _assert_broadcast_job_schema(self, data):
         """Validate that the response matches the expected schema."""
         try:
-            jsonschema.validate(
-                instance=data, schema=create_notifications_by_habits_response_schema
-            )
+            jsonschema.validate(instance=data, schema=broadcast_job_schema)
         except jsonschema.exceptions.ValidationError as e:
             self.fail(f"Response does not match schema: {e}")
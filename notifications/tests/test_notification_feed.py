@@ -0,0 +1,162 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.tests.factories.user import MemberFactory
+from habits.models import UserHabit
+from habits.tests.factories.habit import HabitFactory, UserHabitFactory
+from notifications.models import Notification
+from notifications.services.notification import NotificationService
+from notifications.tests.factories.notification import (
+    BroadcastNotificationFactory,
+    NotificationFactory,
+)
+
+
+class NotificationFeedTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = MemberFactory()
+        cls.habit = HabitFactory()
+        UserHabitFactory(user=cls.member, habit=cls.habit)
+
+        now = timezone.now()
+        cls.old_notification = NotificationFactory(recipient=cls.member)
+        cls.broadcast = BroadcastNotificationFactory(
+            habits_ids=[cls.habit.id], audience_snapshot_at=now
+        )
+        cls.new_notification = NotificationFactory(recipient=cls.member)
+        Notification.objects.filter(id=cls.old_notification.id).update(
+            sent_at=now - timedelta(minutes=1)
+        )
+        Notification.objects.filter(id=cls.new_notification.id).update(
+            sent_at=now + timedelta(minutes=1)
+        )
+
+        cls.list_url = reverse("notification-list")
+        cls.mark_as_read_url = reverse(
+            "notification-mark_broadcast_as_read",
+            kwargs={"broadcast_id": cls.broadcast.id},
+        )
+        cls.dismiss_url = reverse(
+            "notification-dismiss_broadcast",
+            kwargs={"broadcast_id": cls.broadcast.id},
+        )
+
+    def setUp(self):
+        self.client.force_authenticate(self.member)
+
+    def _get_feed(self):
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data["results"]
+
+    def test_feed_merges_personal_and_broadcast_notifications(self):
+        """Test that the feed lists both kinds of notifications from the newest."""
+        feed = self._get_feed()
+
+        self.assertEqual(
+            [(item["kind"], item["id"]) for item in feed],
+            [
+                ("personal", self.new_notification.id),
+                ("broadcast", self.broadcast.id),
+                ("personal", self.old_notification.id),
+            ],
+        )
+        self.assertFalse(Notification.objects.filter(broadcast__isnull=False).exists())
+
+    def test_mark_broadcast_as_read(self):
+        """Test that reading a broadcast creates the user's state row."""
+        response = self.client.patch(self.mark_as_read_url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        state = Notification.objects.get(broadcast=self.broadcast)
+        self.assertEqual(state.recipient, self.member)
+        self.assertTrue(state.is_read)
+
+        broadcast_item = next(
+            item for item in self._get_feed() if item["kind"] == "broadcast"
+        )
+        self.assertTrue(broadcast_item["is_read"])
+
+    def test_dismiss_broadcast(self):
+        """Test that a dismissed broadcast disappears from the user's feed."""
+        response = self.client.delete(self.dismiss_url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        kinds = [item["kind"] for item in self._get_feed()]
+        self.assertEqual(kinds, ["personal", "personal"])
+
+        response = self.client.patch(self.mark_as_read_url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_users_registered_after_snapshot_dont_get_broadcast(self):
+        """Test that the broadcast audience is fixed at its snapshot."""
+        newcomer = MemberFactory()
+        UserHabitFactory(user=newcomer, habit=self.habit)
+        self.client.force_authenticate(newcomer)
+
+        self.assertEqual(self._get_feed(), [])
+
+        response = self.client.patch(self.mark_as_read_url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_unpublished_broadcast_is_hidden(self):
+        """Test that a broadcast isn't in the feed before it's published."""
+        broadcast = BroadcastNotificationFactory(
+            habits_ids=[self.habit.id], published_at=None
+        )
+
+        ids = [item["id"] for item in self._get_feed() if item["kind"] == "broadcast"]
+        self.assertNotIn(broadcast.id, ids)
+
+    def _get_broadcasts_ids(self):
+        return [item["id"] for item in self._get_feed() if item["kind"] == "broadcast"]
+
+    def test_habit_selected_after_snapshot_doesnt_get_broadcast(self):
+        """Test that selecting a habit doesn't bring its earlier broadcasts."""
+        other_habit = HabitFactory()
+        broadcast = BroadcastNotificationFactory(
+            habits_ids=[other_habit.id],
+            audience_snapshot_at=timezone.now() - timedelta(hours=1),
+        )
+        UserHabitFactory(user=self.member, habit=other_habit)
+
+        self.assertNotIn(broadcast.id, self._get_broadcasts_ids())
+
+    def test_dropped_habit_keeps_received_broadcasts(self):
+        """Test that broadcasts stay in the feed after their habit is dropped."""
+        other_habits = HabitFactory.create_batch(3)
+
+        response = self.client.post(
+            reverse("habit-select-habits"),
+            {"habits_ids": [habit.id for habit in other_habits]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(self._get_broadcasts_ids(), [self.broadcast.id])
+        state = Notification.objects.get(broadcast=self.broadcast)
+        self.assertFalse(state.is_read)
+        self.assertEqual(NotificationService.count_unread(self.member), 3)
+
+    def test_kept_habit_keeps_its_selection_time(self):
+        """Test that reselecting a kept habit doesn't move its selection time."""
+        selected_at = UserHabit.objects.get(user=self.member).created_at
+        other_habits = HabitFactory.create_batch(2)
+
+        response = self.client.post(
+            reverse("habit-select-habits"),
+            {"habits_ids": [self.habit.id] + [habit.id for habit in other_habits]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(
+            UserHabit.objects.get(user=self.member, habit=self.habit).created_at,
+            selected_at,
+        )
+        self.assertFalse(Notification.objects.filter(broadcast__isnull=False).exists())
@@ -0,0 +1,119 @@
+import uuid
+
+import jsonschema
+
+from asgiref.sync import sync_to_async
+from channels.db import database_sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.tests.factories.user import AdminFactory, MemberFactory
+from habits.tests.factories.habit import HabitFactory, UserHabitFactory
+from nevroth.asgi import application
+from notifications.services.broadcast import BroadcastJobService
+from notifications.tests.test_notification import notification_feed_item_schema
+
+new_notification_event_schema = {
+    "type": "object",
+    "properties": {
+        "type": {"const": "new_notification"},
+        "notification": notification_feed_item_schema,
+    },
+    "required": ["type", "notification"],
+    "additionalProperties": False,
+}
+
+
+@override_settings(
+    BROADCAST_CHUNK_SIZE=2,
+    BROADCAST_MAX_NOTIFICATIONS_PER_SECOND=0,
+    NOTIFICATIONS_PUSH_BATCH_SIZE=1,
+)
+class NotificationPushTests(TransactionTestCase):
+    def setUp(self):
+        # Cached unread counters of other tests must not leak into this one.
+        settings_override = override_settings(
+            NOTIFICATIONS_UNREAD_KEY_PREFIX=f"unread-test-{uuid.uuid4().hex}"
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    async def _connect_chat_list(self, user):
+        communicator = WebsocketCommunicator(
+            application,
+            "ws/chat-list/",
+            headers=[
+                (b"authorization", f"Bearer {AccessToken.for_user(user)}".encode())
+            ],
+        )
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+
+        return communicator
+
+    async def test_personal_notification_is_pushed(self):
+        """Test that a new notification is pushed to the recipient's chat list socket."""
+        admin = await database_sync_to_async(AdminFactory)()
+        member = await database_sync_to_async(MemberFactory)()
+        communicator = await self._connect_chat_list(member)
+
+        client = APIClient()
+        client.force_authenticate(admin)
+        response = await sync_to_async(client.post)(
+            reverse("notification-create_notification_for_user"),
+            {"recipient": member.id, "text": "Hello"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        event = await communicator.receive_json_from()
+        self._assert_new_notification_event_schema(event)
+        self.assertEqual(event["notification"]["id"], response.data["id"])
+        self.assertEqual(event["notification"]["kind"], "personal")
+        self.assertEqual(event["notification"]["recipient"], member.id)
+
+        await communicator.disconnect()
+
+    async def test_broadcast_is_pushed_by_job_chunks(self):
+        """Test that the broadcast job pushes the broadcast to each chunk's recipients."""
+        admin = await database_sync_to_async(AdminFactory)()
+        habit = await database_sync_to_async(HabitFactory)()
+        members = []
+        for _ in range(3):
+            member = await database_sync_to_async(MemberFactory)()
+            await database_sync_to_async(UserHabitFactory)(user=member, habit=habit)
+            members.append(member)
+        members.sort(key=lambda member: member.id)
+
+        communicators = [await self._connect_chat_list(member) for member in members]
+
+        job = await database_sync_to_async(BroadcastJobService.submit)(
+            sender=admin, text="Keep going!", habits_ids=[habit.id]
+        )
+        await database_sync_to_async(BroadcastJobService.process_next_chunk)(job.id)
+
+        # Only the first chunk's recipients have been pushed to so far.
+        for member, communicator in zip(members[:2], communicators):
+            event = await communicator.receive_json_from()
+            self._assert_new_notification_event_schema(event)
+            self.assertEqual(event["notification"]["kind"], "broadcast")
+            self.assertEqual(event["notification"]["recipient"], member.id)
+        self.assertTrue(await communicators[2].receive_nothing())
+
+        await database_sync_to_async(BroadcastJobService.process_next_chunk)(job.id)
+        event = await communicators[2].receive_json_from()
+        self.assertEqual(event["notification"]["recipient"], members[2].id)
+
+        for communicator in communicators:
+            await communicator.disconnect()
+
+    def _assert_new_notification_event_schema(self, data):
+        """Validate that the event matches the expected schema."""
+        try:
+            jsonschema.validate(instance=data, schema=new_notification_event_schema)
+        except jsonschema.exceptions.ValidationError as e:
+            self.fail(f"Event does not match schema: {e}")
@@ -1,8 +1,10 @@
+import time
 import uuid
 
 import jsonschema
 
 from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, override_settings
 from django.urls import reverse
 
 from unittest.mock import Mock, patch
@@ -11,6 +13,7 @@ from rest_framework.test import APITestCase
 from rest_framework import status
 
 from accounts.tests.factories.user import BaseUserFactory, AdminFactory
+from nevroth.storages import CustomS3Storage, signed_url_cache
 from notifications.services.s3_service import S3Service
 
 User = get_user_model()
@@ -26,6 +29,25 @@ presigned_url_response_schema = {
 }
 
 
+presigned_urls_response_schema = {
+    "type": "object",
+    "properties": {
+        "images": {"type": "array", "items": presigned_url_response_schema},
+    },
+    "required": ["images"],
+    "additionalProperties": False,
+}
+
+S3_SETTINGS = {
+    "AWS_S3_ACCESS_KEY_ID": "test",
+    "AWS_S3_SECRET_ACCESS_KEY": "test",
+    "AWS_S3_REGION_NAME": "eu-north-1",
+    "AWS_S3_ENDPOINT_URL": "http://localstack:4566",
+    "AWS_SIGNED_URL_MIN_VALIDITY": 600,
+    "AWS_SIGNED_URL_CACHE_MAX_SIZE": 2,
+}
+
+
 class NotificationImageUploadViewTests(APITestCase):
     @classmethod
     def setUpTestData(cls):
@@ -120,9 +142,107 @@ class NotificationImageUploadViewTests(APITestCase):
         expected_path = f"notifications/{mock_uuid}.{image_extension}"
         self.assertEqual(image_path, expected_path)
 
-    def _assert_response_schema(self, data):
+    def test_admin_create_batch_success(self):
+        """Test that admin can get upload URLs for several images at once."""
+        admin = AdminFactory()
+        self.client.force_authenticate(admin)
+        images = [
+            {"image_extension": "png", "content_type": "image/png"},
+            {"image_extension": "jpg", "content_type": "image/jpeg"},
+        ]
+
+        with patch.object(
+            S3Service, "generate_presign_url", self.mock_generate_url_func
+        ):
+            response = self.client.post(
+                reverse("notification-presigned-urls"),
+                {"images": images},
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data["images"]), len(images))
+        self.assertEqual(self.mock_generate_url_func.call_count, len(images))
+        self._assert_response_schema(response.data, presigned_urls_response_schema)
+
+    def test_create_batch_limits_number_of_images(self):
+        """Test that a batch can't be empty or exceed the maximum size."""
+        admin = AdminFactory()
+        self.client.force_authenticate(admin)
+
+        for images in [[], [{"image_extension": "png"}] * 11]:
+            with self.subTest(count=len(images)):
+                response = self.client.post(
+                    reverse("notification-presigned-urls"),
+                    {"images": images},
+                    format="json",
+                )
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def _assert_response_schema(self, data, schema=presigned_url_response_schema):
         """Validate that the response matches the expected schema."""
         try:
-            jsonschema.validate(instance=data, schema=presigned_url_response_schema)
+            jsonschema.validate(instance=data, schema=schema)
         except jsonschema.exceptions.ValidationError as e:
             self.fail(f"Response does not match schema: {e}")
+
+
+@override_settings(**S3_SETTINGS)
+class S3ClientAndSignedUrlCacheTests(SimpleTestCase):
+    def setUp(self):
+        signed_url_cache.clear()
+        self.addCleanup(signed_url_cache.clear)
+        self.storage = CustomS3Storage(
+            access_key="test",
+            secret_key="test",
+            bucket_name="test-bucket",
+            region_name="eu-north-1",
+            endpoint_url=S3_SETTINGS["AWS_S3_ENDPOINT_URL"],
+            querystring_expire=3600,
+        )
+
+    def test_s3_client_is_reused(self):
+        """Test that the S3 client is created once per process."""
+        with patch("boto3.client") as create_client:
+            S3Service._client = None
+            self.addCleanup(setattr, S3Service, "_client", None)
+
+            self.assertIs(S3Service.get_s3_client(), S3Service.get_s3_client())
+            create_client.assert_called_once()
+
+    def test_signed_urls_are_cached(self):
+        """Test that an image is signed once and its URL is served from cache."""
+        with patch.object(
+            self.storage.connection.meta.client,
+            "generate_presigned_url",
+            wraps=self.storage.connection.meta.client.generate_presigned_url,
+        ) as sign:
+            url = self.storage.url("notifications/a.png")
+            self.assertEqual(self.storage.url("notifications/a.png"), url)
+            self.assertEqual(sign.call_count, 1)
+
+            # URLs with custom parameters aren't cached.
+            self.storage.url("notifications/a.png", expire=60)
+            self.assertEqual(sign.call_count, 2)
+
+        self.assertIn("localhost:4566", url)
+
+    def test_signed_urls_expire_before_they_become_invalid(self):
+        """Test that cached URLs are re-signed before they stop working."""
+        self.storage.url("notifications/a.png")
+        key = "test-bucket/notifications/a.png"
+        signed_at = time.monotonic()
+
+        # The URL is valid for an hour and has to stay valid for 10 more minutes.
+        with patch("time.monotonic", return_value=signed_at + 2990):
+            self.assertIsNotNone(signed_url_cache.get(key))
+        with patch("time.monotonic", return_value=signed_at + 3010):
+            self.assertIsNone(signed_url_cache.get(key))
+
+    def test_signed_url_cache_is_bounded(self):
+        """Test that the least recently used URLs are evicted."""
+        for name in ["a.png", "b.png", "c.png"]:
+            self.storage.url(name)
+
+        self.assertIsNone(signed_url_cache.get("test-bucket/a.png"))
+        self.assertIsNotNone(signed_url_cache.get("test-bucket/c.png"))
@@ -0,0 +1,210 @@
+import uuid
+from datetime import timedelta
+from unittest import mock
+
+import jsonschema
+
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.tests.factories.user import AdminFactory, MemberFactory
+from habits.tests.factories.habit import HabitFactory, UserHabitFactory
+from notifications.models import BroadcastJob, BroadcastNotification, Notification
+from notifications.services.notification import NotificationService
+from notifications.services.unread_counter import UnreadNotificationCounterService
+from notifications.tasks.retention import purge_expired_notifications_task
+from notifications.tests.factories.notification import (
+    BroadcastJobFactory,
+    BroadcastNotificationFactory,
+    NotificationFactory,
+)
+
+unread_count_schema = {
+    "type": "object",
+    "properties": {"unread": {"type": "integer", "minimum": 0}},
+    "required": ["unread"],
+    "additionalProperties": False,
+}
+
+
+class UnreadCountTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = MemberFactory()
+        cls.admin = AdminFactory()
+        cls.habit = HabitFactory()
+        UserHabitFactory(user=cls.member, habit=cls.habit)
+
+        cls.notifications = NotificationFactory.create_batch(3, recipient=cls.member)
+        NotificationFactory(recipient=cls.member, is_read=True)
+        cls.broadcast = BroadcastNotificationFactory(habits_ids=[cls.habit.id])
+
+        cls.unread_count_url = reverse("notification-unread_count")
+        cls.mark_many_as_read_url = reverse("notification-mark_many_as_read")
+
+    def setUp(self):
+        # Isolate cached counters of every test under a unique prefix.
+        settings_override = override_settings(
+            NOTIFICATIONS_UNREAD_KEY_PREFIX=f"unread-test-{uuid.uuid4().hex}"
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.client.force_authenticate(self.member)
+
+    def _get_unread_count(self):
+        response = self.client.get(self.unread_count_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self._assert_unread_count_schema(response.data)
+
+        return response.data["unread"]
+
+    def test_unread_count_authentication_required(self):
+        """Test that authentication is required to get the unread count."""
+        self.client.force_authenticate(None)
+        response = self.client.get(self.unread_count_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_unread_count_is_computed_and_cached(self):
+        """Test that the unread count includes broadcasts and is cached."""
+        self.assertEqual(self._get_unread_count(), 4)
+        self.assertEqual(UnreadNotificationCounterService.get(self.member.id), 4)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self._get_unread_count(), 4)
+
+    def test_count_changed_during_recount_is_not_cached(self):
+        """Test that a recount missing a concurrent change isn't cached."""
+        count_unread = NotificationService.count_unread
+
+        def count_then_change(user):
+            count = count_unread(user)
+            # A notification committed after the database was read.
+            UnreadNotificationCounterService.adjust([user.id], 1)
+            return count
+
+        with mock.patch.object(
+            NotificationService, "count_unread", side_effect=count_then_change
+        ):
+            self.assertEqual(self._get_unread_count(), 4)
+
+        self.assertIsNone(UnreadNotificationCounterService.get(self.member.id))
+        self.assertEqual(self._get_unread_count(), 4)
+        self.assertEqual(UnreadNotificationCounterService.get(self.member.id), 4)
+
+    def test_unread_count_follows_new_and_read_notifications(self):
+        """Test that the cached counter is adjusted by creation and reads."""
+        self.assertEqual(self._get_unread_count(), 4)
+
+        self.client.force_authenticate(self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("notification-create_notification_for_user"),
+                {"recipient": self.member.id, "text": "Hello"},
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.client.force_authenticate(self.member)
+        url = reverse(
+            "notification-mark_as_read", kwargs={"pk": self.notifications[0].id}
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(url)
+            # Marking a read notification again doesn't change the counter.
+            self.client.patch(url)
+
+        url = reverse(
+            "notification-mark_broadcast_as_read",
+            kwargs={"broadcast_id": self.broadcast.id},
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(url)
+
+        self.assertEqual(self._get_unread_count(), 3)
+        self.assertEqual(NotificationService.count_unread(self.member), 3)
+
+    @override_settings(BROADCAST_NOTIFICATION_RETENTION_DAYS=90)
+    def test_purged_broadcast_invalidates_counter(self):
+        """Test that purging an unread broadcast drops the audience's counters."""
+        self.assertEqual(self._get_unread_count(), 4)
+        BroadcastJobFactory(
+            broadcast=self.broadcast, status=BroadcastJob.Status.COMPLETED
+        )
+        BroadcastNotification.objects.filter(id=self.broadcast.id).update(
+            published_at=timezone.now() - timedelta(days=91)
+        )
+
+        purge_expired_notifications_task()
+
+        self.assertIsNone(UnreadNotificationCounterService.get(self.member.id))
+        self.assertEqual(self._get_unread_count(), 3)
+
+    def test_mark_many_as_read_by_ids(self):
+        """Test that notifications and broadcasts can be marked read by IDs."""
+        self.assertEqual(self._get_unread_count(), 4)
+        payload = {
+            "ids": [notification.id for notification in self.notifications[:2]],
+            "broadcasts_ids": [self.broadcast.id],
+        }
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                self.mark_many_as_read_url, payload, format="json"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["marked"], 3)
+        self.assertEqual(self._get_unread_count(), 1)
+        self.assertTrue(
+            Notification.objects.get(
+                recipient=self.member, broadcast=self.broadcast
+            ).is_read
+        )
+
+    def test_mark_many_as_read_before_timestamp(self):
+        """Test that everything sent up to a moment can be marked read at once."""
+        self.assertEqual(self._get_unread_count(), 4)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                self.mark_many_as_read_url,
+                {"before": timezone.now().isoformat()},
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["marked"], 4)
+        self.assertEqual(self._get_unread_count(), 0)
+
+    def test_mark_many_as_read_ignores_other_users_notifications(self):
+        """Test that bulk mark-as-read only touches the user's notifications."""
+        others = NotificationFactory(recipient=self.admin)
+
+        response = self.client.post(
+            self.mark_many_as_read_url, {"ids": [others.id]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["marked"], 0)
+        others.refresh_from_db()
+        self.assertFalse(others.is_read)
+
+    def test_mark_many_as_read_requires_a_selection(self):
+        """Test that either IDs or the timestamp must be provided."""
+        for payload in [{}, {"ids": [1], "before": timezone.now().isoformat()}]:
+            with self.subTest(payload=payload):
+                response = self.client.post(
+                    self.mark_many_as_read_url, payload, format="json"
+                )
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def _assert_unread_count_schema(self, data):
+        """Validate that the response matches the expected schema."""
+        try:
+            jsonschema.validate(instance=data, schema=unread_count_schema)
+        except jsonschema.exceptions.ValidationError as e:
+            self.fail(f"Response does not match schema: {e}")
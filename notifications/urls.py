@@ -2,9 +2,18 @@ from django.urls.conf import path, include
 
 from rest_framework.routers import DefaultRouter
 
-from notifications.views import NotificationViewSet, NotificationImageUploadView
+from notifications.views import (
+    BroadcastJobViewSet,
+    NotificationViewSet,
+    NotificationImageUploadView,
+    NotificationImageBatchUploadView,
+)
 
 router = DefaultRouter()
+# Registered first, so it isn't shadowed by the notification detail route.
+router.register(
+    "notifications/broadcasts", BroadcastJobViewSet, basename="broadcast-job"
+)
 router.register("notifications", NotificationViewSet, basename="notification")
 
 urlpatterns = [
@@ -14,4 +23,9 @@ urlpatterns = [
         NotificationImageUploadView.as_view(),
         name="notification-presigned-url",
     ),
+    path(
+        "notification-presigned-urls/",
+        NotificationImageBatchUploadView.as_view(),
+        name="notification-presigned-urls",
+    ),
 ]
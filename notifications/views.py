@@ -1,27 +1,37 @@
 from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import mixins
 from rest_framework import views
 from rest_framework import viewsets
 from rest_framework import status
 
-from notifications.models import Notification
+from notifications.models import BroadcastJob, Notification
 from notifications.permissions import (
+    IsAdminRole,
     RoleBasedNotificationPermission,
     IsNotificationOwner,
 )
 from notifications.serializers import (
     CreateNotificationForUserSerializer,
     NotificationSerializer,
+    NotificationFeedItemSerializer,
     CreateNotificationsByHabitsSerializer,
     NotificationReadSerializer,
-    CreateNotificationsByHabitsResponseSerializer,
+    NotificationBulkReadSerializer,
+    NotificationBulkReadResponseSerializer,
+    UnreadCountSerializer,
+    BroadcastJobSerializer,
     PreSignedSerializer,
+    PreSignedBatchSerializer,
     ResponsePreSignedImageUploadSerializer,
+    ResponsePreSignedImageBatchUploadSerializer,
 )
 
 from drf_spectacular.utils import extend_schema
 
+from notifications.services.notification import NotificationService
 from notifications.services.s3_service import S3Service
 
 
@@ -35,19 +45,35 @@ class NotificationViewSet(
         if getattr(self, "swagger_fake_view", False):
             return Notification.objects.none()
 
-        return Notification.objects.filter(recipient=self.request.user).order_by(
-            "-sent_at"
+        if self.action == "list":
+            return NotificationService.get_feed(self.request.user)
+
+        return (
+            NotificationService.get_personal_notifications(self.request.user)
+            .select_related("message")
+            .order_by("-sent_at")
         )
 
     def get_permissions(self):
         if hasattr(self, "action"):
             if self.action in ["destroy", "mark_as_read"]:
                 return [IsNotificationOwner()]
+            if self.action in [
+                "mark_broadcast_as_read",
+                "dismiss_broadcast",
+                "mark_many_as_read",
+                "unread_count",
+            ]:
+                return [IsAuthenticated()]
         return [RoleBasedNotificationPermission()]
 
     def get_serializer_class(self):
-        if self.action == "mark_as_read":
+        if self.action == "list":
+            return NotificationFeedItemSerializer
+        elif self.action == "mark_as_read":
             return NotificationReadSerializer
+        elif self.action == "mark_many_as_read":
+            return NotificationBulkReadSerializer
         elif self.action == "create_notification_for_user":
             return CreateNotificationForUserSerializer
         elif self.action == "create_notifications_by_habits":
@@ -55,6 +81,43 @@ class NotificationViewSet(
 
         return NotificationSerializer
 
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.get_queryset())
+        items = NotificationService.hydrate_feed(request.user, page)
+
+        return self.get_paginated_response(self.get_serializer(items, many=True).data)
+
+    def perform_destroy(self, instance):
+        NotificationService.delete_notification(instance)
+
+    @extend_schema(responses=UnreadCountSerializer)
+    @action(
+        detail=False,
+        methods=["GET"],
+        url_path="unread-count",
+        url_name="unread_count",
+    )
+    def unread_count(self, request):
+        count = NotificationService.get_unread_count(request.user)
+
+        return Response(UnreadCountSerializer({"unread": count}).data)
+
+    @extend_schema(responses=NotificationBulkReadResponseSerializer)
+    @action(
+        detail=False,
+        methods=["POST"],
+        url_path="mark-as-read",
+        url_name="mark_many_as_read",
+    )
+    def mark_many_as_read(self, request):
+        serializer = self.get_serializer(
+            data=request.data, context={"request": request}
+        )
+        serializer.is_valid(raise_exception=True)
+        marked = serializer.save()
+
+        return Response(NotificationBulkReadResponseSerializer({"marked": marked}).data)
+
     @extend_schema(responses={204: None})
     @action(
         detail=True,
@@ -71,6 +134,40 @@ class NotificationViewSet(
 
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    @extend_schema(request=None, responses={204: None})
+    @action(
+        detail=False,
+        methods=["PATCH"],
+        url_path=r"broadcast/(?P<broadcast_id>\d+)/mark-as-read",
+        url_name="mark_broadcast_as_read",
+    )
+    def mark_broadcast_as_read(self, request, broadcast_id=None):
+        NotificationService.mark_broadcast_as_read(
+            request.user, self._get_user_broadcast(broadcast_id)
+        )
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @extend_schema(request=None, responses={204: None})
+    @action(
+        detail=False,
+        methods=["DELETE"],
+        url_path=r"broadcast/(?P<broadcast_id>\d+)",
+        url_name="dismiss_broadcast",
+    )
+    def dismiss_broadcast(self, request, broadcast_id=None):
+        NotificationService.dismiss_broadcast(
+            request.user, self._get_user_broadcast(broadcast_id)
+        )
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    def _get_user_broadcast(self, broadcast_id):
+        return get_object_or_404(
+            NotificationService.get_user_broadcasts(self.request.user),
+            id=broadcast_id,
+        )
+
     @extend_schema(
         responses={201: NotificationSerializer},
     )
@@ -92,7 +189,8 @@ class NotificationViewSet(
         )
 
     @extend_schema(
-        responses={201: CreateNotificationsByHabitsResponseSerializer},
+        responses={202: BroadcastJobSerializer},
+        description="Submit a broadcast job notifying users subscribed to the habits",
     )
     @action(
         detail=False,
@@ -105,9 +203,19 @@ class NotificationViewSet(
             data=request.data, context={"request": request}
         )
         serializer.is_valid(raise_exception=True)
-        result = serializer.save()
+        job = serializer.save()
 
-        return Response(result, status=status.HTTP_201_CREATED)
+        return Response(
+            BroadcastJobSerializer(job).data, status=status.HTTP_202_ACCEPTED
+        )
+
+
+class BroadcastJobViewSet(viewsets.ReadOnlyModelViewSet):
+    serializer_class = BroadcastJobSerializer
+    permission_classes = [IsAdminRole]
+
+    def get_queryset(self):
+        return BroadcastJob.objects.select_related("broadcast").order_by("-created_at")
 
 
 class NotificationImageUploadView(views.APIView):
@@ -139,3 +247,34 @@ class NotificationImageUploadView(views.APIView):
             return Response(
                 {"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+
+class NotificationImageBatchUploadView(views.APIView):
+    action = "notification_image_upload"
+    permission_classes = [RoleBasedNotificationPermission]
+
+    @extend_schema(
+        request=PreSignedBatchSerializer,
+        responses=ResponsePreSignedImageBatchUploadSerializer,
+        description="Generate presigned URLs for uploading several images at once",
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = PreSignedBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            urls = S3Service.generate_presign_urls(serializer.validated_data["images"])
+        except Exception as e:
+            return Response(
+                {"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+        return Response(
+            {
+                "images": [
+                    {"image_path": image_path, "pre_signed_url": pre_signed_url}
+                    for image_path, pre_signed_url in urls
+                ]
+            },
+            status=status.HTTP_201_CREATED,
+        )